@@ -2,21 +2,65 @@
 from __future__ import annotations
 
 import argparse
+import ctypes
+import ctypes.util
 import hashlib
 import json
 import os
 import re
+import select
 import shutil
+import struct
 import sys
 import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Callable
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: no reflink, clone_file falls through
+    fcntl = None
+
+# [LAW:one-source-of-truth] Transcript decoding, text extraction, and slug
+# encoding are shared with find-session, which sits beside this skill in both
+# the repo and the installed skills dir.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "find-session"))
+from _session_lib import (  # noqa: E402
+    MESSAGE_TYPES,
+    JsonCache,
+    extract_text,
+    iter_events,
+    iter_events_reverse,
+    session_metadata,
+    slug_for,
+)
 
 
 DEFAULT_SOURCE_CONFIG_DIR = Path.home() / ".claude"
-MESSAGE_TYPES = {"user", "assistant"}
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _select_hasher() -> tuple[str, Callable[[], Any]]:
+    # Digests only ever compare two local files with each other, so speed
+    # beats cryptographic strength; blake2b is the stdlib floor.
+    try:
+        import blake3
+        return "blake3", blake3.blake3
+    except ImportError:
+        pass
+    try:
+        import xxhash
+        return "xxh3_128", xxhash.xxh3_128
+    except ImportError:
+        pass
+    return "blake2b", lambda: hashlib.blake2b(digest_size=32)
+
+
+HASH_NAME, new_hasher = _select_hasher()
 
 
 @dataclass(frozen=True)
@@ -33,6 +77,42 @@ class ProjectScope:
     target_dir: Path
 
 
+def prune_missing(cache: JsonCache, path_of: Callable[[str], str]) -> None:
+    """Drop entries whose file no longer exists, as refresh_cwd_index does."""
+    with cache.lock:
+        keys = list(cache.data)
+    for key in keys:
+        if not os.path.exists(path_of(key)):
+            cache.delete(key)
+
+
+@dataclass(frozen=True)
+class Caches:
+    digests: JsonCache
+    cwd_index: JsonCache
+    session_meta: JsonCache
+
+    def save(self) -> None:
+        prune_missing(self.digests, lambda key: key.rpartition("|")[0])
+        prune_missing(self.session_meta, lambda key: key)
+        self.digests.save()
+        self.cwd_index.save()
+        self.session_meta.save()
+
+
+def cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base).expanduser() / "copy-session-to-zai"
+
+
+def load_caches(root: Path) -> Caches:
+    return Caches(
+        digests=JsonCache(root / "digests.json"),
+        cwd_index=JsonCache(root / "cwd-index.json"),
+        session_meta=JsonCache(root / "session-meta.json"),
+    )
+
+
 @dataclass(frozen=True)
 class Message:
     role: str
@@ -82,31 +162,62 @@ def config_dirs() -> ConfigDirs:
     return ConfigDirs(source=source, target=target)
 
 
-def encode_project_path(cwd: Path) -> str:
-    # [LAW:one-source-of-truth] Claude project state is keyed by the absolute cwd slug.
-    return re.sub(r"[/.]", "-", str(cwd.resolve()))
+def first_cwd(path: Path) -> str | None:
+    for event in iter_events(path):
+        cwd = event.get("cwd")
+        if isinstance(cwd, str):
+            return cwd
+    return None
+
 
+def refresh_cwd_index(projects_dir: Path, cwd_index: JsonCache) -> None:
+    """Bring the session-path -> first-cwd index up to date with the disk.
 
-def project_dir_from_transcripts(projects_dir: Path, cwd: Path) -> Path | None:
-    matches: list[Path] = []
-    cwd_s = str(cwd.resolve())
+    Only new sessions, and sessions that had no cwd-bearing event yet but
+    have grown since, are opened — and each is read only up to its first
+    cwd-bearing event. A transcript is append-only, so once found its first
+    cwd never changes. Entries for deleted sessions are dropped.
+    """
+    seen: set[str] = set()
     for project_dir in projects_dir.iterdir() if projects_dir.is_dir() else ():
         if not project_dir.is_dir():
             continue
         for path in project_dir.glob("*.jsonl"):
-            for event in iter_jsonl(path):
-                if event.get("cwd") == cwd_s:
-                    matches.append(project_dir)
-                    break
-            if matches and matches[-1] == project_dir:
-                break
+            key = str(path)
+            seen.add(key)
+            entry = cwd_index.get(key)
+            size = path.stat().st_size
+            if isinstance(entry, dict) and (entry.get("cwd") or entry.get("size") == size):
+                continue
+            cwd_index.put(key, {"size": size, "cwd": first_cwd(path)})
+    for key in [k for k in cwd_index.data if k not in seen]:
+        cwd_index.delete(key)
+
+
+def indexed_project_dirs(cwd_index: JsonCache, cwd_s: str) -> list[Path]:
+    by_cwd: dict[str, set[str]] = {}
+    with cwd_index.lock:
+        for key, entry in cwd_index.data.items():
+            if isinstance(entry, dict) and entry.get("cwd"):
+                by_cwd.setdefault(entry["cwd"], set()).add(str(Path(key).parent))
+    return [Path(d) for d in sorted(by_cwd.get(cwd_s, ())) if Path(d).is_dir()]
+
+
+def project_dir_from_transcripts(projects_dir: Path, cwd: Path, cwd_index: JsonCache) -> Path | None:
+    # Refresh on every lookup: a cwd already in the index may since have
+    # gained a newer project dir, and the refresh only opens sessions that
+    # are new or still lack a cwd.
+    refresh_cwd_index(projects_dir, cwd_index)
+    matches = indexed_project_dirs(cwd_index, str(cwd.resolve()))
     return max(matches, key=lambda p: p.stat().st_mtime) if matches else None
 
 
-def project_scope(cwd: Path, dirs: ConfigDirs) -> ProjectScope:
-    slug = encode_project_path(cwd)
+def project_scope(cwd: Path, dirs: ConfigDirs, caches: Caches) -> ProjectScope:
+    slug = slug_for(cwd)
     source_dir = dirs.source / "projects" / slug
-    found = source_dir if source_dir.is_dir() else project_dir_from_transcripts(dirs.source / "projects", cwd)
+    found = source_dir if source_dir.is_dir() else project_dir_from_transcripts(
+        dirs.source / "projects", cwd, caches.cwd_index
+    )
     if found is None:
         raise SystemExit(
             f"no Claude source sessions found for {cwd.resolve()}\n"
@@ -120,52 +231,20 @@ def project_scope(cwd: Path, dirs: ConfigDirs) -> ProjectScope:
     )
 
 
-def iter_jsonl(path: Path) -> Iterable[dict[str, Any]]:
-    with path.open("r", encoding="utf-8", errors="replace") as f:
-        for line in f:
-            try:
-                value = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(value, dict):
-                yield value
-
-
-def text_from_content(content: Any) -> str:
-    if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        parts: list[str] = []
-        for block in content:
-            if isinstance(block, dict) and block.get("type") == "text":
-                text = block.get("text")
-                if isinstance(text, str):
-                    parts.append(text)
-        return "\n".join(parts)
-    return ""
-
-
 def event_message(event: dict[str, Any]) -> Message | None:
     # [LAW:single-enforcer] Transcript schema tolerance stays at the parse boundary.
-    if event.get("type") not in MESSAGE_TYPES or event.get("isMeta"):
-        return None
-    message = event.get("message")
-    if not isinstance(message, dict):
+    if event.get("type") not in MESSAGE_TYPES:
         return None
-    text = text_from_content(message.get("content")).strip()
+    text = extract_text(event, thinking=False).strip()
     if not text:
         return None
+    message = event["message"]
     role = str(message.get("role") or event.get("type"))
     timestamp = event.get("timestamp") if isinstance(event.get("timestamp"), str) else None
     uuid = event.get("uuid") if isinstance(event.get("uuid"), str) else None
     return Message(role=role, timestamp=timestamp, uuid=uuid, text=text)
 
 
-def event_title(event: dict[str, Any]) -> str | None:
-    title = event.get("aiTitle")
-    return title.strip() if isinstance(title, str) and title.strip() else None
-
-
 def session_id_from_path(path: Path) -> str:
     return path.stem
 
@@ -174,60 +253,101 @@ def iso_from_mtime(path: Path) -> str:
     return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).astimezone().isoformat(timespec="seconds")
 
 
-def file_sha256(path: Path) -> str:
-    h = hashlib.sha256()
+def file_digest(path: Path, digests: JsonCache, length: int | None = None) -> str:
+    """Digest of the file, or of its first `length` bytes when given.
+
+    Cached per path (one full and one prefix entry) and validated against
+    (device, inode, size, mtime_ns): any rewrite, append, or replacement of
+    the file changes at least one of them, so an unchanged transcript is
+    never read twice.
+    """
+    st = path.stat()
+    stamp = [HASH_NAME, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, length]
+    key = f"{path}|{'full' if length is None else 'prefix'}"
+    cached = digests.get(key)
+    if isinstance(cached, dict) and cached.get("stamp") == stamp:
+        return cached["digest"]
+
+    # Read no more than the size in the stamp, so a file still growing gets
+    # the digest of exactly the bytes the stamp describes
+    h = new_hasher()
+    remaining = st.st_size if length is None else length
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
             h.update(chunk)
-    return h.hexdigest()
+            remaining -= len(chunk)
+    digest = h.hexdigest()
+    digests.put(key, {"stamp": stamp, "digest": digest})
+    return digest
 
 
-def target_state(source: Path, target: Path) -> str:
+def target_state(source: Path, target: Path, digests: JsonCache) -> str:
     if target.is_symlink():
         return "target-symlink"
     if not target.exists():
         return "missing"
     if not target.is_file():
         return "target-not-file"
-    if source.stat().st_size != target.stat().st_size:
+    source_size = source.stat().st_size
+    target_size = target.stat().st_size
+    if target_size < source_size:
+        # Transcripts are append-only: a shorter target whose bytes are the
+        # source's leading bytes is an older copy of the same live session.
+        if file_digest(target, digests) == file_digest(source, digests, target_size):
+            return "exists-prefix"
+        return "exists-different"
+    if source_size != target_size:
         return "exists-different"
-    return "exists-same" if file_sha256(source) == file_sha256(target) else "exists-different"
+    same = file_digest(source, digests) == file_digest(target, digests)
+    return "exists-same" if same else "exists-different"
 
 
-def summarize_session(index: int, path: Path, target_dir: Path, recent_count: int) -> SessionReport:
-    title: str | None = None
+def summarize_session(index: int, path: Path, target_dir: Path, recent_count: int,
+                      caches: Caches) -> SessionReport:
+    title, message_count = session_metadata(path, caches.session_meta)
     messages: list[Message] = []
     last_event_at: str | None = None
-    for event in iter_jsonl(path):
-        title = event_title(event) or title
+    for event in iter_events_reverse(path):
         timestamp = event.get("timestamp")
-        if isinstance(timestamp, str):
+        if last_event_at is None and isinstance(timestamp, str):
             last_event_at = timestamp
-        msg = event_message(event)
-        if msg is not None:
-            messages.append(msg)
+        if len(messages) < recent_count:
+            msg = event_message(event)
+            if msg is not None:
+                messages.append(msg)
+        if last_event_at is not None and len(messages) >= recent_count:
+            break
+    messages.reverse()
     target = target_dir / path.name
     return SessionReport(
         index=index,
         session_id=session_id_from_path(path),
         source_path=path,
         target_path=target,
-        target_state=target_state(path, target),
+        target_state=target_state(path, target, caches.digests),
         size_bytes=path.stat().st_size,
         last_updated=iso_from_mtime(path),
         last_event_at=last_event_at,
         title=title,
-        message_count=len(messages),
-        recent_messages=tuple(messages[-recent_count:]),
+        message_count=message_count,
+        recent_messages=tuple(messages),
     )
 
 
-def recent_sessions(scope: ProjectScope, limit: int, recent_messages: int) -> list[SessionReport]:
+def recent_sessions(scope: ProjectScope, limit: int, recent_messages: int,
+                    caches: Caches, jobs: int = 1) -> list[SessionReport]:
+    # Sessions are summarized concurrently: the work is file reads and
+    # hashing, both of which release the GIL. pool.map yields in input order,
+    # so reports keep their recency index regardless of completion order.
     paths = sorted(scope.source_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
-    return [
-        summarize_session(index, path, scope.target_dir, recent_messages)
-        for index, path in enumerate(paths[:limit], start=1)
-    ]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(
+            lambda item: summarize_session(item[0], item[1], scope.target_dir, recent_messages, caches),
+            enumerate(paths[:limit], start=1),
+        ))
 
 
 def compact_text(text: str, width: int) -> str:
@@ -300,33 +420,397 @@ def report_json(scope: ProjectScope, dirs: ConfigDirs, reports: list[SessionRepo
     )
 
 
-def resolve_session_id(scope: ProjectScope, session_id: str, recent_messages: int) -> SessionReport:
+def resolve_session_id(scope: ProjectScope, session_id: str, recent_messages: int,
+                       caches: Caches) -> SessionReport:
     for path in scope.source_dir.glob("*.jsonl"):
         if session_id_from_path(path) == session_id:
-            return summarize_session(0, path, scope.target_dir, recent_messages)
+            return summarize_session(0, path, scope.target_dir, recent_messages, caches)
     raise SystemExit(f"session not found in {scope.source_dir}: {session_id}")
 
 
-def copy_session(report: SessionReport, replace: bool) -> str:
+TAIL_GUARD_BYTES = 4096
+
+
+def append_tail(source: Path, target: Path) -> int:
+    """Append the bytes of `source` beyond the target's length; returns the count.
+
+    All-or-nothing: on any failure the target is truncated back to its
+    original length, so readers only ever see the old prefix or a prefix of
+    the new copy — never bytes that are not in the source. The last few KiB
+    before the append point are re-compared first, catching a target that
+    was written to after target_state classified it.
+    """
+    with source.open("rb", buffering=0) as src, target.open("r+b", buffering=0) as dst:
+        start = dst.seek(0, os.SEEK_END)
+        guard = min(start, TAIL_GUARD_BYTES)
+        src.seek(start - guard)
+        dst.seek(start - guard)
+        if src.read(guard) != dst.read(guard):
+            raise SystemExit(f"target changed since it was checked: {target}")
+        try:
+            appended = copy_range(src, dst, start)
+            os.fsync(dst.fileno())
+        except BaseException:
+            dst.truncate(start)
+            raise
+    shutil.copystat(source, target)
+    return appended
+
+
+# _IOW(0x94, 9, int) from <linux/fs.h>: share the source's extents (reflink).
+FICLONE = 0x40049409
+
+
+def reflink(src: BinaryIO, dst: BinaryIO) -> bool:
+    """Clone src into the empty dst on btrfs/xfs; False where unsupported."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, src_off: int, dst_off: int, count: int) -> int:
+    done = 0
+    while done < count:
+        n = os.copy_file_range(src_fd, dst_fd, count - done, src_off + done, dst_off + done)
+        if n == 0:
+            break
+        done += n
+    return done
+
+
+def _sendfile(src_fd: int, dst_fd: int, src_off: int, dst_off: int, count: int) -> int:
+    os.lseek(dst_fd, dst_off, os.SEEK_SET)
+    done = 0
+    while done < count:
+        n = os.sendfile(dst_fd, src_fd, src_off + done, count - done)
+        if n == 0:
+            break
+        done += n
+    return done
+
+
+KERNEL_COPIES = [f for name, f in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+                 if hasattr(os, name)]
+
+
+def copy_range(src: BinaryIO, dst: BinaryIO, start: int) -> int:
+    """Copy src[start:] (as of now) to dst's current position; returns bytes copied.
+
+    Tries in-kernel copies first — copy_file_range, then sendfile — so the
+    bytes never pass through Python. A mechanism the kernel or filesystem
+    rejects, or one that stops short of the whole range, is undone and the
+    next one tried, ending at a userspace loop. Both files must be
+    unbuffered so positions are the descriptors' own.
+    """
+    dst_start = dst.tell()
+    count = max(0, os.fstat(src.fileno()).st_size - start)
+    for kernel_copy in KERNEL_COPIES:
+        try:
+            copied = kernel_copy(src.fileno(), dst.fileno(), start, dst_start, count)
+        except OSError:
+            pass
+        else:
+            if copied == count:
+                dst.seek(dst_start + copied)
+                return copied
+        dst.truncate(dst_start)
+    src.seek(start)
+    dst.seek(dst_start)
+    copied = 0
+    while copied < count:
+        chunk = src.read(min(HASH_CHUNK_BYTES, count - copied))
+        if not chunk:
+            break
+        dst.write(chunk)
+        copied += len(chunk)
+    return copied
+
+
+def clone_file(source: Path, dest: Path) -> None:
+    """shutil.copy2 semantics, cheapest mechanism first: reflink, kernel copy, userspace."""
+    with source.open("rb", buffering=0) as src, dest.open("wb", buffering=0) as dst:
+        if not reflink(src, dst):
+            copy_range(src, dst, 0)
+    shutil.copystat(source, dest)
+
+
+def copy_session(report: SessionReport, replace: bool, sync: bool = False) -> str:
     state = report.target_state
     if state == "exists-same":
         return f"already copied: {report.target_path}"
+    if state == "exists-prefix" and sync:
+        appended = append_tail(report.source_path, report.target_path)
+        return f"synced: appended {appended} bytes: {report.source_path} -> {report.target_path}"
     if state != "missing" and not replace:
-        raise SystemExit(
-            f"target is {state}: {report.target_path}\n"
+        hint = (
+            "Use --sync to append the new tail of the source to the older target copy, "
+            "or --replace to overwrite it."
+            if state == "exists-prefix" else
             "Use --replace only after confirming the target copy should be overwritten."
         )
+        raise SystemExit(f"target is {state}: {report.target_path}\n{hint}")
     if state in {"target-symlink", "target-not-file"}:
         raise SystemExit(f"unsafe target state {state}: {report.target_path}")
-    report.target_path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = report.target_path.with_name(f".{report.target_path.name}.tmp-{os.getpid()}")
+    replace_file(report.source_path, report.target_path)
+    return f"copied: {report.source_path} -> {report.target_path}"
+
+
+def replace_file(source: Path, target: Path) -> None:
+    """Copy source over target via a sibling temp file and os.replace."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp-{os.getpid()}")
     try:
-        shutil.copy2(report.source_path, tmp, follow_symlinks=True)
-        os.replace(tmp, report.target_path)
+        clone_file(source, tmp)
+        os.replace(tmp, target)
     finally:
         if tmp.exists():
             tmp.unlink()
-    return f"copied: {report.source_path} -> {report.target_path}"
+
+
+@dataclass(frozen=True)
+class SyncAction:
+    session_id: str
+    source_path: Path
+    target_path: Path
+    target_state: str
+    action: str  # copy | append | skip | conflict
+    bytes: int
+
+
+# [LAW:single-enforcer] The only mapping from target state to bulk-sync
+# action: missing copies, grown appends, identical skips, and anything else
+# (diverged, symlink, non-file) is a conflict left for `copy --replace`.
+SYNC_ACTIONS = {"missing": "copy", "exists-prefix": "append", "exists-same": "skip"}
+
+
+def plan_sync_action(source: Path, target_dir: Path, digests: JsonCache) -> SyncAction:
+    target = target_dir / source.name
+    state = target_state(source, target, digests)
+    action = SYNC_ACTIONS.get(state, "conflict")
+    pending = 0
+    if action == "copy":
+        pending = source.stat().st_size
+    elif action == "append":
+        pending = source.stat().st_size - target.stat().st_size
+    return SyncAction(
+        session_id=session_id_from_path(source),
+        source_path=source,
+        target_path=target,
+        target_state=state,
+        action=action,
+        bytes=pending,
+    )
+
+
+def plan_sync(scope: ProjectScope, since: datetime | None, jobs: int, caches: Caches) -> list[SyncAction]:
+    paths = sorted(scope.source_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    if since is not None:
+        cutoff = since.timestamp()
+        paths = [p for p in paths if p.stat().st_mtime >= cutoff]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda p: plan_sync_action(p, scope.target_dir, caches.digests), paths))
+
+
+def apply_sync_action(action: SyncAction) -> str:
+    try:
+        if action.action == "copy":
+            replace_file(action.source_path, action.target_path)
+            return f"copied: {action.session_id} ({action.bytes} bytes)"
+        appended = append_tail(action.source_path, action.target_path)
+        return f"appended: {action.session_id} ({appended} bytes)"
+    except (OSError, SystemExit) as e:
+        return f"failed: {action.session_id}: {e}"
+
+
+def sync_text(plan: list[SyncAction]) -> str:
+    counts = {name: [a for a in plan if a.action == name] for name in ("copy", "append", "skip", "conflict")}
+    lines = [
+        f"plan: {len(counts['copy'])} copy ({sum(a.bytes for a in counts['copy'])} bytes), "
+        f"{len(counts['append'])} append ({sum(a.bytes for a in counts['append'])} bytes), "
+        f"{len(counts['skip'])} up to date, {len(counts['conflict'])} conflict"
+    ]
+    for a in plan:
+        if a.action == "skip":
+            continue
+        detail = a.target_state if a.action == "conflict" else f"{a.bytes} bytes"
+        lines.append(f"   {a.action:<8} {a.session_id}  {detail}")
+    return "\n".join(lines)
+
+
+def sync_project(plan: list[SyncAction], jobs: int) -> list[str]:
+    work = [a for a in plan if a.action in {"copy", "append"}]
+    if work:
+        work[0].target_path.parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(apply_sync_action, work))
+
+
+class InotifyWatcher:
+    """Changed file names in one directory, via Linux inotify through libc.
+
+    When the kernel's event queue overflows, events were dropped and wait()
+    returns None: any file may have changed.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed: {directory}")
+
+    def wait(self, timeout: float | None) -> set[str] | None:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        names: set[str] = set()
+        overflowed = False
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                _, mask, _, length = self.EVENT_HEADER.unpack_from(data, pos)
+                pos += self.EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                if mask & self.IN_Q_OVERFLOW:
+                    overflowed = True
+                elif name:
+                    names.add(os.fsdecode(name))
+        return None if overflowed else names
+
+
+class PollingWatcher:
+    """Changed file names in one directory, by comparing stats each interval.
+
+    The fallback where inotify does not exist (macOS) or cannot be set up.
+    """
+
+    def __init__(self, directory: Path, interval: float) -> None:
+        self.directory = directory
+        self.interval = interval
+        self.stamps = self.scan()
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        stamps: dict[str, tuple[int, int]] = {}
+        for path in self.directory.glob("*.jsonl"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            stamps[path.name] = (st.st_size, st.st_mtime_ns)
+        return stamps
+
+    def wait(self, timeout: float | None) -> set[str]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self.scan()
+        changed = {name for name, stamp in current.items() if self.stamps.get(name) != stamp}
+        self.stamps = current
+        return changed
+
+
+def open_watcher(directory: Path, poll_interval: float) -> InotifyWatcher | PollingWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            print(f"warning: inotify unavailable ({e}); polling every {poll_interval}s", file=sys.stderr)
+    return PollingWatcher(directory, poll_interval)
+
+
+def lstat_stamp(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def mirror_session(source: Path, target_dir: Path, caches: Caches,
+                   mirrored: dict[str, tuple[int, int, int]], reported: set[str]) -> str | None:
+    """Bring one target copy up to date with its source; a log line or None.
+
+    `mirrored` remembers the target's stamp right after this process last
+    wrote or verified it. While the target still carries that stamp it is
+    known to be a prefix of the source, so the next append skips the
+    classification (and its hashing) entirely — each round costs only the
+    new bytes. Any other stamp means someone else touched the target, and it
+    goes back through target_state and its unsafe-target checks.
+    """
+    if not source.is_file():
+        return None
+    target = target_dir / source.name
+    stamp = lstat_stamp(target)
+    if stamp is not None and mirrored.get(source.name) == stamp:
+        pending = source.stat().st_size - stamp[1]
+        if pending <= 0:
+            return None
+        action = SyncAction(session_id_from_path(source), source, target, "exists-prefix", "append", pending)
+    else:
+        mirrored.pop(source.name, None)
+        action = plan_sync_action(source, target_dir, caches.digests)
+
+    if action.action == "conflict":
+        if source.name in reported:
+            return None
+        reported.add(source.name)
+        return f"conflict: {action.session_id}: target is {action.target_state}; not mirrored"
+    reported.discard(source.name)
+    line = None
+    if action.action in {"copy", "append"}:
+        line = apply_sync_action(action)
+        if line.startswith("failed:"):
+            return line
+    mirrored[source.name] = lstat_stamp(target)
+    return line
+
+
+def watch_project(scope: ProjectScope, caches: Caches, min_gap: float, poll_interval: float) -> int:
+    """Mirror source sessions into the target as they grow, until interrupted.
+
+    Backpressure: a session is mirrored at most once per `min_gap` seconds.
+    Changes arriving in between only mark it dirty, so a session growing
+    by many small writes is synced in one append per gap instead of one per
+    write.
+    """
+    watcher = open_watcher(scope.source_dir, poll_interval)
+    print(f"watching {scope.source_dir} -> {scope.target_dir}", flush=True)
+    mirrored: dict[str, tuple[int, int, int]] = {}
+    reported: set[str] = set()
+    last_sync: dict[str, float] = {}
+    dirty = {p.name for p in scope.source_dir.glob("*.jsonl")}
+    while True:
+        now = time.monotonic()
+        due = sorted(n for n in dirty if now - last_sync.get(n, float("-inf")) >= min_gap)
+        for name in due:
+            dirty.discard(name)
+            last_sync[name] = now
+            line = mirror_session(scope.source_dir / name, scope.target_dir, caches, mirrored, reported)
+            if line:
+                print(line, flush=True)
+        caches.save()
+        timeout = min((min_gap - (now - last_sync[n]) for n in dirty), default=None)
+        changed = watcher.wait(None if timeout is None else max(0.0, timeout))
+        if changed is None:
+            # The watcher lost events: any session may have grown
+            changed = {p.name for p in scope.source_dir.glob("*.jsonl")}
+        dirty |= {n for n in changed if n.endswith(".jsonl")}
 
 
 def positive_int(raw: str) -> int:
@@ -336,6 +820,21 @@ def positive_int(raw: str) -> int:
     return value
 
 
+def since_arg(raw: str) -> datetime:
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an ISO date or datetime, got {raw!r}")
+    return value if value.tzinfo else value.astimezone()
+
+
+def positive_float(raw: str) -> float:
+    value = float(raw)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return value
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="session_copy.py")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -346,12 +845,31 @@ def build_parser() -> argparse.ArgumentParser:
     list_p.add_argument("--recent-messages", type=positive_int, default=5)
     list_p.add_argument("--message-width", type=positive_int, default=220)
     list_p.add_argument("--json", action="store_true")
+    list_p.add_argument("--jobs", type=positive_int, default=8,
+                        help="sessions summarized in parallel (default: 8)")
 
     copy_p = sub.add_parser("copy", help="copy a selected source session into the target config dir")
     copy_p.add_argument("project_path", help="absolute or relative project path")
     copy_p.add_argument("session_id", help="session id from the list output")
     copy_p.add_argument("--recent-messages", type=positive_int, default=5)
     copy_p.add_argument("--replace", action="store_true")
+    copy_p.add_argument("--sync", action="store_true",
+                        help="when the target is an older prefix of the source, append only the missing tail")
+
+    sync_p = sub.add_parser("sync", help="mirror every missing or grown source session into the target config dir")
+    sync_p.add_argument("project_path", help="absolute or relative project path")
+    sync_p.add_argument("--since", type=since_arg,
+                        help="only sessions updated at or after this ISO date/datetime")
+    sync_p.add_argument("--jobs", type=positive_int, default=4,
+                        help="parallel file operations (default: 4)")
+    sync_p.add_argument("--dry-run", action="store_true", help="print the plan without writing")
+
+    watch_p = sub.add_parser("watch", help="keep mirroring source sessions into the target as they grow")
+    watch_p.add_argument("project_path", help="absolute or relative project path")
+    watch_p.add_argument("--min-gap", type=positive_float, default=2.0,
+                         help="minimum seconds between mirrors of the same session (default: 2)")
+    watch_p.add_argument("--poll-interval", type=positive_float, default=1.0,
+                         help="stat polling interval where inotify is unavailable (default: 1)")
     return parser
 
 
@@ -359,19 +877,43 @@ def main(argv: list[str]) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
     dirs = config_dirs()
-    scope = project_scope(Path(args.project_path), dirs)
+    caches = load_caches(cache_dir())
+    try:
+        scope = project_scope(Path(args.project_path), dirs, caches)
+        return run_command(parser, args, dirs, scope, caches)
+    finally:
+        caches.save()
+
+
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace, dirs: ConfigDirs,
+                scope: ProjectScope, caches: Caches) -> int:
     if args.command == "list":
-        reports = recent_sessions(scope, args.limit, args.recent_messages)
+        reports = recent_sessions(scope, args.limit, args.recent_messages, caches, args.jobs)
         if not reports:
             raise SystemExit(f"no session JSONL files found in {scope.source_dir}")
         print(report_json(scope, dirs, reports) if args.json else report_text(scope, dirs, reports, args.message_width))
         return 0
     if args.command == "copy":
-        report = resolve_session_id(scope, args.session_id, args.recent_messages)
-        print(copy_session(report, args.replace))
+        report = resolve_session_id(scope, args.session_id, args.recent_messages, caches)
+        print(copy_session(report, args.replace, args.sync))
         print(f"session_id: {report.session_id}")
         print(f"target_path: {report.target_path}")
         return 0
+    if args.command == "sync":
+        plan = plan_sync(scope, args.since, args.jobs, caches)
+        print(sync_text(plan))
+        if args.dry_run:
+            print("dry run: nothing written")
+            return 0
+        results = sync_project(plan, args.jobs)
+        for line in results:
+            print(line)
+        return 1 if any(line.startswith("failed:") for line in results) else 0
+    if args.command == "watch":
+        try:
+            return watch_project(scope, caches, args.min_gap, args.poll_interval)
+        except KeyboardInterrupt:
+            return 0
     parser.error(f"unknown command: {args.command}")
 
 
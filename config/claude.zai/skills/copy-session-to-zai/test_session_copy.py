@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""Tests for session_copy: project lookup, copying, and syncing transcripts.
+
+The CLI is covered end to end by tests/functional/test-copy-session-to-zai.bats;
+these exercise the pieces underneath against temp dirs.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import session_copy
+from session_copy import (
+    KERNEL_COPIES, InotifyWatcher, PollingWatcher, ProjectScope, append_tail, clone_file,
+    copy_range, file_digest, load_caches, mirror_session, plan_sync, project_dir_from_transcripts,
+    recent_sessions, target_state, watch_project,
+)
+
+
+def transcript(path: Path, *events: dict) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(e) + "\n" for e in events))
+    return path
+
+
+@pytest.fixture
+def caches(tmp_path):
+    return load_caches(tmp_path / "cache")
+
+
+# --- Project lookup ----------------------------------------------------------
+
+def test_project_lookup_finds_a_newer_dir_for_an_indexed_cwd(tmp_path, caches):
+    projects = tmp_path / "projects"
+    cwd = tmp_path / "work"
+    cwd.mkdir()
+    old = transcript(projects / "old-slug" / "a.jsonl", {"type": "user", "cwd": str(cwd)}).parent
+    os.utime(old, (1_000, 1_000))
+    assert project_dir_from_transcripts(projects, cwd, caches.cwd_index) == old
+
+    new = transcript(projects / "new-slug" / "b.jsonl", {"type": "user", "cwd": str(cwd)}).parent
+
+    assert project_dir_from_transcripts(projects, cwd, caches.cwd_index) == new
+
+
+# --- Digests -----------------------------------------------------------------
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Paths of the files actually hashed, in order."""
+    calls = []
+    real_open = Path.open
+    monkeypatch.setattr(Path, "open", lambda self, mode="r", *a, **kw:
+                        (mode == "rb" and calls.append(self.name)) or real_open(self, mode, *a, **kw))
+    return calls
+
+
+def test_file_digest_is_cached_until_the_file_changes(tmp_path, caches, hashed):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b"abc\n")
+
+    first = file_digest(path, caches.digests)
+    assert file_digest(path, caches.digests) == first
+    assert hashed == ["s.jsonl"]
+
+    with path.open("ab") as f:
+        f.write(b"more\n")
+    assert file_digest(path, caches.digests) != first
+    assert hashed == ["s.jsonl", "s.jsonl"]
+
+
+def test_file_digest_keeps_full_and_prefix_entries_apart(tmp_path, caches, hashed):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b"abc\ndef\n")
+    other = tmp_path / "o.jsonl"
+    other.write_bytes(b"abc\n")
+
+    prefix = file_digest(path, caches.digests, 4)
+    full = file_digest(path, caches.digests)
+
+    assert prefix == file_digest(other, caches.digests) != full
+    assert file_digest(path, caches.digests, 4) == prefix
+    assert hashed == ["s.jsonl", "s.jsonl", "o.jsonl"]
+
+
+def test_file_digest_rehashes_a_replaced_file_with_the_same_size(tmp_path, caches):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b"aaaa")
+    before = file_digest(path, caches.digests)
+    st = path.stat()
+    replacement = tmp_path / "new"
+    replacement.write_bytes(b"bbbb")
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, path)
+
+    assert file_digest(path, caches.digests) != before
+
+
+def test_file_digest_cache_survives_a_reload(tmp_path, hashed):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b"abc\n")
+    caches = load_caches(tmp_path / "cache")
+    digest = file_digest(path, caches.digests)
+    caches.save()
+
+    assert file_digest(path, load_caches(tmp_path / "cache").digests) == digest
+    assert hashed == ["s.jsonl"]
+
+
+def test_file_digest_stops_at_the_stamped_size(tmp_path, caches, monkeypatch):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(b"abc\n")
+    real_stat = Path.stat
+
+    def stat_then_append(self, *a, **kw):
+        st = real_stat(self, *a, **kw)
+        if self == path:
+            with open(self, "ab") as f:
+                f.write(b"appended while hashing\n")
+        return st
+
+    monkeypatch.setattr(Path, "stat", stat_then_append)
+    growing = file_digest(path, caches.digests)
+    monkeypatch.undo()
+    other = tmp_path / "o.jsonl"
+    other.write_bytes(b"abc\n")
+
+    assert growing == file_digest(other, caches.digests)
+
+
+def test_saving_caches_drops_entries_for_deleted_files(tmp_path, caches):
+    kept = transcript(tmp_path / "kept.jsonl", {"type": "user", "message": {"content": "hi"}})
+    gone = transcript(tmp_path / "gone.jsonl", {"type": "user", "message": {"content": "hi"}})
+    for path in (kept, gone):
+        file_digest(path, caches.digests)
+        file_digest(path, caches.digests, 4)
+        session_copy.session_metadata(path, caches.session_meta)
+    gone.unlink()
+
+    caches.save()
+    reloaded = load_caches(tmp_path / "cache")
+
+    assert sorted(reloaded.digests.data) == [f"{kept}|full", f"{kept}|prefix"]
+    assert list(reloaded.session_meta.data) == [str(kept)]
+
+# --- Target classification and appends -------------------------------------
+
+SOURCE_BYTES = b'{"type":"user","n":1}\n{"type":"assistant","n":2}\n'
+
+
+@pytest.mark.parametrize("make_target, state", [
+    (lambda t, s: None, "missing"),
+    (lambda t, s: t.write_bytes(SOURCE_BYTES), "exists-same"),
+    (lambda t, s: t.write_bytes(SOURCE_BYTES[:22]), "exists-prefix"),
+    (lambda t, s: t.write_bytes(b"X" + SOURCE_BYTES[1:22]), "exists-different"),
+    (lambda t, s: t.write_bytes(SOURCE_BYTES.replace(b"1", b"9")), "exists-different"),
+    (lambda t, s: t.write_bytes(SOURCE_BYTES + b"{}\n"), "exists-different"),
+    (lambda t, s: t.symlink_to(s), "target-symlink"),
+    (lambda t, s: t.mkdir(), "target-not-file"),
+])
+def test_target_state(tmp_path, caches, make_target, state):
+    source = tmp_path / "source.jsonl"
+    source.write_bytes(SOURCE_BYTES)
+    target = tmp_path / "target.jsonl"
+    make_target(target, source)
+
+    assert target_state(source, target, caches.digests) == state
+
+
+@pytest.fixture
+def grown(tmp_path):
+    """A source and an older copy of it: the target holds the first line."""
+    source = tmp_path / "source.jsonl"
+    source.write_bytes(SOURCE_BYTES)
+    target = tmp_path / "target.jsonl"
+    target.write_bytes(SOURCE_BYTES[:22])
+    return source, target
+
+
+def test_append_tail_appends_only_the_missing_bytes(grown):
+    source, target = grown
+
+    assert append_tail(source, target) == len(SOURCE_BYTES) - 22
+    assert target.read_bytes() == SOURCE_BYTES
+    assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+
+def test_append_tail_refuses_a_target_changed_since_classified(grown):
+    source, target = grown
+    target.write_bytes(b"Y" * 22)
+
+    with pytest.raises(SystemExit, match="target changed"):
+        append_tail(source, target)
+    assert target.read_bytes() == b"Y" * 22
+
+
+def test_append_tail_truncates_back_after_a_failed_copy(grown, monkeypatch):
+    source, target = grown
+
+    def partial_copy(src, dst, start):
+        dst.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(session_copy, "copy_range", partial_copy)
+    with pytest.raises(OSError, match="disk full"):
+        append_tail(source, target)
+    assert target.read_bytes() == SOURCE_BYTES[:22]
+
+
+# --- Copy mechanisms ---------------------------------------------------------
+
+PAYLOAD = bytes(range(256)) * 64
+
+
+def copy_tail(tmp_path, start: int = 100, dst_prefix: bytes = b"head") -> bytes:
+    source = tmp_path / "src"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "dst"
+    dest.write_bytes(dst_prefix)
+    with source.open("rb", buffering=0) as src, dest.open("r+b", buffering=0) as dst:
+        dst.seek(0, os.SEEK_END)
+        assert copy_range(src, dst, start) == len(PAYLOAD) - start
+        assert dst.tell() == len(dst_prefix) + len(PAYLOAD) - start
+    return dest.read_bytes()
+
+
+def failing_copy(calls: list, name: str):
+    """A kernel copy that writes a few bytes, then fails as unsupported."""
+    def copy(src_fd, dst_fd, src_off, dst_off, count):
+        calls.append(name)
+        os.pwrite(dst_fd, b"junk", dst_off)
+        raise OSError(95, "Operation not supported")
+    return copy
+
+
+@pytest.mark.parametrize("mechanism", range(len(KERNEL_COPIES)),
+                         ids=[f.__name__.lstrip("_") for f in KERNEL_COPIES])
+def test_copy_range_each_kernel_copy(tmp_path, monkeypatch, mechanism):
+    monkeypatch.setattr(session_copy, "KERNEL_COPIES", [KERNEL_COPIES[mechanism]])
+
+    assert copy_tail(tmp_path) == b"head" + PAYLOAD[100:]
+
+
+def test_copy_range_falls_back_through_kernel_copies_to_userspace(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(session_copy, "KERNEL_COPIES",
+                        [failing_copy(calls, "copy_file_range"), failing_copy(calls, "sendfile")])
+
+    assert copy_tail(tmp_path) == b"head" + PAYLOAD[100:]
+    assert calls == ["copy_file_range", "sendfile"]
+
+
+def test_copy_range_uses_the_next_kernel_copy_after_a_failure(tmp_path, monkeypatch):
+    calls = []
+    working = KERNEL_COPIES[-1]
+    monkeypatch.setattr(session_copy, "KERNEL_COPIES",
+                        [failing_copy(calls, "first"), lambda *a: calls.append("second") or working(*a)])
+
+    assert copy_tail(tmp_path, start=0, dst_prefix=b"") == PAYLOAD
+    assert calls == ["first", "second"]
+
+
+def test_copy_range_treats_a_short_kernel_copy_as_a_failure(tmp_path, monkeypatch):
+    calls = []
+
+    def short_copy(src_fd, dst_fd, src_off, dst_off, count):
+        calls.append("short")
+        return os.pwrite(dst_fd, os.pread(src_fd, 10, src_off), dst_off)
+
+    monkeypatch.setattr(session_copy, "KERNEL_COPIES", [short_copy, short_copy])
+
+    assert copy_tail(tmp_path) == b"head" + PAYLOAD[100:]
+    assert calls == ["short", "short"]
+
+def test_clone_file_copies_content_and_stat_without_reflink(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_copy, "reflink", lambda src, dst: False)
+    source = tmp_path / "src"
+    source.write_bytes(PAYLOAD)
+    os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+
+    clone_file(source, tmp_path / "dst")
+
+    assert (tmp_path / "dst").read_bytes() == PAYLOAD
+    assert (tmp_path / "dst").stat().st_mtime_ns == 2_000_000_000
+
+
+def test_clone_file_with_the_platform_reflink(tmp_path):
+    """Reflink where the filesystem supports it, a kernel copy where not."""
+    source = tmp_path / "src"
+    source.write_bytes(PAYLOAD)
+
+    clone_file(source, tmp_path / "dst")
+
+    assert (tmp_path / "dst").read_bytes() == PAYLOAD
+
+
+# --- Listing and planning in parallel ----------------------------------------
+
+@pytest.fixture
+def sessions(scope):
+    """Twelve sessions, one per minute, with targets in every sync state."""
+    for i in range(12):
+        source = scope.source_dir / f"s{i:02d}.jsonl"
+        transcript(source, *({"type": "user", "timestamp": f"2026-06-11T00:{i:02d}:{n:02d}Z",
+                              "message": {"role": "user", "content": f"session {i} message {n}"}}
+                             for n in range(i + 1)))
+        os.utime(source, (1_800_000_000 + 60 * i,) * 2)
+        target = scope.target_dir / source.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if i % 4 == 1:
+            target.write_bytes(source.read_bytes())
+        elif i % 4 == 2:
+            target.write_bytes(source.read_bytes().splitlines(keepends=True)[0])
+        elif i % 4 == 3:
+            target.write_text("diverged\n")
+    return scope
+
+
+def test_recent_sessions_in_parallel_matches_serial(sessions, tmp_path):
+    serial = recent_sessions(sessions, 10, 3, load_caches(tmp_path / "serial"), jobs=1)
+    parallel = recent_sessions(sessions, 10, 3, load_caches(tmp_path / "parallel"), jobs=8)
+
+    assert parallel == serial
+    assert [r.session_id for r in serial] == [f"s{i:02d}" for i in range(11, 1, -1)]
+    assert [r.index for r in serial] == list(range(1, 11))
+    assert {r.target_state for r in serial} == {"missing", "exists-same", "exists-prefix",
+                                                "exists-different"}
+
+
+def test_plan_sync_in_parallel_matches_serial(sessions, tmp_path):
+    caches = load_caches(tmp_path / "parallel")
+    serial = plan_sync(sessions, None, 1, load_caches(tmp_path / "serial"))
+    parallel = plan_sync(sessions, None, 4, caches)
+
+    assert parallel == serial
+    assert [a.action for a in serial[:4]] == ["conflict", "append", "skip", "copy"]
+
+    # The digests cached by concurrent workers are the ones a serial run computes
+    caches.save()
+    assert plan_sync(sessions, None, 1, load_caches(tmp_path / "parallel")) == serial
+
+    since = datetime.fromtimestamp(1_800_000_000 + 60 * 9, timezone.utc)
+    assert [a.session_id for a in plan_sync(sessions, since, 4, caches)] == ["s11", "s10", "s09"]
+
+
+# --- Live mirroring ----------------------------------------------------------
+
+def append_event(path: Path, text: str) -> None:
+    with path.open("a") as f:
+        f.write(json.dumps({"type": "user", "message": {"role": "user", "content": text}}) + "\n")
+
+
+@pytest.fixture
+def scope(tmp_path):
+    source_dir = tmp_path / "source" / "proj"
+    target_dir = tmp_path / "target" / "proj"
+    source_dir.mkdir(parents=True)
+    return ProjectScope(cwd=tmp_path, slug="proj", source_dir=source_dir, target_dir=target_dir)
+
+
+def test_mirror_session_copies_appends_and_reports_conflicts_once(scope, caches):
+    source = scope.source_dir / "s.jsonl"
+    target = scope.target_dir / "s.jsonl"
+    append_event(source, "one")
+    mirrored, reported = {}, set()
+
+    assert mirror_session(source, scope.target_dir, caches, mirrored, reported).startswith("copied:")
+    assert mirror_session(source, scope.target_dir, caches, mirrored, reported) is None
+    append_event(source, "two")
+    assert mirror_session(source, scope.target_dir, caches, mirrored, reported).startswith("appended:")
+    assert target.read_bytes() == source.read_bytes()
+
+    append_event(target, "continued elsewhere")
+    append_event(source, "three")
+    assert mirror_session(source, scope.target_dir, caches, mirrored, reported).startswith("conflict:")
+    assert mirror_session(source, scope.target_dir, caches, mirrored, reported) is None
+    assert "continued elsewhere" in target.read_text()
+
+
+class ScriptedWatcher:
+    """Runs one scripted change per wait() and reports what `watcher` sees,
+    or what the step returns if it is not None; Ctrl-C once the script ends."""
+
+    def __init__(self, steps, watcher=None):
+        self.steps = iter(steps)
+        self.watcher = watcher
+
+    def wait(self, timeout):
+        step = next(self.steps, None)
+        if step is None:
+            raise KeyboardInterrupt
+        reported = step()
+        return self.watcher.wait(timeout) if self.watcher else reported
+
+
+def run_watch(monkeypatch, scope, caches, steps, polling: bool) -> None:
+    monkeypatch.setattr("session_copy.open_watcher", lambda directory, interval: ScriptedWatcher(
+        steps, PollingWatcher(directory, 0.01) if polling else None))
+    with pytest.raises(KeyboardInterrupt):
+        watch_project(scope, caches, min_gap=0.0, poll_interval=0.01)
+
+
+def test_watch_project_mirrors_grown_and_new_sessions(monkeypatch, scope, caches):
+    a, b = scope.source_dir / "a.jsonl", scope.source_dir / "b.jsonl"
+    append_event(a, "first")
+
+    run_watch(monkeypatch, scope, caches, [
+        lambda: append_event(a, "second"),
+        lambda: append_event(b, "new session"),
+        lambda: None,
+    ], polling=True)
+
+    for source in (a, b):
+        assert (scope.target_dir / source.name).read_bytes() == source.read_bytes()
+
+
+def test_watch_project_rechecks_every_session_after_lost_events(monkeypatch, scope, caches):
+    a = scope.source_dir / "a.jsonl"
+    append_event(a, "first")
+
+    def grow_unreported():
+        append_event(a, "second")
+        return None  # what InotifyWatcher.wait returns on IN_Q_OVERFLOW
+
+    run_watch(monkeypatch, scope, caches, [grow_unreported, lambda: set()], polling=False)
+
+    assert (scope.target_dir / "a.jsonl").read_bytes() == a.read_bytes()
+
+
+@pytest.mark.parametrize("make_watcher", [
+    pytest.param(InotifyWatcher, id="inotify"),
+    pytest.param(lambda d: PollingWatcher(d, 0.05), id="polling"),
+])
+def test_watchers_report_changed_sessions(tmp_path, make_watcher):
+    try:
+        watcher = make_watcher(tmp_path)
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    time.sleep(0.01)
+
+    append_event(tmp_path / "a.jsonl", "x")
+
+    assert "a.jsonl" in watcher.wait(1.0)
+
+
+def test_inotify_queue_overflow_reports_lost_events(tmp_path):
+    try:
+        watcher = InotifyWatcher(tmp_path)
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    # Stand a pipe in for the inotify fd, carrying the event the kernel
+    # queues when it drops events: IN_Q_OVERFLOW on watch descriptor -1
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.close(watcher.fd)
+    watcher.fd = read_fd
+    os.write(write_fd, InotifyWatcher.EVENT_HEADER.pack(-1, InotifyWatcher.IN_Q_OVERFLOW, 0, 0))
+
+    try:
+        assert watcher.wait(1.0) is None
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
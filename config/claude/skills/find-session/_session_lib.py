@@ -1,16 +1,24 @@
-"""Shared helpers for the find-session skill.
+"""Shared transcript access for the session skills.
 
-Pure functions over Claude Code transcript JSONL. Both `find_session.py`
-(search across many sessions) and `show_session.py` (probe one session)
-build on this module.
+Functions over Claude Code transcript JSONL: decoding, text extraction,
+project-slug encoding, and the fast paths every session tool needs — a
+type prefilter ahead of json.loads, resumable byte-offset scans, a reverse
+reader for tail-only queries, and a persistent metadata cache. Used by
+`find_session.py`, `show_session.py`, `export_sessions.py`, and the
+copy-session-to-zai skill's `session_copy.py`, so all of them agree on
+what a message is and where a project's sessions live.
 """
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
-from collections.abc import Iterator
+import sys
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Any
 
 ROOTS = [Path.home() / ".claude" / "projects",
          Path.home() / ".claude.zai" / "projects"]
@@ -23,7 +31,12 @@ MESSAGE_TYPES = {"user", "assistant"}
 
 
 def slug_for(cwd: Path) -> str:
-    return re.sub(r"[/.]", "-", str(cwd))
+    """Claude Code's project-dir name for a working directory.
+
+    The path is resolved first: Claude Code keys projects by the real cwd,
+    so a symlinked checkout maps to the same directory as its target.
+    """
+    return re.sub(r"[/.]", "-", str(cwd.resolve()))
 
 
 def session_dirs(slug: str, all_projects: bool) -> list[Path]:
@@ -40,6 +53,11 @@ def session_dirs(slug: str, all_projects: bool) -> list[Path]:
     return dirs
 
 
+def root_label(directory: Path) -> str:
+    """How every session tool labels the root a session dir sits under."""
+    return ".claude.zai" if ".claude.zai" in str(directory) else ".claude"
+
+
 def locate_session_file(project: str, session_id: str) -> Path:
     """Resolve <project>/<session_id>.jsonl under either root.
 
@@ -55,32 +73,106 @@ def locate_session_file(project: str, session_id: str) -> Path:
     raise FileNotFoundError(f"session file not found; tried:\n  {paths}")
 
 
-def extract_text(event: dict) -> str:
-    """Searchable text from one JSONL event. Empty string for noise types."""
+def _message_content(event: dict) -> Any:
+    msg = event.get("message")
+    return msg.get("content") if isinstance(msg, dict) else None
+
+
+def extract_text(event: dict, thinking: bool = True) -> str:
+    """Searchable text from one JSONL event. Empty string for noise types.
+
+    Events marked isMeta (caveats and command plumbing Claude Code injects
+    as user messages) are noise. Assistant thinking blocks count as text
+    unless thinking=False.
+    """
     t = event.get("type")
     if t == "ai-title":
         return event.get("aiTitle", "") or ""
-    if t == "user":
-        msg = event.get("message", {}) or {}
-        c = msg.get("content")
-        if isinstance(c, str):
-            return c
-        if isinstance(c, list):
-            return "\n".join(b.get("text", "") for b in c
-                             if isinstance(b, dict) and b.get("type") == "text")
+    if t not in MESSAGE_TYPES or event.get("isMeta"):
+        return ""
+    c = _message_content(event)
+    if isinstance(c, str):
+        return c
+    if not isinstance(c, list):
+        return ""
+    block_types = {"text", "thinking"} if thinking and t == "assistant" else {"text"}
+    parts = (b.get(b["type"]) for b in c
+             if isinstance(b, dict) and b.get("type") in block_types)
+    return "\n".join(p for p in parts if isinstance(p, str))
+
+
+def event_title(event: dict) -> str | None:
+    """The session title carried by an ai-title event, if any."""
+    title = event.get("aiTitle")
+    return title.strip() if isinstance(title, str) and title.strip() else None
+
+
+def _string_leaves(value) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _string_leaves(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _string_leaves(v)
+
+
+def _content_blocks(event: dict, block_type: str) -> list[dict]:
+    c = _message_content(event)
+    if not isinstance(c, list):
+        return []
+    return [b for b in c if isinstance(b, dict) and b.get("type") == block_type]
+
+
+def extract_tool_use(event: dict) -> str:
+    """Tool calls in an assistant event: tool name plus every string input.
+
+    String leaves rather than JSON so a path or command matches the way the
+    user typed it — json.dumps would escape quotes and backslashes.
+    """
+    if event.get("type") != "assistant":
         return ""
-    if t == "assistant":
-        msg = event.get("message", {}) or {}
-        c = msg.get("content")
-        if isinstance(c, list):
-            return "\n".join(
-                b.get("text", "") if b.get("type") == "text"
-                else b.get("thinking", "") if b.get("type") == "thinking"
-                else ""
-                for b in c if isinstance(b, dict)
-            )
+    return "\n".join(
+        "\n".join([b.get("name", "") or "", *_string_leaves(b.get("input"))])
+        for b in _content_blocks(event, "tool_use")
+    )
+
+
+def extract_tool_result(event: dict) -> str:
+    """Tool output carried back in a user event's tool_result blocks."""
+    if event.get("type") != "user":
         return ""
-    return ""
+    parts: list[str] = []
+    for b in _content_blocks(event, "tool_result"):
+        c = b.get("content")
+        if isinstance(c, str):
+            parts.append(c)
+        elif isinstance(c, list):
+            parts.extend(x.get("text", "") or "" for x in c
+                         if isinstance(x, dict) and x.get("type") == "text")
+    return "\n".join(parts)
+
+
+# Searchable content kinds, each with its own extractor so a search pays only
+# for the kinds it asked for. "text" is the default; tool calls and results
+# are opt-in because they dwarf the conversation text.
+EXTRACTORS = {
+    "text": extract_text,
+    "tool_use": extract_tool_use,
+    "tool_result": extract_tool_result,
+}
+
+
+def kinds_arg(s: str) -> tuple[str, ...]:
+    """argparse type= for a comma-separated list of EXTRACTORS keys."""
+    kinds = tuple(dict.fromkeys(k.strip() for k in s.split(",") if k.strip()))
+    unknown = [k for k in kinds if k not in EXTRACTORS]
+    if not kinds or unknown:
+        raise argparse.ArgumentTypeError(
+            f"expected a comma-separated subset of {', '.join(EXTRACTORS)} (got {s!r})"
+        )
+    return kinds
 
 
 def regex_arg(s: str) -> re.Pattern:
@@ -123,20 +215,233 @@ def safe_path_component(s: str) -> str:
     return s
 
 
-def iter_events(path: Path) -> Iterator[dict]:
-    """Yield parsed JSONL events; malformed or non-object lines are skipped.
+def decode_line(line: bytes) -> dict | None:
+    """One JSONL line as an event; None when malformed or not an object.
 
     Malformed-line tolerance is intentional: transcripts are append-only logs
     and a torn final line during a crash is a known shape — failing the whole
     scan on one bad line would be worse than skipping it. Non-object JSON
-    (a bare null, list, or string) is treated the same — the declared return
-    type is the contract; callers should be able to trust ev.get(...) works.
+    (a bare null, list, or string) is treated the same — callers should be
+    able to trust ev.get(...) works.
     """
-    with path.open("r", encoding="utf-8", errors="replace") as f:
-        for line in f:
-            try:
-                ev = json.loads(line)
-            except json.JSONDecodeError:
+    try:
+        ev = json.loads(line.decode("utf-8", errors="replace"))
+    except json.JSONDecodeError:
+        return None
+    return ev if isinstance(ev, dict) else None
+
+
+def _type_needles(types: Iterable[str] | None) -> tuple[bytes, ...] | None:
+    # Every line of a wanted type contains its type as a quoted JSON string,
+    # whatever the key order or spacing, so a line containing none of them
+    # can be skipped without decoding. A needle found elsewhere in the line
+    # is only a false positive, settled by the type check after decoding.
+    return None if types is None else tuple(json.dumps(t).encode() for t in types)
+
+
+def _decode_wanted(line: bytes, types, needles) -> dict | None:
+    if needles is not None and not any(n in line for n in needles):
+        return None
+    ev = decode_line(line)
+    if ev is None or (types is not None and ev.get("type") not in types):
+        return None
+    return ev
+
+
+def iter_events(path: Path, types: Iterable[str] | None = None) -> Iterator[dict]:
+    """Yield parsed JSONL events; malformed or non-object lines are skipped.
+
+    With `types`, only events of those types are yielded, and lines that
+    cannot be one of them are never decoded — on real transcripts, where
+    tool progress and file snapshots dominate, that skips most json.loads
+    calls.
+    """
+    yield from EventCursor(path, types=types)
+
+
+class EventCursor:
+    """Events of one transcript from a byte offset, with a resumable checkpoint.
+
+    Iterating yields events (filtered like iter_events) and advances
+    `offset` past every complete line, wanted or not. A final line without
+    its newline is still being written: it is yielded with `torn` set, but
+    `offset` stays before it, so a scan resumed from `offset` reads it again
+    once it is complete.
+    """
+
+    def __init__(self, path: Path, offset: int = 0,
+                 types: Iterable[str] | None = None) -> None:
+        self.path = path
+        self.offset = offset
+        self.types = None if types is None else frozenset(types)
+        self.torn = False
+
+    def __iter__(self) -> Iterator[dict]:
+        needles = _type_needles(self.types)
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                complete = line.endswith(b"\n")
+                self.torn = not complete
+                ev = _decode_wanted(line, self.types, needles)
+                if ev is not None:
+                    yield ev
+                if not complete:
+                    return
+                self.offset += len(line)
+
+
+TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def iter_events_reverse(path: Path, types: Iterable[str] | None = None) -> Iterator[dict]:
+    """Yield parsed events from the end of the file backwards.
+
+    Reads fixed-size blocks from EOF toward the start, so a caller that only
+    needs the last few events stops after reading the tail. Same filtering
+    and tolerance as iter_events.
+    """
+    types = None if types is None else frozenset(types)
+    needles = _type_needles(types)
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        # Pieces of the line that reaches back into blocks not yet read,
+        # latest first. They are joined once, when the line's start is
+        # found, so a line spanning many blocks is never copied per block.
+        pending: list[bytes] = []
+        while pos > 0:
+            step = min(TAIL_BLOCK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            if b"\n" not in block:
+                pending.append(block)
                 continue
-            if isinstance(ev, dict):
-                yield ev
+            lines = block.split(b"\n")
+            lines[-1] += b"".join(reversed(pending))
+            # The first piece may continue into the previous block; hold it
+            # until that block has been read (or the start of file is hit).
+            pending = [lines.pop(0)]
+            for line in reversed(lines):
+                ev = _decode_wanted(line, types, needles)
+                if ev is not None:
+                    yield ev
+        ev = _decode_wanted(b"".join(reversed(pending)), types, needles)
+        if ev is not None:
+            yield ev
+
+
+def last_timestamp(path: Path) -> str | None:
+    """Timestamp of the last event that carries one, read from the tail."""
+    for ev in iter_events_reverse(path):
+        ts = ev.get("timestamp")
+        if isinstance(ts, str) and ts:
+            return ts
+    return None
+
+
+def is_message(event: dict) -> bool:
+    """A user or assistant event with visible text — what a reader counts."""
+    return (event.get("type") in MESSAGE_TYPES
+            and bool(extract_text(event, thinking=False).strip()))
+
+
+class JsonCache:
+    """A persistent string-keyed dict stored as one JSON file.
+
+    A cache is an optimization, never a source of truth: an unreadable or
+    malformed file loads as empty, and a failed save only costs the next run
+    its speedup — both are reported on stderr, neither aborts the caller.
+    Safe to share across worker threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.dirty = False
+        self.lock = threading.Lock()
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            data = {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"warning: ignoring unreadable cache {path}: {e}", file=sys.stderr)
+            data = {}
+        self.data: dict[str, Any] = data if isinstance(data, dict) else {}
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            return self.data.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        with self.lock:
+            if self.data.get(key) != value:
+                self.data[key] = value
+                self.dirty = True
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            if self.data.pop(key, None) is not None:
+                self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.lock:
+                payload = json.dumps(self.data, sort_keys=True)
+            tmp.write_text(payload)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"warning: could not save cache {self.path}: {e}", file=sys.stderr)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+
+META_GUARD_BYTES = 64
+
+
+def _guard(f, offset: int) -> str:
+    f.seek(max(0, offset - META_GUARD_BYTES))
+    return f.read(offset - f.tell()).hex()
+
+
+def session_metadata(path: Path, cache: JsonCache) -> tuple[str | None, int]:
+    """(title, message_count) for a transcript, scanning only unseen bytes.
+
+    The cache records how far the file has been scanned (always a line
+    boundary), the bytes just before that point, and the title and count up
+    to there. Transcripts are append-only, so while the file keeps its
+    (device, inode) and those bytes, only what lies past the offset needs
+    decoding. A torn final line counts toward this answer but not toward
+    the cached state, so it is never counted twice.
+    """
+    st = path.stat()
+    stamp = [st.st_dev, st.st_ino]
+    entry = cache.get(str(path))
+    offset, title, count = 0, None, 0
+    if isinstance(entry, dict) and entry.get("stamp") == stamp and entry.get("offset", 0) <= st.st_size:
+        with path.open("rb") as f:
+            if _guard(f, entry["offset"]) == entry.get("guard"):
+                offset, title, count = entry["offset"], entry.get("title"), entry.get("message_count", 0)
+
+    cursor = EventCursor(path, offset, types=TEXT_TYPES)
+    committed_title, committed_count = title, count
+    for ev in cursor:
+        title = event_title(ev) or title
+        count += is_message(ev)
+        if not cursor.torn:
+            committed_title, committed_count = title, count
+    with path.open("rb") as f:
+        guard = _guard(f, cursor.offset)
+    cache.put(str(path), {
+        "stamp": stamp,
+        "offset": cursor.offset,
+        "guard": guard,
+        "title": committed_title,
+        "message_count": committed_count,
+    })
+    return title, count
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Export Claude Code transcripts to a month-partitioned Parquet dataset.
+
+One row per conversation event (ai-title, user, assistant): session, project,
+root, role, uuid, timestamp, text length, and the names of any tools the event
+called. The layout is hive-partitioned so DuckDB, Polars, or pyarrow.dataset
+read it directly:
+
+  <out>/month=YYYY-MM/<root>__<project>__<session_id>.parquet
+
+Export is incremental: <out>/_export_state.json records each transcript's
+(size, mtime_ns) and the partition files it produced. Unchanged transcripts
+are skipped; changed ones have their files rewritten; transcripts that no
+longer exist have their files removed.
+
+Requires pyarrow (`pip install pyarrow`).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from _session_lib import (
+    TEXT_TYPES,
+    extract_text,
+    iter_events,
+    root_label,
+    session_dirs,
+    slug_for,
+)
+
+STATE_FILE = "_export_state.json"
+# 2: `root` holds find_session's labels (.claude, .claude.zai)
+STATE_VERSION = 2
+
+
+def load_arrow():
+    """Import pyarrow lazily so the rest of the skill never depends on it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("error: export_sessions.py requires pyarrow (pip install pyarrow)",
+              file=sys.stderr)
+        return None
+    return pa, pq
+
+
+def parse_ts(iso: str | None) -> datetime | None:
+    if not isinstance(iso, str) or not iso:
+        return None
+    try:
+        ts = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def tool_names(event: dict) -> list[str]:
+    msg = event.get("message", {}) or {}
+    c = msg.get("content") if isinstance(msg, dict) else None
+    if not isinstance(c, list):
+        return []
+    return [b.get("name", "") or "" for b in c
+            if isinstance(b, dict) and b.get("type") == "tool_use"]
+
+
+def session_rows(path: Path, project: str, root: str) -> dict[str, list[dict]]:
+    """Rows for one transcript, grouped by YYYY-MM partition.
+
+    Events without a timestamp (ai-title) inherit the most recent timestamp
+    seen in the session, falling back to the file's mtime — a session's
+    metadata lands in the same partition as its conversation.
+    """
+    fallback = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+    rows: list[dict] = []
+    last_ts: datetime | None = None
+    for ev in iter_events(path, types=TEXT_TYPES):
+        ts = parse_ts(ev.get("timestamp"))
+        if ts is not None:
+            last_ts = ts
+        rows.append({
+            "session_id": path.stem,
+            "project": project,
+            "root": root,
+            "role": ev.get("type"),
+            "uuid": ev.get("uuid") or None,
+            "timestamp": ts,
+            "text_len": len(extract_text(ev)),
+            "tool_names": tool_names(ev),
+            "_month_ts": ts or last_ts,
+        })
+
+    by_month: dict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        month = (row.pop("_month_ts") or last_ts or fallback).strftime("%Y-%m")
+        by_month[month].append(row)
+    return by_month
+
+
+def arrow_schema(pa):
+    return pa.schema([
+        ("session_id", pa.string()),
+        ("project", pa.string()),
+        ("root", pa.string()),
+        ("role", pa.string()),
+        ("uuid", pa.string()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("text_len", pa.int64()),
+        ("tool_names", pa.list_(pa.string())),
+    ])
+
+
+def write_partition(arrow, out: Path, month: str, name: str, rows: list[dict]) -> str:
+    """Write one partition file atomically; returns its path relative to out.
+
+    The temp name starts with '.', which dataset readers ignore, so a reader
+    scanning mid-export never sees a half-written file.
+    """
+    pa, pq = arrow
+    rel = Path(f"month={month}") / f"{name}.parquet"
+    dest = out / rel
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.tmp-{os.getpid()}")
+    try:
+        pq.write_table(pa.Table.from_pylist(rows, schema=arrow_schema(pa)), tmp)
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return str(rel)
+
+
+def load_state(out: Path) -> dict:
+    try:
+        state = json.loads((out / STATE_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {}
+    files = state.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_state(out: Path, files: dict) -> None:
+    tmp = out / f".{STATE_FILE}.tmp-{os.getpid()}"
+    tmp.write_text(json.dumps({"version": STATE_VERSION, "files": files},
+                              indent=2, sort_keys=True))
+    os.replace(tmp, out / STATE_FILE)
+
+
+def remove_parts(out: Path, parts: list[str]) -> None:
+    for rel in parts:
+        (out / rel).unlink(missing_ok=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("out", type=Path, help="Output dataset directory")
+    ap.add_argument("--all", action="store_true",
+                    help="Export every project, not just $PWD's")
+    ap.add_argument("--cwd", default=os.getcwd(),
+                    help="Override working directory used for slug (default: $PWD)")
+    ap.add_argument("--full", action="store_true",
+                    help="Rewrite every session, even ones unchanged since the last export")
+    args = ap.parse_args()
+
+    arrow = load_arrow()
+    if arrow is None:
+        return 2
+
+    slug = slug_for(Path(args.cwd))
+    dirs = session_dirs(slug, args.all)
+    if not dirs:
+        scope = "anywhere" if args.all else f"for project slug {slug!r}"
+        print(f"no session directories found {scope}", file=sys.stderr)
+        return 2
+
+    out = args.out.expanduser()
+    out.mkdir(parents=True, exist_ok=True)
+    previous = load_state(out)
+    current: dict[str, dict] = {}
+    exported = skipped = rows_written = 0
+
+    for d in dirs:
+        label = root_label(d)
+        for f in sorted(d.glob("*.jsonl")):
+            try:
+                st = f.stat()
+            except OSError as e:
+                print(f"warning: skipping {f}: {e}", file=sys.stderr)
+                continue
+            key = str(f)
+            prev = previous.pop(key, None)
+            unchanged = (prev and prev.get("size") == st.st_size
+                         and prev.get("mtime_ns") == st.st_mtime_ns)
+            if unchanged and not args.full:
+                current[key] = prev
+                skipped += 1
+                continue
+            # No leading '.': dataset readers skip dot files
+            name = f"{label.lstrip('.')}__{d.name}__{f.stem}"
+            parts = []
+            for month, rows in sorted(session_rows(f, d.name, label).items()):
+                parts.append(write_partition(arrow, out, month, name, rows))
+                rows_written += len(rows)
+            # Replaced files were swapped in place; only partitions the
+            # session no longer touches are left to delete.
+            if prev:
+                remove_parts(out, [p for p in prev.get("parts", []) if p not in parts])
+            current[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "parts": parts}
+            exported += 1
+
+    # Anything left in `previous` is a transcript that no longer exists in
+    # scope. Only prune it under the same scope, otherwise a narrower run
+    # (no --all) would delete rows exported by a wider one.
+    removed = 0
+    for key, prev in previous.items():
+        if args.all or Path(key).parent in dirs:
+            remove_parts(out, prev.get("parts", []))
+            removed += 1
+        else:
+            current[key] = prev
+
+    save_state(out, current)
+    print(f"exported {exported} session(s) ({rows_written} rows), "
+          f"{skipped} unchanged, {removed} removed -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
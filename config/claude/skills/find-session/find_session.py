@@ -5,9 +5,11 @@ Searches ~/.claude/projects/<slug>/*.jsonl and ~/.claude.zai/projects/<slug>/*.j
 where <slug> is $PWD with `/` and `.` replaced by `-` (matches Claude Code's
 own project-dir encoding).
 
-Only meaningful text fields are searched (ai-title, user prompts, assistant
-text/thinking). Attachments, hook outputs, and metadata events are skipped to
-keep matches signal-rich and output compact.
+Only meaningful text fields are searched by default (ai-title, user prompts,
+assistant text/thinking). Attachments, hook outputs, and metadata events are
+skipped to keep matches signal-rich and output compact. Tool calls and tool
+results are opt-in via --include; each kind is extracted and counted
+separately, so the default text-only search does no extra work.
 
 The session ID set in CLAUDE_CODE_SESSION_ID (if any) is excluded from results
 so the agent never matches the session it's currently being run from.
@@ -18,17 +20,21 @@ import argparse
 import os
 import re
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
 from _session_lib import (
+    EXTRACTORS,
     TEXT_TYPES,
     extract_text,
     iter_events,
+    kinds_arg,
+    last_timestamp,
     nonneg_int,
     positive_int,
     regex_arg,
+    root_label,
     session_dirs,
     slug_for,
 )
@@ -45,42 +51,43 @@ class SessionHit:
     last_ts: str = ""
     mtime: float = 0.0
     first_user_prompt: str = ""
+    first_snippet_kind: str = ""
+    kind_matches: dict[str, int] = field(default_factory=dict)
 
 
-def scan_file(path: Path, pat: re.Pattern, project: str, root_label: str) -> SessionHit | None:
+def scan_file(path: Path, pat: re.Pattern, project: str, root_label: str,
+              kinds: tuple[str, ...] = ("text",)) -> SessionHit | None:
     try:
         hit = SessionHit(
             session_id=path.stem,
             project=project,
             root_label=root_label,
             mtime=path.stat().st_mtime,
+            last_ts=last_timestamp(path) or "",
         )
-        for ev in iter_events(path):
+        for ev in iter_events(path, types=TEXT_TYPES):
             if ev.get("type") == "ai-title" and not hit.title:
                 hit.title = ev.get("aiTitle", "") or ""
 
             if ev.get("type") == "user" and not hit.first_user_prompt:
                 hit.first_user_prompt = extract_text(ev)[:200]
 
-            ts = ev.get("timestamp")
-            if ts and ts > hit.last_ts:
-                hit.last_ts = ts
-
-            if ev.get("type") not in TEXT_TYPES:
-                continue
-            text = extract_text(ev)
-            if not text:
-                continue
-            found = pat.findall(text)
-            if not found:
-                continue
-            hit.matches += len(found)
-            if not hit.first_snippet:
-                m = pat.search(text)
-                if m:
-                    start = max(0, m.start() - 40)
-                    end = min(len(text), m.end() + 80)
-                    hit.first_snippet = text[start:end].replace("\n", " ").strip()
+            for kind in kinds:
+                text = EXTRACTORS[kind](ev)
+                if not text:
+                    continue
+                found = pat.findall(text)
+                if not found:
+                    continue
+                hit.matches += len(found)
+                hit.kind_matches[kind] = hit.kind_matches.get(kind, 0) + len(found)
+                if not hit.first_snippet:
+                    m = pat.search(text)
+                    if m:
+                        start = max(0, m.start() - 40)
+                        end = min(len(text), m.end() + 80)
+                        hit.first_snippet = text[start:end].replace("\n", " ").strip()
+                        hit.first_snippet_kind = kind
     except OSError as e:
         print(f"warning: skipping {path}: {e}", file=sys.stderr)
         return None
@@ -109,6 +116,9 @@ def main() -> int:
                     help="Truncate snippet to N chars (default: 120; 0 suppresses snippet)")
     ap.add_argument("--cwd", default=os.getcwd(),
                     help="Override working directory used for slug (default: $PWD)")
+    ap.add_argument("--include", type=kinds_arg, default=("text",),
+                    help=f"Comma-separated content kinds to search: "
+                         f"{', '.join(EXTRACTORS)} (default: text)")
     args = ap.parse_args()
 
     pat = args.query
@@ -124,11 +134,12 @@ def main() -> int:
 
     hits: list[SessionHit] = []
     for d in dirs:
-        root_label = ".claude.zai" if ".claude.zai" in str(d) else ".claude"
+        label = root_label(d)
         for f in d.glob("*.jsonl"):
             if f.stem == current_id:
                 continue
-            h = scan_file(f, pat, project=d.name, root_label=root_label)
+            h = scan_file(f, pat, project=d.name, root_label=label,
+                          kinds=args.include)
             if h:
                 hits.append(h)
 
@@ -140,15 +151,21 @@ def main() -> int:
         print(f"no sessions matching {args.query.pattern!r} in {len(dirs)} project dir(s)")
         return 1
 
+    show_kinds = args.include != ("text",)
     for h in shown:
         date = fmt_date(h.last_ts, h.mtime)
         title = h.title or h.first_user_prompt[:60] or "(untitled)"
-        line = (f"{h.session_id}  {date}  hits={h.matches:<3}  "
+        by_kind = ""
+        if show_kinds:
+            by_kind = " (" + " ".join(f"{k}={h.kind_matches[k]}"
+                                      for k in args.include if k in h.kind_matches) + ")"
+        line = (f"{h.session_id}  {date}  hits={h.matches:<3}{by_kind}  "
                 f"[{h.root_label}]  {h.project}  {title}")
         print(line)
         snip = h.first_snippet[:args.snippet_len]
         if snip:
-            print(f"  ↳ {snip}")
+            tag = f"[{h.first_snippet_kind}] " if show_kinds else ""
+            print(f"  ↳ {tag}{snip}")
 
     total = len(hits)
     if total > len(shown):
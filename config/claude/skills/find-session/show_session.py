@@ -40,9 +40,7 @@ class Message:
 
 def load_messages(path: Path) -> list[Message]:
     msgs: list[Message] = []
-    for ev in iter_events(path):
-        if ev.get("type") not in MESSAGE_TYPES:
-            continue
+    for ev in iter_events(path, types=MESSAGE_TYPES):
         text = extract_text(ev)
         if not text:
             continue
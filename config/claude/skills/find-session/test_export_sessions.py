@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for export_sessions: the incremental month-partitioned export."""
+
+import json
+import os
+import sys
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+import _session_lib
+import export_sessions
+
+
+def event(ts: str, text: str) -> str:
+    return json.dumps({"type": "user", "timestamp": ts, "uuid": text,
+                       "message": {"role": "user", "content": text}}) + "\n"
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    roots = [tmp_path / ".claude" / "projects", tmp_path / ".claude.zai" / "projects"]
+    monkeypatch.setattr(_session_lib, "ROOTS", roots)
+    for root, name in zip(roots, ("a", "b")):
+        (root / "proj").mkdir(parents=True)
+        (root / "proj" / f"{name}.jsonl").write_text(event("2026-05-31T23:00:00Z", f"{name}1"))
+    return roots
+
+
+def export(monkeypatch, capsys, out) -> str:
+    monkeypatch.setattr(sys, "argv", ["export_sessions.py", str(out), "--all"])
+    assert export_sessions.main() == 0
+    return capsys.readouterr().out
+
+
+def dataset(out) -> dict:
+    """{partition file: sorted (root, uuid) rows}."""
+    return {str(p.relative_to(out)): sorted(zip(*pq.read_table(p, columns=["root", "uuid"])
+                                                .to_pydict().values()))
+            for p in sorted(out.rglob("*.parquet"))}
+
+
+def test_export_rewrites_changed_and_removes_deleted_sessions(home, tmp_path, monkeypatch, capsys):
+    out = tmp_path / "out"
+    claude_session = home[0] / "proj" / "a.jsonl"
+    zai_session = home[1] / "proj" / "b.jsonl"
+
+    assert "exported 2 session(s) (2 rows), 0 unchanged, 0 removed" in export(monkeypatch, capsys, out)
+    assert dataset(out) == {
+        "month=2026-05/claude.zai__proj__b.parquet": [(".claude.zai", "b1")],
+        "month=2026-05/claude__proj__a.parquet": [(".claude", "a1")],
+    }
+    assert "exported 0 session(s) (0 rows), 2 unchanged" in export(monkeypatch, capsys, out)
+
+    # A session growing into the next month gains a partition
+    with claude_session.open("a") as f:
+        f.write(event("2026-06-01T01:00:00Z", "a2"))
+    assert "exported 1 session(s) (2 rows), 1 unchanged" in export(monkeypatch, capsys, out)
+    state = json.loads((out / "_export_state.json").read_text())["files"]
+    assert state[str(claude_session)]["parts"] == [
+        "month=2026-05/claude__proj__a.parquet", "month=2026-06/claude__proj__a.parquet"]
+    assert state[str(claude_session)]["size"] == claude_session.stat().st_size
+
+    # A rewrite that drops the old month removes that partition
+    claude_session.write_text(event("2026-06-02T00:00:00Z", "a3"))
+    os.utime(claude_session, ns=(1, 1))
+    export(monkeypatch, capsys, out)
+    zai_session.unlink()
+    assert "1 unchanged, 1 removed" in export(monkeypatch, capsys, out)
+    assert dataset(out) == {"month=2026-06/claude__proj__a.parquet": [(".claude", "a3")]}
+    assert list(json.loads((out / "_export_state.json").read_text())["files"]) == [str(claude_session)]
+
+
+def test_export_labels_roots_like_find_session(tmp_path):
+    assert _session_lib.root_label(tmp_path / ".claude" / "projects" / "p") == ".claude"
+    assert _session_lib.root_label(tmp_path / ".claude.zai" / "projects" / "p") == ".claude.zai"
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Tests for _session_lib: the transcript readers the session tools share."""
+
+import argparse
+import json
+import random
+import re
+
+import pytest
+
+import _session_lib
+from _session_lib import (
+    EXTRACTORS,
+    extract_tool_result,
+    extract_tool_use,
+    iter_events,
+    iter_events_reverse,
+    kinds_arg,
+    last_timestamp,
+)
+from find_session import scan_file
+
+
+def event(i: int, size: int = 10, kind: str = "user") -> bytes:
+    return json.dumps({"type": kind, "timestamp": f"t{i}", "pad": "x" * size}).encode()
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Blocks a few bytes long, so ordinary lines span several of them."""
+    monkeypatch.setattr(_session_lib, "TAIL_BLOCK_BYTES", 7)
+
+
+@pytest.mark.parametrize("body", [
+    b"",
+    b"\n\n",
+    event(1) + b"\n",
+    event(1) + b"\n" + event(2),                       # torn but complete JSON
+    event(1) + b"\n" + event(2)[:-3],                  # torn mid-object
+    b"\n" + event(1) + b"\n\n\n" + event(2) + b"\n",   # blank lines
+    event(1, size=200) + b"\n" + event(2, size=3) + b"\n",
+    b"not json\n" + event(1) + b"\n[1, 2]\n",
+])
+def test_reverse_reader_matches_forward_reader(tmp_path, small_blocks, body):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(body)
+
+    assert list(iter_events_reverse(path)) == list(reversed(list(iter_events(path))))
+
+
+def test_reverse_reader_matches_forward_reader_on_random_files(tmp_path, monkeypatch):
+    rng = random.Random(32)
+    path = tmp_path / "s.jsonl"
+    for _ in range(200):
+        monkeypatch.setattr(_session_lib, "TAIL_BLOCK_BYTES", rng.randint(1, 64))
+        lines = [rng.choice([b"", b"garbage", event(i, rng.randint(0, 150),
+                                                    rng.choice(["user", "progress"]))])
+                 for i in range(rng.randint(0, 12))]
+        body = b"\n".join(lines) + rng.choice([b"\n", b""])
+        path.write_bytes(body)
+        for types in (None, {"user"}):
+            assert (list(iter_events_reverse(path, types))
+                    == list(reversed(list(iter_events(path, types))))), body
+
+
+def test_last_timestamp_on_a_line_spanning_many_blocks(tmp_path, small_blocks):
+    path = tmp_path / "s.jsonl"
+    path.write_bytes(event(1) + b"\n" + event(2, size=5000) + b"\n")
+
+    assert last_timestamp(path) == "t2"
+
+
+def tool_use(name: str, tool_input) -> dict:
+    return {"type": "assistant", "message": {"content": [
+        {"type": "text", "text": "let me look"},
+        {"type": "tool_use", "name": name, "input": tool_input},
+    ]}}
+
+
+def tool_result(content) -> dict:
+    return {"type": "user", "message": {"content": [
+        {"type": "tool_result", "tool_use_id": "t1", "content": content},
+    ]}}
+
+
+def test_extract_tool_use_yields_name_and_nested_string_leaves():
+    ev = tool_use("Bash", {"command": 'grep "a\\b" src', "opts": {"env": ["X=1", 2]}})
+
+    assert extract_tool_use(ev).split("\n") == ["Bash", 'grep "a\\b" src', "X=1"]
+    assert extract_tool_use(tool_result("out")) == ""
+
+
+@pytest.mark.parametrize("content", [
+    "line one\nline two",
+    [{"type": "text", "text": "line one"}, {"type": "image", "source": {}},
+     {"type": "text", "text": "line two"}],
+])
+def test_extract_tool_result_reads_string_and_block_content(content):
+    assert extract_tool_result(tool_result(content)) == "line one\nline two"
+    assert extract_tool_result(tool_use("Bash", {"command": "ls"})) == ""
+
+
+def test_text_extractor_ignores_tool_content():
+    assert EXTRACTORS["text"](tool_use("Bash", {"command": "needle"})) == "let me look"
+    assert EXTRACTORS["text"](tool_result("needle")) == ""
+
+
+def test_kinds_arg_dedupes_and_rejects_unknown_or_empty_lists():
+    assert kinds_arg("tool_use, text,tool_use") == ("tool_use", "text")
+    for bad in ("", " , ", "text,tools"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            kinds_arg(bad)
+
+
+@pytest.fixture
+def tool_session(tmp_path):
+    path = tmp_path / "s1.jsonl"
+    events = [
+        {"type": "user", "message": {"content": "find the needle"}, "timestamp": "t1"},
+        tool_use("Grep", {"pattern": "needle", "path": "needle.py"}),
+        tool_result("needle.py:3: needle = 1"),
+    ]
+    path.write_text("".join(json.dumps(ev) + "\n" for ev in events))
+    return path
+
+
+def test_scan_file_defaults_to_text(tool_session):
+    hit = scan_file(tool_session, re.compile("needle"), "proj", "claude")
+
+    assert hit.matches == 1
+    assert hit.kind_matches == {"text": 1}
+    assert hit.first_snippet_kind == "text"
+
+
+def test_scan_file_counts_each_requested_kind(tool_session):
+    hit = scan_file(tool_session, re.compile("needle"), "proj", "claude",
+                    kinds=("tool_result", "tool_use"))
+
+    assert hit.kind_matches == {"tool_use": 2, "tool_result": 2}
+    assert hit.matches == 4
+    assert hit.first_snippet_kind == "tool_use"
+    assert hit.first_user_prompt == "find the needle"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark DependencyScanner's reference scan against the per-pattern original.
+
+Scans every markdown file of a plugin cache both ways and reports the time
+per full pass. Without --cache, a synthetic cache is generated in a temp
+directory so runs are comparable across machines.
+
+Usage:
+    python3 bench_dependency_scanner.py [--cache DIR] [--plugins N] [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence, Set
+
+from dependency_graph import DependencyScanner
+
+
+FILLER = [
+    "The", "quick", "review", "checks", "each", "change", "against", "the",
+    "spec", "and", "reports", "findings", "in", "order", "of", "severity.",
+    "See", "docs/guide.md", "for", "details", "on", "configuration", "files",
+]
+
+
+def legacy_scan(content: str) -> Set[str]:
+    """The original algorithm: one IGNORECASE finditer pass per pattern."""
+    references = set()
+    for patterns in DependencyScanner.PATTERNS.values():
+        for pattern in patterns:
+            for match in re.finditer(pattern, content, re.IGNORECASE):
+                references.add(match.group(1))
+    return references
+
+
+def synthetic_document(rng: random.Random, plugin: str, names: List[str], words: int,
+                       peers: Sequence[str] = ()) -> str:
+    """A markdown body of filler prose with a few references sprinkled in.
+
+    References point into the document's own plugin, and, when peers are
+    given, sometimes into one of those plugins instead.
+    """
+    out = [f"---\nname: {rng.choice(names)}\ndescription: synthetic\n---\n"]
+    for i in range(words):
+        if i % 97 == 0:
+            choices = [
+                f"skill {plugin}:{rng.choice(names)}",
+                f"/{plugin}:{rng.choice(names)}",
+                f'Task(subagent_type="{plugin}:{rng.choice(names)}")',
+                f"use the {rng.choice(names)} agent",
+            ]
+            if peers:
+                choices.append(f"skill {rng.choice(peers)}:{rng.choice(names)}")
+            out.append(rng.choice(choices))
+        else:
+            out.append(rng.choice(FILLER))
+        out.append("\n" if i % 14 == 13 else " ")
+    return "".join(out)
+
+
+def generate_cache(root: Path, plugins: int, items: int = 12, words: int = 1500,
+                   seed: int = 0) -> Path:
+    """Write a synthetic plugin cache: marketplace/plugin/version/{skills,agents,commands}.
+
+    Args:
+        root: Directory to create the cache in
+        plugins: Number of plugins
+        items: Skills, agents, and commands per plugin (each)
+        words: Approximate words per markdown file
+        seed: Random seed, so a given configuration is reproducible
+
+    Returns:
+        Path to the cache directory
+    """
+    rng = random.Random(seed)
+    cache = root / "cache"
+    for p in range(plugins):
+        plugin = f"plugin{p}"
+        names = [f"item{i}" for i in range(items)]
+        plugin_root = cache / f"market{p % 3}" / plugin / "1.0.0"
+        for name in names:
+            skill_dir = plugin_root / "skills" / name
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(synthetic_document(rng, plugin, names, words))
+        for kind in ("agents", "commands"):
+            kind_dir = plugin_root / kind
+            kind_dir.mkdir(parents=True)
+            for name in names:
+                (kind_dir / f"{name}.md").write_text(synthetic_document(rng, plugin, names, words))
+    return cache
+
+
+def time_pass(scan: Callable[[str], Set[str]], contents: List[str], repeat: int) -> float:
+    """Best wall time, over `repeat` runs, of scanning every content once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in contents:
+            scan(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(cache: Path, repeat: int) -> int:
+    files = sorted(cache.rglob("*.md"))
+    if not files:
+        print(f"no markdown files under {cache}", file=sys.stderr)
+        return 1
+    contents = [f.read_text(errors="replace") for f in files]
+    mib = sum(len(c) for c in contents) / (1024 * 1024)
+
+    mismatched = [f for f, c in zip(files, contents)
+                  if DependencyScanner.scan_content(c) != legacy_scan(c)]
+    if mismatched:
+        print(f"results differ for {len(mismatched)} file(s), e.g. {mismatched[0]}", file=sys.stderr)
+        return 1
+
+    legacy = time_pass(legacy_scan, contents, repeat)
+    combined = time_pass(DependencyScanner.scan_content, contents, repeat)
+    print(f"{len(files)} files, {mib:.1f} MiB, best of {repeat}")
+    print(f"  per-pattern passes: {legacy * 1000:8.1f} ms")
+    print(f"  combined pass:      {combined * 1000:8.1f} ms  ({legacy / combined:.2f}x)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument('--cache', type=Path,
+                        help='Plugin cache to scan (default: generate a synthetic one)')
+    parser.add_argument('--plugins', type=int, default=40,
+                        help='Plugins in the synthetic cache (default: 40)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per scanner; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    if args.cache:
+        return run(args.cache, args.repeat)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return run(generate_cache(Path(tmpdir), args.plugins), args.repeat)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark sync cost, cold and warm, against a synthetic Claude installation.
+
+Generates a throwaway HOME holding ~/.claude/plugins/cache with N plugins x
+M versions x K skills, agents, and commands that reference each other
+within and across plugins, plus the installed_plugins.json, settings.json,
+and ~/.claude.json that point the sync tools at it. Then times:
+
+    sync_plugins        sync.py's full sync
+    scan_all_plugins    the dependency-graph scan (with its graph cache)
+    run_sync            sync_enhanced.py's selective sync
+
+Cold runs start with an empty ~/.copilot (no sync record, selection
+manifest, graph cache, or synced files); warm runs repeat over the state the
+previous run left. The real home directory is never read or written.
+
+Usage:
+    python3 bench_sync.py [--plugins N] [--versions N] [--items N] [--words N]
+                          [--repeat N] [--jobs N]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from bench_dependency_scanner import synthetic_document
+from metrics import Metrics, recording
+
+
+PEERS_PER_PLUGIN = 3
+
+
+def plugin_key(p: int) -> str:
+    return f"plugin{p}@market{p % 3}"
+
+
+def generate_home(home: Path, plugins: int, versions: int = 3, items: int = 8,
+                  words: int = 400, seed: int = 0) -> Path:
+    """Write a synthetic Claude installation under home.
+
+    Every plugin gets `versions` versions (1.0.0, 1.1.0, ...) in the cache;
+    installed_plugins.json pins the newest one. Documents reference their own
+    plugin and a few peer plugins, and ~/.claude.json records usage for one
+    skill per plugin so the selective sync has something to select.
+
+    Args:
+        home: Directory to use as HOME
+        plugins: Number of plugins
+        versions: Cached versions per plugin
+        items: Skills, agents, and commands per plugin version (each)
+        words: Approximate words per markdown file
+        seed: Random seed, so a given configuration is reproducible
+
+    Returns:
+        Path to the plugin cache directory
+    """
+    rng = random.Random(seed)
+    claude_dir = home / ".claude"
+    cache = claude_dir / "plugins" / "cache"
+    # Distinct names per kind: a command named like a skill is a collision
+    # the sync tools warn about, not a realistic install
+    kinds = {kind: [f"{kind[:-1]}{i}" for i in range(items)]
+             for kind in ("skills", "agents", "commands")}
+    names = [name for kind_names in kinds.values() for name in kind_names]
+    installed = {}
+
+    for p in range(plugins):
+        plugin = f"plugin{p}"
+        peers = [f"plugin{(p + k) % plugins}" for k in range(1, PEERS_PER_PLUGIN + 1)
+                 if (p + k) % plugins != p]
+        for v in range(versions):
+            plugin_root = cache / f"market{p % 3}" / plugin / f"1.{v}.0"
+            for name in kinds["skills"]:
+                skill_dir = plugin_root / "skills" / name
+                skill_dir.mkdir(parents=True)
+                (skill_dir / "SKILL.md").write_text(
+                    synthetic_document(rng, plugin, names, words, peers))
+            for kind in ("agents", "commands"):
+                kind_dir = plugin_root / kind
+                kind_dir.mkdir(parents=True)
+                for name in kinds[kind]:
+                    (kind_dir / f"{name}.md").write_text(
+                        synthetic_document(rng, plugin, names, words, peers))
+        installed[plugin_key(p)] = [{
+            "scope": "user",
+            "installPath": str(plugin_root),
+            "version": f"1.{versions - 1}.0",
+        }]
+
+    (claude_dir / "plugins" / "installed_plugins.json").write_text(
+        json.dumps({"version": 2, "plugins": installed}, indent=2))
+    (claude_dir / "settings.json").write_text(
+        json.dumps({"enabledPlugins": {plugin_key(p): True for p in range(plugins)}}, indent=2))
+
+    now_ms = int(time.time() * 1000)
+    usage = {
+        f"plugin{p}:{rng.choice(kinds['skills'])}": {
+            "usageCount": rng.randint(1, 50),
+            "lastUsedAt": now_ms - rng.randint(0, 30) * 86_400_000,
+        }
+        for p in range(plugins)
+    }
+    (home / ".claude.json").write_text(json.dumps({"numStartups": 1, "skillUsage": usage}, indent=2))
+    return cache
+
+
+def time_runs(home: Path, call: Callable[[Metrics], object],
+              repeat: int) -> Tuple[float, float, Dict, Dict]:
+    """Best cold and warm wall times of call(metrics), over `repeat` runs each.
+
+    Returns:
+        (cold seconds, warm seconds, cold counters, warm counters); the
+        counters are from the last run of each kind
+    """
+    def timed() -> Tuple[float, Dict]:
+        m = Metrics()
+        with contextlib.redirect_stdout(io.StringIO()), recording(m):
+            start = time.perf_counter()
+            call(m)
+            elapsed = time.perf_counter() - start
+        return elapsed, m.totals
+
+    cold = warm = float("inf")
+    cold_counts: Dict = {}
+    warm_counts: Dict = {}
+    for _ in range(repeat):
+        shutil.rmtree(home / ".copilot", ignore_errors=True)
+        elapsed, cold_counts = timed()
+        cold = min(cold, elapsed)
+        elapsed, warm_counts = timed()
+        warm = min(warm, elapsed)
+    return cold, warm, cold_counts, warm_counts
+
+
+def format_counts(counts: Dict[str, int]) -> str:
+    return "  ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+
+
+def run(home: Path, repeat: int, jobs: int) -> int:
+    # DEFAULT_PATHS is computed from Path.home() at import time, so the sync
+    # modules are imported only once HOME points at the synthetic install.
+    os.environ["HOME"] = str(home)
+    import sync
+    import sync_enhanced
+    from dependency_graph import DependencyScanner
+
+    if sync.DEFAULT_PATHS['claude_plugins_file'] != home / ".claude" / "plugins" / "installed_plugins.json":
+        print("sync modules were imported before HOME was set; refusing to run", file=sys.stderr)
+        return 1
+
+    cache = home / ".claude" / "plugins" / "cache"
+    pinned = sync_enhanced.pinned_install_paths(sync.DEFAULT_PATHS['claude_plugins_file'])
+    graph_cache = home / ".copilot" / "claude-sync-graph-cache.json"
+
+    def scan(m: Metrics) -> None:
+        graph_cache.parent.mkdir(parents=True, exist_ok=True)
+        DependencyScanner.scan_all_plugins(cache, pinned, cache_file=graph_cache)
+
+    benchmarks: List[Tuple[str, Callable[[Metrics], object]]] = [
+        ("sync_plugins", lambda m: sync.sync_plugins(jobs=jobs)),
+        ("scan_all_plugins", scan),
+        ("run_sync", lambda m: sync_enhanced.run_sync(metrics=m)),
+    ]
+
+    files = sum(1 for _ in cache.rglob("*.md"))
+    mib = sum(f.stat().st_size for f in cache.rglob("*.md")) / (1024 * 1024)
+    print(f"{files} cached files, {mib:.1f} MiB, {len(pinned)} installed plugins, best of {repeat}")
+    for name, call in benchmarks:
+        cold, warm, cold_counts, warm_counts = time_runs(home, call, repeat)
+        print(f"  {name:<16}  cold {cold * 1000:9.1f} ms  warm {warm * 1000:9.1f} ms"
+              f"  ({cold / warm:.1f}x)")
+        print(f"    cold: {format_counts(cold_counts)}")
+        print(f"    warm: {format_counts(warm_counts)}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument('--plugins', type=int, default=20,
+                        help='Plugins in the synthetic cache (default: 20)')
+    parser.add_argument('--versions', type=int, default=3,
+                        help='Cached versions per plugin (default: 3)')
+    parser.add_argument('--items', type=int, default=8,
+                        help='Skills, agents, and commands per plugin version, each (default: 8)')
+    parser.add_argument('--words', type=int, default=400,
+                        help='Approximate words per markdown file (default: 400)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Cold and warm runs per benchmark; the best is reported (default: 3)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Concurrent plugin groups for sync_plugins (default: 1)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        home = Path(tmpdir) / "home"
+        generate_home(home, args.plugins, args.versions, args.items, args.words)
+        return run(home, args.repeat, args.jobs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
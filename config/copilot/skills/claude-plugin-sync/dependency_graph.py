@@ -7,12 +7,16 @@ and builds a dependency graph that can be used to determine what needs to
 be synced together.
 """
 
+import json
+import os
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 
+import metrics
+
 
 class ExtensionType(Enum):
     """Types of Claude Code extensions."""
@@ -55,6 +59,12 @@ class DependencyGraph:
     # Reverse mapping: which extensions reference this one
     reverse_dependencies: Dict[str, Set[str]] = field(default_factory=dict)
 
+    # Transitive closures, built on first query and dropped on any change
+    _closures: Optional['_Closures'] = field(default=None, init=False, repr=False, compare=False)
+    # Short name -> candidate full names, built on first lookup
+    _suffix_index: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False,
+                                                          compare=False)
+
     def add_extension(self, extension: Extension) -> None:
         """Add an extension to the graph."""
         full_name = extension.full_name
@@ -63,6 +73,8 @@ class DependencyGraph:
             self.dependencies[full_name] = set()
         if full_name not in self.reverse_dependencies:
             self.reverse_dependencies[full_name] = set()
+        self._closures = None
+        self._suffix_index = None
 
     def add_dependency(self, from_ext: str, to_ext: str) -> None:
         """Add a dependency edge from one extension to another.
@@ -78,56 +90,68 @@ class DependencyGraph:
 
         self.dependencies[from_ext].add(to_ext)
         self.reverse_dependencies[to_ext].add(from_ext)
+        self._closures = None
 
-    def get_all_dependencies(self, extension_name: str, visited: Optional[Set[str]] = None) -> Set[str]:
+    def get_all_dependencies(self, extension_name: str) -> Set[str]:
         """Get all transitive dependencies for an extension.
 
+        An extension on a dependency cycle is its own dependency.
+
         Args:
             extension_name: Full name of the extension
-            visited: Set of already visited extensions (for cycle detection)
 
         Returns:
             Set of all dependency full names (transitively)
         """
-        if visited is None:
-            visited = set()
-
-        if extension_name in visited:
-            return set()  # Cycle detection
-
-        visited.add(extension_name)
-        deps = set(self.dependencies.get(extension_name, set()))
-
-        # Recursively get dependencies of dependencies
-        for dep in list(deps):
-            deps.update(self.get_all_dependencies(dep, visited))
+        return self._get_closures().query(extension_name, dependents=False)
 
-        return deps
-
-    def get_all_dependents(self, extension_name: str, visited: Optional[Set[str]] = None) -> Set[str]:
+    def get_all_dependents(self, extension_name: str) -> Set[str]:
         """Get all extensions that depend on this one (transitively).
 
+        An extension on a dependency cycle is its own dependent.
+
         Args:
             extension_name: Full name of the extension
-            visited: Set of already visited extensions (for cycle detection)
 
         Returns:
             Set of all dependent extension full names
         """
-        if visited is None:
-            visited = set()
+        return self._get_closures().query(extension_name, dependents=True)
 
-        if extension_name in visited:
-            return set()
+    def candidates_for(self, short_name: str) -> List[str]:
+        """Extensions a short name may refer to, best match first.
 
-        visited.add(extension_name)
-        dependents = set(self.reverse_dependencies.get(extension_name, set()))
+        An exact full name ranks first, then names ending in ":short_name",
+        then names ending in "-short_name"; ties sort by name.
 
-        # Recursively get dependents of dependents
-        for dep in list(dependents):
-            dependents.update(self.get_all_dependents(dep, visited))
+        Args:
+            short_name: Name as written in a reference or usage record
 
-        return dependents
+        Returns:
+            Candidate full names (empty if none match)
+        """
+        if self._suffix_index is None:
+            ranked: Dict[str, List[Tuple[int, str]]] = {}
+            for full_name in self.extensions:
+                ranked.setdefault(full_name, []).append((0, full_name))
+                for i, char in enumerate(full_name):
+                    if char == ':' or char == '-':
+                        ranked.setdefault(full_name[i + 1:], []).append(
+                            (1 if char == ':' else 2, full_name))
+            self._suffix_index = {
+                key: [name for _, name in sorted(entries)] for key, entries in ranked.items()
+            }
+        return list(self._suffix_index.get(short_name, ()))
+
+    def resolve_short_name(self, short_name: str) -> Optional[str]:
+        """The best match from candidates_for, or None."""
+        candidates = self.candidates_for(short_name)
+        return candidates[0] if candidates else None
+
+    def _get_closures(self) -> '_Closures':
+        if self._closures is None:
+            self._closures = _Closures(self.dependencies, self.reverse_dependencies)
+        return self._closures
 
     def get_sync_set(self, extension_names: List[str]) -> Set[Extension]:
         """Get the complete set of extensions that need to be synced together.
@@ -150,6 +174,353 @@ class DependencyGraph:
         return {self.extensions[name] for name in sync_names if name in self.extensions}
 
 
+class _Closures:
+    """Transitive closures of a dependency graph, computed once.
+
+    Tarjan's algorithm condenses the graph into strongly connected
+    components; every member of a component has the same closure. The
+    components come out sinks first, so one pass in that order gives each
+    component's descendants and one pass in reverse gives its ancestors,
+    both as int bitsets over node indices. Queries expand a bitset to names
+    once and memoize the result per component.
+    """
+
+    def __init__(self, dependencies: Dict[str, Set[str]],
+                 reverse_dependencies: Dict[str, Set[str]]):
+        self.names = sorted(dependencies.keys() | reverse_dependencies.keys())
+        index = {name: i for i, name in enumerate(self.names)}
+        successors = [[index[dep] for dep in dependencies.get(name, ())] for name in self.names]
+
+        self.component = self._tarjan(successors)
+        count = max(self.component, default=-1) + 1
+        members = [0] * count
+        cyclic = [False] * count
+        edges: List[Set[int]] = [set() for _ in range(count)]
+        for node, succ in enumerate(successors):
+            c = self.component[node]
+            members[c] |= 1 << node
+            for dep in succ:
+                d = self.component[dep]
+                if d == c:
+                    cyclic[c] = True
+                else:
+                    edges[c].add(d)
+
+        # Tarjan numbers components sinks first: successors have lower numbers
+        self.down = [0] * count
+        for c in range(count):
+            reach = members[c] if cyclic[c] else 0
+            for d in edges[c]:
+                reach |= members[d] | self.down[d]
+            self.down[c] = reach
+        parents: List[Set[int]] = [set() for _ in range(count)]
+        for c, succ in enumerate(edges):
+            for d in succ:
+                parents[d].add(c)
+        self.up = [0] * count
+        for c in reversed(range(count)):
+            reach = members[c] if cyclic[c] else 0
+            for p in parents[c]:
+                reach |= members[p] | self.up[p]
+            self.up[c] = reach
+
+        self.index = index
+        self.expanded: Dict[Tuple[int, bool], frozenset] = {}
+
+    @staticmethod
+    def _tarjan(successors: List[List[int]]) -> List[int]:
+        """Component number per node, iteratively (no recursion limit)."""
+        n = len(successors)
+        component = [-1] * n
+        low = [0] * n
+        order = [-1] * n
+        stack: List[int] = []
+        on_stack = [False] * n
+        counter = 0
+        next_component = 0
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, i = work.pop()
+                if i == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                else:
+                    # Returning from successors[node][i - 1]
+                    low[node] = min(low[node], low[successors[node][i - 1]])
+                while i < len(successors[node]):
+                    dep = successors[node][i]
+                    i += 1
+                    if order[dep] == -1:
+                        work.append((node, i))
+                        work.append((dep, 0))
+                        break
+                    if on_stack[dep]:
+                        low[node] = min(low[node], order[dep])
+                else:
+                    if low[node] == order[node]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component[member] = next_component
+                            if member == node:
+                                break
+                        next_component += 1
+        return component
+
+    def query(self, name: str, dependents: bool) -> Set[str]:
+        node = self.index.get(name)
+        if node is None:
+            return set()
+        c = self.component[node]
+        key = (c, dependents)
+        names = self.expanded.get(key)
+        if names is None:
+            mask = (self.up if dependents else self.down)[c]
+            found = []
+            while mask:
+                low_bit = mask & -mask
+                found.append(self.names[low_bit.bit_length() - 1])
+                mask ^= low_bit
+            names = self.expanded[key] = frozenset(found)
+        return set(names)
+
+
+# Subdirectories whose presence marks a plugin root
+EXTENSION_DIRS = frozenset({'skills', 'agents', 'commands'})
+# Names that are never a marketplace, org, plugin, or version. Build-output
+# names (build, dist, .cache) are left out: they can be a real directory at
+# any of those levels, and nothing below a plugin root is walked anyway.
+PRUNED_DIRS = frozenset({'node_modules', '.git', '.hg', '.svn', '__pycache__'})
+# cache/org/plugin-name/version/ is the deepest known layout
+PLUGIN_ROOT_MAX_DEPTH = 3
+
+
+def plugin_name_from_parts(parts: Tuple[str, ...], cache_name: str) -> str:
+    """Determine a plugin name from a root's path relative to the cache.
+
+    For loom99/do/0.5.23 -> "do"; for plugin-name -> "plugin-name".
+
+    Args:
+        parts: Path components of the plugin root relative to the cache
+        cache_name: Name of the cache directory itself
+
+    Returns:
+        The plugin name
+    """
+    if len(parts) >= 2:
+        return parts[1] if parts[0] != cache_name else parts[0]
+    return parts[0]
+
+
+SEMVER_RE = re.compile(r'^v?(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$')
+
+
+def version_key(version: str) -> Tuple:
+    """Sort key ordering version directory names by semver precedence.
+
+    Pre-releases sort below their release, with identifiers compared per
+    the semver spec (numeric below alphanumeric). Names that are not
+    semver sort below every semver name, by name, so the order is total.
+
+    Args:
+        version: Version directory name (e.g. "0.5.23", "1.0.0-beta.2")
+
+    Returns:
+        Comparable key
+    """
+    match = SEMVER_RE.match(version)
+    if not match:
+        return (0, version)
+    major, minor, patch, pre = match.groups()
+    if pre is None:
+        pre_key: Tuple = (1,)
+    else:
+        pre_key = (0, tuple((0, int(p), '') if p.isdigit() else (1, 0, p) for p in pre.split('.')))
+    return (1, (int(major), int(minor), int(patch)), pre_key, version)
+
+
+def select_active_versions(roots: List[Tuple[str, Path]], plugins_dir: Path,
+                           pinned_paths: Optional[Set[Path]] = None) -> List[Tuple[str, Path]]:
+    """Keep one version of each plugin: the pinned one, else the highest.
+
+    Versioned roots (cache/org/plugin/version/) sharing a parent directory
+    are versions of one plugin. Among them, a root whose path is in
+    pinned_paths (the installPath recorded in installed_plugins.json) wins;
+    otherwise the highest version_key. Shallower roots are not versioned
+    and are kept as they are.
+
+    Args:
+        roots: (plugin_name, plugin_path) pairs from find_plugin_roots
+        plugins_dir: The plugins cache directory the roots were found in
+        pinned_paths: Install paths pinned by installed_plugins.json
+
+    Returns:
+        The selected pairs, in the order of roots
+    """
+    pinned = {Path(os.path.realpath(p)) for p in (pinned_paths or ())}
+    best: Dict[Path, Tuple[str, Path]] = {}
+    for plugin_name, path in roots:
+        versioned = len(path.relative_to(plugins_dir).parts) == PLUGIN_ROOT_MAX_DEPTH
+        group = path.parent if versioned else path
+        current = best.get(group)
+        if current is None or _version_rank(path, pinned) > _version_rank(current[1], pinned):
+            best[group] = (plugin_name, path)
+    selected = set(best.values())
+    return [root for root in roots if root in selected]
+
+
+def _version_rank(path: Path, pinned: Set[Path]) -> Tuple:
+    return (Path(os.path.realpath(path)) in pinned, version_key(path.name))
+
+
+_EXTENSION_TYPE_VALUES = {t.value for t in ExtensionType}
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """A file's (mtime_ns, size), or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class GraphCache:
+    """Per-plugin scan results persisted between runs.
+
+    Each plugin root maps to its name, its dependency edges, and for every
+    extension file the (mtime_ns, size) it had when scanned, its extension
+    name and type, and the references found in it. A plugin whose file set
+    and stamps are unchanged is rebuilt from the entry alone; a changed one
+    reuses the references of its unchanged files. Plugins not seen during a
+    run are dropped when the cache is saved.
+    """
+
+    VERSION = 1
+
+    def __init__(self, plugins: Optional[Dict[str, dict]] = None):
+        self.previous: Dict[str, dict] = plugins or {}
+        self.plugins: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'GraphCache':
+        """Load a cache file; a missing, corrupt, or outdated one is empty."""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            return cls()
+        plugins = data.get('plugins')
+        return cls(plugins if isinstance(plugins, dict) else {})
+
+    def save(self, path: Path) -> None:
+        """Write the entries used this run, atomically; skipped if unchanged."""
+        if self.plugins == self.previous:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        try:
+            tmp.write_text(json.dumps({'version': self.VERSION, 'plugins': self.plugins},
+                                      indent=2, sort_keys=True))
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def lookup(self, plugin_path: Path, plugin_name: str) -> Optional[dict]:
+        """The previous entry for a plugin root, if it was scanned under this
+        name and is well formed; anything else is rescanned."""
+        entry = self.previous.get(str(plugin_path))
+        if not self._well_formed(entry) or entry['name'] != plugin_name:
+            return None
+        return entry
+
+    @staticmethod
+    def _well_formed(entry) -> bool:
+        """True if an entry has the shape store() writes, so the readers
+        below can index into it without checks of their own."""
+        def str_list(value) -> bool:
+            return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+        def file_record(record) -> bool:
+            return (isinstance(record, dict)
+                    and isinstance(record.get('name'), str)
+                    and record.get('type') in _EXTENSION_TYPE_VALUES
+                    and isinstance(record.get('stamp'), list)
+                    and all(isinstance(v, int) for v in record['stamp'])
+                    and str_list(record.get('references')))
+
+        return (isinstance(entry, dict)
+                and isinstance(entry.get('name'), str)
+                and isinstance(entry.get('files'), dict)
+                and all(file_record(r) for r in entry['files'].values())
+                and isinstance(entry.get('edges', {}), dict)
+                and all(str_list(v) for v in entry.get('edges', {}).values()))
+
+    @staticmethod
+    def is_fresh(entry: dict, stamps: Dict[str, Optional[Tuple[int, int]]]) -> bool:
+        """True if the entry covers exactly these files, all unchanged."""
+        files = entry.get('files', {})
+        return files.keys() == stamps.keys() and all(
+            stamp is not None and tuple(files[path].get('stamp', ())) == stamp
+            for path, stamp in stamps.items()
+        )
+
+    @staticmethod
+    def references(entry: Optional[dict], path: str,
+                   stamp: Optional[Tuple[int, int]]) -> Optional[Set[str]]:
+        """Cached references for one file, or None if it must be rescanned."""
+        if entry is None or stamp is None:
+            return None
+        record = entry.get('files', {}).get(path)
+        if record is None or tuple(record.get('stamp', ())) != stamp:
+            return None
+        return set(record.get('references', []))
+
+    def to_graph(self, plugin_path: Path, entry: dict) -> DependencyGraph:
+        """Rebuild a plugin graph from its entry, keeping the entry for this run."""
+        graph = DependencyGraph()
+        for path, record in entry['files'].items():
+            graph.add_extension(Extension(
+                name=record['name'],
+                type=ExtensionType(record['type']),
+                plugin=entry['name'],
+                file_path=Path(path),
+                references=set(record['references'])
+            ))
+        for from_ext, to_exts in entry.get('edges', {}).items():
+            for to_ext in to_exts:
+                graph.add_dependency(from_ext, to_ext)
+        self.plugins[str(plugin_path)] = entry
+        return graph
+
+    def store(self, plugin_path: Path, plugin_name: str, graph: DependencyGraph,
+              stamps: Dict[str, Optional[Tuple[int, int]]]) -> None:
+        """Record a freshly built plugin graph."""
+        self.plugins[str(plugin_path)] = {
+            'name': plugin_name,
+            'files': {
+                str(ext.file_path): {
+                    'name': ext.name,
+                    'type': ext.type.value,
+                    'stamp': list(stamps[str(ext.file_path)] or ()),
+                    'references': sorted(ext.references),
+                }
+                for ext in graph.extensions.values()
+            },
+            'edges': {
+                from_ext: sorted(to_exts)
+                for from_ext, to_exts in graph.dependencies.items() if to_exts
+            },
+        }
+
+
 class DependencyScanner:
     """Scans Claude Code extension files to build dependency graphs."""
 
@@ -169,6 +540,69 @@ class DependencyScanner:
         ],
     }
 
+    # Every pattern needs one of these literals (case-insensitively), so
+    # content containing none of them cannot match and skips the regex.
+    PREFILTER_LITERALS = ('skill', '/', 'agent')
+    # Every pattern starts with one of these characters (case-insensitively)
+    FIRST_CHARS = '/aclsu'
+
+    @classmethod
+    def _combined_pattern(cls) -> re.Pattern:
+        """Compile PATTERNS into one alternation, built once per class.
+
+        Each pattern becomes a named group (skill0, agent1, ...) and its
+        capture a nested one (skill0_ref, ...). The alternation sits in a
+        lookahead so nothing is consumed: a match for one pattern never hides
+        an overlapping match for another. The patterns start with mutually
+        exclusive literals, so at most one branch matches at any position.
+        The leading character class lets the regex engine skip straight to
+        positions where some branch could start.
+        """
+        compiled = cls.__dict__.get('_combined')
+        if compiled is None:
+            branches = []
+            for kind, patterns in cls.PATTERNS.items():
+                for i, pattern in enumerate(patterns):
+                    # Each pattern has exactly one capturing group: name it
+                    named = re.sub(r'(?<!\\)\((?!\?)', f'(?P<{kind}{i}_ref>', pattern, count=1)
+                    branches.append(f'(?P<{kind}{i}>{named})')
+            compiled = re.compile(
+                f"(?=[{re.escape(cls.FIRST_CHARS)}])(?=(?:{'|'.join(branches)}))", re.IGNORECASE
+            )
+            cls._combined = compiled
+        return compiled
+
+    @classmethod
+    def scan_content(cls, content: str) -> Set[str]:
+        """Find extension references in content with a single regex pass.
+
+        Args:
+            content: Text to scan
+
+        Returns:
+            Set of referenced extension names
+        """
+        # Non-ASCII text skips the prefilter: IGNORECASE folds characters
+        # like U+017F to ASCII letters, which str.lower() would not
+        if content.isascii():
+            lowered = content.lower()
+            if not any(literal in lowered for literal in cls.PREFILTER_LITERALS):
+                return set()
+        references = set()
+        matches = 0
+        # Separate finditer passes never report overlapping matches of the
+        # same pattern; track each branch's last match end to do the same
+        ends: Dict[str, int] = {}
+        for match in cls._combined_pattern().finditer(content):
+            branch = match.lastgroup
+            start, end = match.span(branch)
+            if start >= ends.get(branch, 0):
+                ends[branch] = end
+                references.add(match.group(f'{branch}_ref'))
+                matches += 1
+        metrics.count('regex_matches', matches)
+        return references
+
     @classmethod
     def scan_file(cls, file_path: Path) -> Set[str]:
         """Scan a file for extension references.
@@ -179,80 +613,87 @@ class DependencyScanner:
         Returns:
             Set of referenced extension names
         """
-        references = set()
-
         try:
-            content = file_path.read_text()
-
-            # Try all patterns
-            for patterns in cls.PATTERNS.values():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        ref = match.group(1)
-                        # Normalize reference
-                        references.add(ref)
-
-        except Exception as e:
+            data = file_path.read_bytes()
+            content = data.decode()
+        except Exception:
             # Silently skip files we can't read
-            pass
-
-        return references
+            return set()
+        metrics.count('files_scanned')
+        metrics.count('bytes_read', len(data))
+        return cls.scan_content(content)
 
     @classmethod
-    def scan_plugin(cls, plugin_path: Path, plugin_name: str) -> DependencyGraph:
-        """Scan a plugin directory and build its dependency graph.
+    def extension_files(cls, plugin_path: Path) -> List[Tuple[str, ExtensionType, Path]]:
+        """List a plugin's extension definition files.
 
         Args:
             plugin_path: Path to the plugin directory
-            plugin_name: Name of the plugin
 
         Returns:
-            DependencyGraph with all extensions and their dependencies
+            List of (name, type, file_path) tuples
         """
-        graph = DependencyGraph()
+        files: List[Tuple[str, ExtensionType, Path]] = []
 
-        # Scan skills
+        # Skills
         skills_dir = plugin_path / "skills"
         if skills_dir.exists():
             for skill_dir in skills_dir.iterdir():
                 if skill_dir.is_dir():
                     skill_file = skill_dir / "SKILL.md"
                     if skill_file.exists():
-                        ext = Extension(
-                            name=skill_dir.name,
-                            type=ExtensionType.SKILL,
-                            plugin=plugin_name,
-                            file_path=skill_file,
-                            references=cls.scan_file(skill_file)
-                        )
-                        graph.add_extension(ext)
-
-        # Scan agents
+                        files.append((skill_dir.name, ExtensionType.SKILL, skill_file))
+
+        # Agents
         agents_dir = plugin_path / "agents"
         if agents_dir.exists():
             for agent_file in agents_dir.glob("*.md"):
-                ext = Extension(
-                    name=agent_file.stem.replace('.agent', ''),
-                    type=ExtensionType.AGENT,
-                    plugin=plugin_name,
-                    file_path=agent_file,
-                    references=cls.scan_file(agent_file)
-                )
-                graph.add_extension(ext)
-
-        # Scan commands
+                files.append((agent_file.stem.replace('.agent', ''), ExtensionType.AGENT, agent_file))
+
+        # Commands
         commands_dir = plugin_path / "commands"
         if commands_dir.exists():
             for command_file in commands_dir.glob("*.md"):
-                ext = Extension(
-                    name=command_file.stem,
-                    type=ExtensionType.COMMAND,
-                    plugin=plugin_name,
-                    file_path=command_file,
-                    references=cls.scan_file(command_file)
-                )
-                graph.add_extension(ext)
+                files.append((command_file.stem, ExtensionType.COMMAND, command_file))
+
+        return files
+
+    @classmethod
+    def scan_plugin(cls, plugin_path: Path, plugin_name: str,
+                    cache: Optional['GraphCache'] = None) -> DependencyGraph:
+        """Scan a plugin directory and build its dependency graph.
+
+        With a cache, a plugin whose files all match their recorded
+        (mtime_ns, size) is loaded without reading anything; otherwise only
+        the files that changed are rescanned. The cache entry is refreshed.
+
+        Args:
+            plugin_path: Path to the plugin directory
+            plugin_name: Name of the plugin
+            cache: Scan results from previous runs
+
+        Returns:
+            DependencyGraph with all extensions and their dependencies
+        """
+        files = cls.extension_files(plugin_path)
+        stamps = {str(path): file_stamp(path) for _, _, path in files} if cache else {}
+        cached = cache.lookup(plugin_path, plugin_name) if cache else None
+
+        if cached is not None and cache.is_fresh(cached, stamps):
+            metrics.count('plugins_from_cache')
+            return cache.to_graph(plugin_path, cached)
+        metrics.count('plugins_scanned')
+
+        graph = DependencyGraph()
+        for name, ext_type, path in files:
+            references = cache.references(cached, str(path), stamps[str(path)]) if cache else None
+            graph.add_extension(Extension(
+                name=name,
+                type=ext_type,
+                plugin=plugin_name,
+                file_path=path,
+                references=references if references is not None else cls.scan_file(path)
+            ))
 
         # Build dependency edges
         for ext in graph.extensions.values():
@@ -262,6 +703,8 @@ class DependencyScanner:
                 if resolved:
                     graph.add_dependency(ext.full_name, resolved)
 
+        if cache:
+            cache.store(plugin_path, plugin_name, graph, stamps)
         return graph
 
     @classmethod
@@ -290,18 +733,68 @@ class DependencyScanner:
             return ref
 
         # Try all known extensions (fuzzy match)
-        for ext_name in graph.extensions:
-            if ext_name.endswith(f":{ref}") or ext_name.endswith(f"-{ref}"):
-                return ext_name
+        return graph.resolve_short_name(ref)
 
-        return None
+    @classmethod
+    def find_plugin_roots(cls, plugins_dir: Path,
+                          max_depth: int = PLUGIN_ROOT_MAX_DEPTH) -> List[Tuple[str, Path]]:
+        """Find plugin root directories in the plugins cache.
+
+        A plugin root is a directory with a skills/, agents/, or commands/
+        entry. Layouts are cache/plugin-name/ or cache/org/plugin-name/version/,
+        so only max_depth levels are listed, nothing below a plugin root is
+        walked, and PRUNED_DIRS are never entered: the cost follows the
+        number of plugins, not the number of files they ship. Each directory
+        is listed once, and that listing also answers the plugin-root test.
+
+        Args:
+            plugins_dir: Path to the plugins cache directory
+            max_depth: Deepest level (1 = direct children) that can be a root
+
+        Returns:
+            List of (plugin_name, plugin_path) tuples, in sorted path order
+        """
+        roots: List[Tuple[str, Path]] = []
+
+        def walk(directory: Path, parts: Tuple[str, ...], descend: bool = True) -> None:
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                return
+            if parts and any(e.name in EXTENSION_DIRS for e in entries):
+                roots.append((plugin_name_from_parts(parts, plugins_dir.name), directory))
+                return
+            if not descend or len(parts) >= max_depth:
+                return
+            for entry in entries:
+                if entry.name in PRUNED_DIRS:
+                    continue
+                try:
+                    if not entry.is_dir():
+                        continue
+                    # A symlinked directory may be a root, but is not descended
+                    is_link = entry.is_symlink()
+                except OSError:
+                    continue
+                walk(Path(entry.path), parts + (entry.name,), descend=not is_link)
+
+        walk(plugins_dir, ())
+        return roots
 
     @classmethod
-    def scan_all_plugins(cls, plugins_dir: Path) -> DependencyGraph:
+    def scan_all_plugins(cls, plugins_dir: Path,
+                         pinned_paths: Optional[Set[Path]] = None,
+                         cache_file: Optional[Path] = None) -> DependencyGraph:
         """Scan all plugins and build a unified dependency graph.
 
+        Only one version of each plugin is scanned (see select_active_versions),
+        so the graph does not depend on which stale versions linger in the cache.
+
         Args:
             plugins_dir: Path to the plugins cache directory
+            pinned_paths: Install paths pinned by installed_plugins.json
+            cache_file: Graph cache to load from and update (see GraphCache)
 
         Returns:
             Unified DependencyGraph with all plugins
@@ -311,37 +804,14 @@ class DependencyScanner:
         if not plugins_dir.exists():
             return unified_graph
 
-        # Find all plugin paths in the cache
-        # Structure can be: cache/plugin-name/ or cache/org/plugin-name/version/
-        plugin_paths = []
-
-        for item in plugins_dir.rglob("*"):
-            if not item.is_dir():
-                continue
-
-            # Check if this directory looks like a plugin root
-            # (has skills/, agents/, or commands/ subdirectories)
-            has_extensions = (
-                (item / "skills").exists() or
-                (item / "agents").exists() or
-                (item / "commands").exists()
-            )
-
-            if has_extensions:
-                # Determine plugin name from path
-                # For loom99/do/0.5.23 -> "do"
-                # For plugin-name -> "plugin-name"
-                parts = item.relative_to(plugins_dir).parts
-                if len(parts) >= 2:
-                    plugin_name = parts[1] if parts[0] != plugins_dir.name else parts[0]
-                else:
-                    plugin_name = parts[0]
-
-                plugin_paths.append((plugin_name, item))
+        plugin_paths = select_active_versions(
+            cls.find_plugin_roots(plugins_dir), plugins_dir, pinned_paths
+        )
+        cache = GraphCache.load(cache_file) if cache_file else None
 
         # Scan each plugin
         for plugin_name, plugin_path in plugin_paths:
-            plugin_graph = cls.scan_plugin(plugin_path, plugin_name)
+            plugin_graph = cls.scan_plugin(plugin_path, plugin_name, cache)
 
             # Merge into unified graph
             for ext in plugin_graph.extensions.values():
@@ -350,6 +820,8 @@ class DependencyScanner:
                 for to_ext in to_exts:
                     unified_graph.add_dependency(from_ext, to_ext)
 
+        if cache:
+            cache.save(cache_file)
         return unified_graph
 
 
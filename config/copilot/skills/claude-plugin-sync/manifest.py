@@ -190,18 +190,15 @@ class SyncManifest:
             for stats in most_used:
                 if stats.usage_count >= self.auto_sync_min_usage:
                     # Try to find this extension in the graph
-                    for ext_name, ext in dependency_graph.extensions.items():
-                        if (ext_name == stats.skill_name or
-                            ext_name.endswith(f":{stats.skill_name}") or
-                            ext_name.endswith(f"-{stats.skill_name}")):
-                            extensions_to_sync.add(ext)
-
-                            # Include dependencies for auto-sync too
-                            deps = dependency_graph.get_all_dependencies(ext_name)
-                            for dep_name in deps:
-                                if dep_name in dependency_graph.extensions:
-                                    extensions_to_sync.add(dependency_graph.extensions[dep_name])
-                            break
+                    ext_name = dependency_graph.resolve_short_name(stats.skill_name)
+                    if ext_name:
+                        extensions_to_sync.add(dependency_graph.extensions[ext_name])
+
+                        # Include dependencies for auto-sync too
+                        deps = dependency_graph.get_all_dependencies(ext_name)
+                        for dep_name in deps:
+                            if dep_name in dependency_graph.extensions:
+                                extensions_to_sync.add(dependency_graph.extensions[dep_name])
 
         return extensions_to_sync
 
@@ -234,18 +231,14 @@ class ManifestGenerator:
                 continue
 
             # Find the extension in the graph
-            for ext_name, ext in dependency_graph.extensions.items():
-                if (ext_name == stats.skill_name or
-                    ext_name.endswith(f":{stats.skill_name}") or
-                    ext_name.endswith(f"-{stats.skill_name}")):
-
-                    manifest.add_sync_rule(
-                        extension_name=ext_name,
-                        include_deps=True,
-                        priority=stats.usage_count,
-                        notes=f"Used {stats.usage_count} times, last used {stats.days_since_last_use} days ago"
-                    )
-                    break
+            ext_name = dependency_graph.resolve_short_name(stats.skill_name)
+            if ext_name:
+                manifest.add_sync_rule(
+                    extension_name=ext_name,
+                    include_deps=True,
+                    priority=stats.usage_count,
+                    notes=f"Used {stats.usage_count} times, last used {stats.days_since_last_use} days ago"
+                )
 
         return manifest
 
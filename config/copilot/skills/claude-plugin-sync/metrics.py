@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Per-phase timing and work counters for sync runs.
+
+A Metrics object records the wall time of each named phase and counters
+attributed to the phase that was running when they were counted. Code deep
+in the scanner, rewriter, and materializers reports work with the
+module-level count(), which is a no-op unless a Metrics is recording, so
+instrumented code costs nothing when nobody is measuring.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class Metrics:
+    """Wall time per phase, plus counters per phase and in total."""
+
+    def __init__(self):
+        self.phases: List[Dict] = []
+        self.totals: Dict[str, int] = {}
+        self._current: Optional[Dict] = None
+        # Materializers may run in a worker pool
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase; counts made while it runs are attributed to it.
+
+        Args:
+            name: Phase name, as shown in reports
+        """
+        record = {'name': name, 'seconds': 0.0, 'counters': {}}
+        self.phases.append(record)
+        outer, self._current = self._current, record
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._current = outer
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a counter, in the current phase and in the totals."""
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0) + n
+            if self._current is not None:
+                counters = self._current['counters']
+                counters[name] = counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'phases': [dict(p, counters=dict(sorted(p['counters'].items()))) for p in self.phases],
+            'totalSeconds': sum(p['seconds'] for p in self.phases),
+            'counters': dict(sorted(self.totals.items())),
+        }
+
+    def format_text(self) -> str:
+        """Human-readable report: one line per phase, then the totals."""
+        width = max([len(p['name']) for p in self.phases] + [len('total')])
+        lines = ["Timings:"]
+        for p in self.phases:
+            counters = "  ".join(f"{k}={v}" for k, v in sorted(p['counters'].items()))
+            lines.append(f"  {p['name']:<{width}}  {p['seconds'] * 1000:9.1f} ms  {counters}".rstrip())
+        total = sum(p['seconds'] for p in self.phases)
+        lines.append(f"  {'total':<{width}}  {total * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+_active: Optional[Metrics] = None
+
+
+@contextmanager
+def recording(metrics: Metrics) -> Iterator[Metrics]:
+    """Make metrics the target of count() for the duration of the block."""
+    global _active
+    outer, _active = _active, metrics
+    try:
+        yield metrics
+    finally:
+        _active = outer
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a counter of the recording Metrics, if any."""
+    if _active is not None:
+        _active.count(name, n)
@@ -9,7 +9,9 @@ rewritten consistently.
 
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+import metrics
 
 
 @dataclass
@@ -178,12 +180,134 @@ class NameMapper:
         return self.references.get(claude_name, set())
 
 
+class _BranchMatch:
+    """One branch of a combined-pattern match, with groups numbered as if
+    that branch's pattern had matched on its own."""
+
+    __slots__ = ('match', 'offset')
+
+    def __init__(self, match: re.Match, offset: int):
+        self.match = match
+        self.offset = offset
+
+    def group(self, index: int = 0) -> str:
+        return self.match.group(self.offset + index)
+
+
+class RewriteEngine:
+    """A compiled, registry-gated reference rewriter.
+
+    Built once from a NameMapper and a list of reference patterns, then
+    applied to any number of files. All patterns run as one combined regex,
+    so rewriting a file is a single scan whatever the size of the registry.
+    """
+
+    # Combined pattern and dispatch table per pattern list, shared by engines
+    _compiled: Dict[Tuple[str, ...], Tuple[re.Pattern, Dict[int, Tuple[int, int]]]] = {}
+
+    def __init__(self, name_mapper: NameMapper, patterns: List[Tuple]):
+        """Initialize the engine.
+
+        Args:
+            name_mapper: NameMapper with registered extensions
+            patterns: (pattern, extract name, build replacement) entries,
+                in the form of ReferenceRewriter.REFERENCE_PATTERNS
+        """
+        self.name_mapper = name_mapper
+        self.patterns = list(patterns)
+        self.pattern, self.dispatch = self._compile(self.patterns)
+
+    @classmethod
+    def _compile(cls, patterns: List[Tuple]) -> Tuple[re.Pattern, Dict[int, Tuple[int, int]]]:
+        """Compile patterns into one alternation.
+
+        Each pattern is wrapped in a capturing group, so match.lastindex
+        names the branch that matched. Returns the pattern and a map from
+        wrapper group number to (index into patterns, group offset).
+        """
+        key = tuple(pattern for pattern, _, _ in patterns)
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            branches = []
+            dispatch: Dict[int, Tuple[int, int]] = {}
+            group = 1
+            for i, pattern in enumerate(key):
+                branches.append(f'({pattern})')
+                dispatch[group] = (i, group)
+                group += 1 + re.compile(pattern).groups
+            compiled = cls._compiled[key] = (re.compile('|'.join(branches)), dispatch)
+        return compiled
+
+    def lookup(self, claude_name: str) -> Optional[str]:
+        """The Copilot name a reference is rewritten to, or None if unregistered."""
+        if not self.name_mapper.is_registered(claude_name):
+            return None
+        return self.name_mapper.get_copilot_name(claude_name)
+
+    def rewrite(self, content: str, lookups: Optional[Dict[str, Optional[str]]] = None) -> str:
+        """Rewrite registered extension references in content.
+
+        Text that merely looks like a reference but does not name a
+        registered extension is left verbatim. The output is joined once, so
+        the cost is linear in the content. A match that fails the
+        registration gate consumes nothing: scanning resumes one character
+        later, so a reference of another kind nested in it
+        (subagent_type="see /do:plan") is still found, as it was when each
+        pattern ran on its own.
+
+        Args:
+            content: Original content
+            lookups: If given, filled with every name checked against the
+                registry and its lookup() result; the output is a function
+                of the content and these answers alone
+
+        Returns:
+            Content with rewritten references
+        """
+        pieces: List[str] = []
+        copied = 0
+        pos = 0
+        # End of the last match per pattern, registered or not
+        ends: Dict[int, int] = {}
+
+        while True:
+            match = self.pattern.search(content, pos)
+            if match is None:
+                break
+            start, end = match.span()
+            index, offset = self.dispatch[match.lastindex]
+            if start < ends.get(index, 0):
+                # Inside an earlier match of the same pattern, which a
+                # separate finditer pass would have consumed
+                pos = start + 1
+                continue
+            ends[index] = end
+            _, extract_name, build_replacement = self.patterns[index]
+            branch = _BranchMatch(match, offset)
+            claude_name = extract_name(branch)
+            # [LAW:single-enforcer] the only rewrite-eligibility check:
+            # a match is a reference iff it names a registered extension.
+            copilot_name = self.lookup(claude_name)
+            if lookups is not None:
+                lookups[claude_name] = copilot_name
+            if copilot_name is None:
+                pos = start + 1
+                continue
+            pieces.append(content[copied:start])
+            pieces.append(build_replacement(branch, copilot_name))
+            copied = pos = end
+
+        pieces.append(content[copied:])
+        metrics.count('references_rewritten', len(pieces) // 2)
+        return ''.join(pieces)
+
+
 class ReferenceRewriter:
     """Rewrites extension references in file content."""
 
     # Each entry: (pattern, extract claude name from match, build replacement
     # from match + copilot name). Extraction and replacement are declared per
-    # pattern so validation can live at a single gate in rewrite_content.
+    # pattern so validation can live at a single gate in RewriteEngine.
     # [LAW:no-silent-failure] the command pattern is anchored to start-of-line
     # or whitespace — mid-token slash-colon text (paths like src/utils:helpers,
     # owner/repo:branch, timestamps) must never read as a command invocation.
@@ -209,12 +333,50 @@ class ReferenceRewriter:
          lambda m, copilot_name: f'{m.group(1)}="{copilot_name}"'),
     ]
 
+    # Bare names in prose: "the do:iterative-implementer agent". A whole
+    # token only — never part of a path (src/do:plan) or a longer
+    # colon chain (a:b:c).
+    NAME_PATTERN = (
+        r'(?<![\w/:-])([\w-]+):([\w-]+)(?![\w:-])',
+        lambda m: f'{m.group(1)}:{m.group(2)}',
+        lambda m, copilot_name: copilot_name,
+    )
+
+    # Command invocations as markdown writes them in synced bodies: after
+    # whitespace or at the start, as above, and also right after a backtick,
+    # bracket, or quote — `/do:plan`, (/do:plan), "/do:plan". Still never
+    # mid-token, so src/do:plan stays a path.
+    DELIMITED_COMMAND_PATTERN = (
+        r'(?<![^\s`(\'"])/([\w-]+):([\w-]+)',
+        lambda m: f'{m.group(1)}:{m.group(2)}',
+        lambda m, copilot_name: f'skill {copilot_name}',
+    )
+
+    @classmethod
+    def engine(cls, name_mapper: NameMapper, bare_names: bool = False) -> RewriteEngine:
+        """Build a rewrite engine over REFERENCE_PATTERNS.
+
+        Args:
+            name_mapper: NameMapper with registered extensions
+            bare_names: Rewrite synced agent and skill bodies: also bare
+                plugin:name tokens (NAME_PATTERN), and command invocations
+                inside markdown delimiters (DELIMITED_COMMAND_PATTERN)
+
+        Returns:
+            RewriteEngine to apply to any number of files
+        """
+        if not bare_names:
+            return RewriteEngine(name_mapper, cls.REFERENCE_PATTERNS)
+        # REFERENCE_PATTERNS[0] is the whitespace-anchored command pattern
+        patterns = [cls.DELIMITED_COMMAND_PATTERN] + cls.REFERENCE_PATTERNS[1:] + [cls.NAME_PATTERN]
+        return RewriteEngine(name_mapper, patterns)
+
     @classmethod
     def rewrite_content(cls, content: str, name_mapper: NameMapper) -> str:
         """Rewrite registered extension references in content.
 
         Text that merely looks like a reference but does not name a
-        registered extension is left verbatim.
+        registered extension is left verbatim (see RewriteEngine.rewrite).
 
         Args:
             content: Original content
@@ -223,24 +385,7 @@ class ReferenceRewriter:
         Returns:
             Content with rewritten references
         """
-        rewritten = content
-
-        for pattern, extract_name, build_replacement in cls.REFERENCE_PATTERNS:
-            # Find all matches
-            matches = list(re.finditer(pattern, rewritten))
-
-            # Rewrite in reverse order to preserve indices
-            for match in reversed(matches):
-                claude_name = extract_name(match)
-                # [LAW:single-enforcer] the only rewrite-eligibility check:
-                # a match is a reference iff it names a registered extension.
-                if not name_mapper.is_registered(claude_name):
-                    continue
-                replacement = build_replacement(match, name_mapper.get_copilot_name(claude_name))
-                start, end = match.span()
-                rewritten = rewritten[:start] + replacement + rewritten[end:]
-
-        return rewritten
+        return cls.engine(name_mapper).rewrite(content)
 
     @classmethod
     def extract_references(cls, content: str) -> Set[str]:
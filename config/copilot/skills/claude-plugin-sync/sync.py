@@ -8,13 +8,25 @@ and creates symlinks for skills and copies/rewrites agents to ~/.copilot/skills
 This module uses a functional programming style with simple primitives and collections.
 """
 
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
 import json
+import os
 import re
+import select
 import shutil
+import struct
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import metrics
+from name_mapping import NameMapper, ReferenceRewriter, RewriteEngine
 
 
 # Constants
@@ -27,6 +39,10 @@ ALLOWED_SKILL_FIELDS = {
     'allowed-tools'
 }
 
+# Bump whenever transform_skill or rewrite_agent output changes for the same
+# input: records written under another version are never trusted to skip.
+TRANSFORM_VERSION = 2
+
 DEFAULT_PATHS = {
     'claude_plugins_file': Path.home() / ".claude" / "plugins" / "installed_plugins.json",
     'claude_settings_file': Path.home() / ".claude" / "settings.json",
@@ -241,35 +257,61 @@ def fields_to_frontmatter_lines(fields: Dict[str, str]) -> List[str]:
 # Plugin Reference Rewriting
 # ============================================================================
 
-def rewrite_plugin_references(content: str, plugin_name: str) -> str:
+def build_rewrite_engine(extensions: Iterable[Tuple[str, str]]) -> RewriteEngine:
+    """Build the reference rewriter for one sync run.
+
+    Every extension being synced is registered under the name its target
+    gets (plugin-name), so references to any of them, from any plugin, are
+    rewritten in one pass per file; anything else is left verbatim.
+
+    Args:
+        extensions: (plugin_name, extension_name) pairs; a trailing '.agent'
+            on agent names is dropped, as in the agent's frontmatter name
+
+    Returns:
+        RewriteEngine to pass to rewrite_plugin_references
+    """
+    mapper = NameMapper()
+    for plugin_name, name in extensions:
+        if name.endswith('.agent'):
+            name = name[:-len('.agent')]
+        mapper.register_extension(f"{plugin_name}:{name}", f"{plugin_name}-{name}")
+    return ReferenceRewriter.engine(mapper, bare_names=True)
+
+
+def rewrite_plugin_references(content: str, plugin_name: str,
+                              engine: Optional[RewriteEngine] = None,
+                              lookups: Optional[Dict[str, Optional[str]]] = None) -> str:
     """Rewrite plugin:name references to plugin-name format in content body.
 
     Handles patterns like:
-    - /do:plan -> skill do-plan (command to skill invocation)
+    - /do:plan -> skill do-plan (command to skill invocation), also inside
+      backticks, brackets, or quotes: `/do:plan` -> `skill do-plan`
     - do:iterative-implementer -> do-iterative-implementer (agent/skill references)
 
     Args:
         content: Content to rewrite
         plugin_name: Name of the plugin
+        engine: Rewrite engine for the sync run (see build_rewrite_engine);
+            without one, every plugin_name:name in content counts as synced
+        lookups: Filled with the registry answers the output depends on
 
     Returns:
         Rewritten content
     """
-    # Convert command references: /plugin:name -> skill plugin-name
-    command_pattern = f'/({re.escape(plugin_name)}):([a-zA-Z0-9_-]+)'
-    content = re.sub(command_pattern, r'skill \1-\2', content)
-
-    # Replace remaining plugin:name with plugin-name
-    pattern = f'({re.escape(plugin_name)}):([a-zA-Z0-9_-]+)'
-    replacement = r'\1-\2'
-    return re.sub(pattern, replacement, content)
+    if engine is None:
+        own = re.findall(f'(?<![\\w-]){re.escape(plugin_name)}:([\\w-]+)', content)
+        engine = build_rewrite_engine((plugin_name, name) for name in own)
+    return engine.rewrite(content, lookups)
 
 
 # ============================================================================
 # Skill Transformation
 # ============================================================================
 
-def transform_skill(content: str, plugin_name: str, skill_name: str, allowed_fields: Set[str]) -> str:
+def transform_skill(content: str, plugin_name: str, skill_name: str, allowed_fields: Set[str],
+                    engine: Optional[RewriteEngine] = None,
+                    lookups: Optional[Dict[str, Optional[str]]] = None) -> str:
     """Transform command content into skill content.
 
     Args:
@@ -277,6 +319,8 @@ def transform_skill(content: str, plugin_name: str, skill_name: str, allowed_fie
         plugin_name: Name of the plugin
         skill_name: Name of the skill
         allowed_fields: Set of allowed field names
+        engine: Rewrite engine for the sync run (see rewrite_plugin_references)
+        lookups: Filled with the registry answers the output depends on
 
     Returns:
         Transformed skill content
@@ -297,7 +341,7 @@ def transform_skill(content: str, plugin_name: str, skill_name: str, allowed_fie
 
     # Rewrite plugin references in body
     body_content = '\n'.join(body_lines)
-    body_content = rewrite_plugin_references(body_content, plugin_name)
+    body_content = rewrite_plugin_references(body_content, plugin_name, engine, lookups)
     body_lines = body_content.split('\n')
 
     # Reconstruct content
@@ -360,13 +404,17 @@ def update_agent_field(line: str, plugin_name: str) -> str:
     return line
 
 
-def rewrite_agent(content: str, plugin_name: str, agent_name: str) -> str:
+def rewrite_agent(content: str, plugin_name: str, agent_name: str,
+                  engine: Optional[RewriteEngine] = None,
+                  lookups: Optional[Dict[str, Optional[str]]] = None) -> str:
     """Rewrite agent frontmatter to namespace the agent name.
 
     Args:
         content: Original agent file content
         plugin_name: Name of the plugin
         agent_name: Name of the agent
+        engine: Rewrite engine for the sync run (see rewrite_plugin_references)
+        lookups: Filled with the registry answers the output depends on
 
     Returns:
         Rewritten agent content
@@ -431,7 +479,7 @@ def rewrite_agent(content: str, plugin_name: str, agent_name: str) -> str:
 
     # Rewrite plugin:name references in the body
     body_content = '\n'.join(lines[end_idx:])
-    body_content = rewrite_plugin_references(body_content, plugin_name)
+    body_content = rewrite_plugin_references(body_content, plugin_name, engine, lookups)
 
     return '\n'.join(['---'] + new_frontmatter + [body_content])
 
@@ -459,27 +507,79 @@ def create_symlink(source: Path, target: Path) -> bool:
     return True
 
 
-def write_if_changed(target: Path, content: str) -> bool:
+def file_matches(path: Path, recorded: Optional[Dict]) -> bool:
+    """Check a regular file against a recorded {size, mtimeNs} fingerprint.
+
+    Args:
+        path: File to check (a symlink never matches)
+        recorded: Fingerprint dictionary, or None
+
+    Returns:
+        True if the file exists with exactly the recorded size and mtime
+    """
+    if not isinstance(recorded, dict):
+        return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (not path.is_symlink() and st.st_size == recorded.get("size")
+            and st.st_mtime_ns == recorded.get("mtimeNs"))
+
+
+def content_fingerprint(target: Path, content: str) -> Dict:
+    """Fingerprint a file known to hold exactly `content`.
+
+    Args:
+        target: File holding the content
+        content: Its content
+
+    Returns:
+        {size, mtimeNs, sha256} for recording in the manifest
+    """
+    st = os.lstat(target)
+    return {
+        "size": st.st_size,
+        "mtimeNs": st.st_mtime_ns,
+        "sha256": hashlib.sha256(content.encode()).hexdigest()
+    }
+
+
+def write_if_changed(target: Path, content: str, recorded: Optional[Dict] = None) -> bool:
     """Write content to file if it differs from current content.
 
+    When the target still matches a recorded fingerprint of this same
+    content, it is not read at all. Writes go to a temp file renamed over
+    the target, so a reader sees the old file or the new one, never a
+    missing or partial one.
+
     Args:
         target: Target file path
         content: Content to write
+        recorded: Fingerprint recorded when the target was last written
 
     Returns:
         True if file was written, False if content unchanged
     """
-    if target.exists() and target.read_text() == content:
+    data = content.encode()
+    if (isinstance(recorded, dict) and file_matches(target, recorded)
+            and recorded.get("sha256") == hashlib.sha256(data).hexdigest()):
+        return False
+    if target.is_file() and target.stat().st_size == len(data) and target.read_bytes() == data:
         return False
 
     # Ensure parent directory exists
     target.parent.mkdir(parents=True, exist_ok=True)
 
-    # Remove existing file/symlink if it exists
-    if target.exists() or target.is_symlink():
-        target.unlink()
-
-    target.write_text(content)
+    # os.replace swaps the name itself: an existing symlink is replaced,
+    # never written through
+    tmp = target.with_name(f".{target.name}.tmp-{os.getpid()}")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
     return True
 
 
@@ -651,6 +751,27 @@ def get_plugin_path(plugin_info: list) -> Optional[Path]:
     return None
 
 
+def resolve_plugins(installed: Dict, enabled: Set[str]) -> List[Tuple[str, Path]]:
+    """Resolve installed plugins to the ones to sync.
+
+    Args:
+        installed: Installed plugins (see load_installed_plugins)
+        enabled: Enabled plugin keys; empty means every installed plugin
+
+    Returns:
+        (plugin_name, plugin_path) pairs in install order, for enabled
+        plugins whose install path exists
+    """
+    plugins = []
+    for plugin_key, plugin_info in installed.items():
+        if enabled and plugin_key not in enabled:
+            continue
+        plugin_path = get_plugin_path(plugin_info)
+        if plugin_path:
+            plugins.append((plugin_key.split("@")[0], plugin_path))
+    return plugins
+
+
 # ============================================================================
 # Manifest Management
 # ============================================================================
@@ -715,6 +836,123 @@ def preserve_removed_entries(manifest: Dict, previous_manifest: Dict) -> None:
                 }
 
 
+# ============================================================================
+# Change Detection
+# ============================================================================
+
+def previous_record(previous_manifest: Optional[Dict], category: str, target_name: str) -> Optional[Dict]:
+    """Return the previous run's active record for a target, if any.
+
+    Args:
+        previous_manifest: Previous sync manifest, or None
+        category: Manifest category ('agents' or 'commands')
+        target_name: Manifest key of the item
+
+    Returns:
+        The record dictionary, or None if absent or not active
+    """
+    if not previous_manifest:
+        return None
+    record = previous_manifest.get(category, {}).get(target_name)
+    if not isinstance(record, dict) or record.get("status") != "active":
+        return None
+    return record
+
+
+def references_unchanged(record: Dict, engine: Optional[RewriteEngine]) -> bool:
+    """True if the run's rewrite engine answers every lookup the recorded
+    output depended on the same way (trivially so without an engine)."""
+    if engine is None:
+        return True
+    references = record.get("references")
+    return isinstance(references, dict) and all(
+        engine.lookup(name) == copilot_name for name, copilot_name in references.items()
+    )
+
+
+def read_if_changed(source: Path, target: Path, record: Optional[Dict],
+                    engine: Optional[RewriteEngine] = None) -> Tuple[Dict, Optional[str]]:
+    """Fingerprint a source file and read it only if it needs transforming.
+
+    The source is unchanged when the previous record names the same source,
+    was written by the same TRANSFORM_VERSION, its references still resolve
+    as recorded, its target still matches the recorded target fingerprint,
+    and either the source's (size, mtimeNs) match — no read at all — or,
+    after a touch, its sha256 does.
+
+    Args:
+        source: Source file (agent or command markdown)
+        target: File the transformed content is written to
+        record: Previous active manifest record for this target, or None
+        engine: Rewrite engine for the sync run
+
+    Returns:
+        (fingerprint, content) - content is None when the source is unchanged
+    """
+    st = source.stat()
+    fingerprint = {"size": st.st_size, "mtimeNs": st.st_mtime_ns}
+
+    old = None
+    if (record and record.get("source") == str(source)
+            and record.get("transformVersion") == TRANSFORM_VERSION
+            and isinstance(record.get("fingerprint"), dict)
+            and references_unchanged(record, engine)
+            and file_matches(target, record.get("target"))):
+        old = record["fingerprint"]
+
+    if old and old.get("size") == st.st_size and old.get("mtimeNs") == st.st_mtime_ns and old.get("sha256"):
+        fingerprint["sha256"] = old["sha256"]
+        return fingerprint, None
+
+    data = source.read_bytes()
+    metrics.count('bytes_read', len(data))
+    fingerprint["sha256"] = hashlib.sha256(data).hexdigest()
+    if old and old.get("sha256") == fingerprint["sha256"]:
+        return fingerprint, None
+    # Decode the bytes just hashed rather than reading the file again: one
+    # read, and the fingerprint always describes the content transformed.
+    # The newline translation is read_text's, so targets are unchanged.
+    return fingerprint, data.decode().replace("\r\n", "\n").replace("\r", "\n")
+
+
+def materialize_file(source: Path, target: Path, record: Optional[Dict],
+                     transform: Callable[[str, Dict[str, Optional[str]]], str],
+                     engine: Optional[RewriteEngine] = None) -> Tuple[bool, Dict]:
+    """Transform a source file into its target unless both are unchanged.
+
+    Args:
+        source: Source file (agent or command markdown)
+        target: File the transformed content is written to
+        record: Previous active manifest record for this target, or None
+        transform: Function from source content, and a dict to fill with
+            the rewrite engine's answers, to target content
+        engine: Rewrite engine for the sync run
+
+    Returns:
+        (changed, fields) - fields are the fingerprint entries for the
+        target's manifest record
+    """
+    fingerprint, content = read_if_changed(source, target, record, engine)
+    if content is None:
+        metrics.count('items_skipped')
+        return False, {
+            "fingerprint": fingerprint,
+            "target": record["target"],
+            "references": record.get("references", {}),
+            "transformVersion": TRANSFORM_VERSION
+        }
+    lookups: Dict[str, Optional[str]] = {}
+    new_content = transform(content, lookups)
+    changed = write_if_changed(target, new_content, record.get("target") if record else None)
+    metrics.count('items_written' if changed else 'items_unchanged')
+    return changed, {
+        "fingerprint": fingerprint,
+        "target": content_fingerprint(target, new_content),
+        "references": lookups,
+        "transformVersion": TRANSFORM_VERSION
+    }
+
+
 # ============================================================================
 # Syncing Operations
 # ============================================================================
@@ -742,6 +980,7 @@ def sync_skill_item(skill_name: str, skill_path: Path, plugin_name: str,
     target_path = skills_dir / target_name
 
     changed = create_symlink(skill_path, target_path)
+    metrics.count('items_written' if changed else 'items_unchanged')
 
     synced_skills.add(target_name)
     manifest["skills"][target_name] = {
@@ -753,7 +992,9 @@ def sync_skill_item(skill_name: str, skill_path: Path, plugin_name: str,
 
 
 def sync_agent_item(agent_name: str, agent_path: Path, plugin_name: str,
-                    agents_dir: Path, synced_agents: Set[str], manifest: Dict) -> bool:
+                    agents_dir: Path, synced_agents: Set[str], manifest: Dict,
+                    previous_manifest: Optional[Dict] = None,
+                    engine: Optional[RewriteEngine] = None) -> bool:
     """Sync a single agent: rewrite frontmatter (namespacing) and copy.
 
     Args:
@@ -763,6 +1004,9 @@ def sync_agent_item(agent_name: str, agent_path: Path, plugin_name: str,
         agents_dir: Target agents directory
         synced_agents: Set to track synced agent names (modified in place)
         manifest: Manifest dictionary (modified in place)
+        previous_manifest: Previous sync manifest; an unchanged source is
+            skipped without being read or rewritten
+        engine: Rewrite engine for the sync run (see build_rewrite_engine)
 
     Returns:
         True if the agent was added/updated
@@ -774,23 +1018,26 @@ def sync_agent_item(agent_name: str, agent_path: Path, plugin_name: str,
 
     target_path = agents_dir / target_name
 
-    content = agent_path.read_text()
-    new_content = rewrite_agent(content, plugin_name, agent_name)
-
-    changed = write_if_changed(target_path, new_content)
+    changed, fields = materialize_file(
+        agent_path, target_path, previous_record(previous_manifest, "agents", target_name),
+        lambda content, lookups: rewrite_agent(content, plugin_name, agent_name, engine, lookups),
+        engine
+    )
 
     synced_agents.add(target_name)
     manifest["agents"][target_name] = {
         "source": str(agent_path),
         "plugin": plugin_name,
-        "status": "active"
+        "status": "active",
+        **fields
     }
     return changed
 
 
 def sync_command_item(command_name: str, command_path: Path, plugin_name: str,
                       skills_dir: Path, synced_commands: Set[str], manifest: Dict,
-                      allowed_fields: Set[str]) -> bool:
+                      allowed_fields: Set[str], previous_manifest: Optional[Dict] = None,
+                      engine: Optional[RewriteEngine] = None) -> bool:
     """Sync a single command: transform to a skill in a namespaced directory.
 
     Args:
@@ -801,6 +1048,9 @@ def sync_command_item(command_name: str, command_path: Path, plugin_name: str,
         synced_commands: Set to track synced command names (modified in place)
         manifest: Manifest dictionary (modified in place)
         allowed_fields: Set of allowed frontmatter field names
+        previous_manifest: Previous sync manifest; an unchanged source is
+            skipped without being read or transformed
+        engine: Rewrite engine for the sync run (see build_rewrite_engine)
 
     Returns:
         True if the command was added/updated
@@ -825,16 +1075,19 @@ def sync_command_item(command_name: str, command_path: Path, plugin_name: str,
     target_skill_dir.mkdir(parents=True, exist_ok=True)
     target_file = target_skill_dir / "SKILL.md"
 
-    content = command_path.read_text()
-    skill_content = transform_skill(content, plugin_name, command_name, allowed_fields)
-
-    changed = write_if_changed(target_file, skill_content)
+    changed, fields = materialize_file(
+        command_path, target_file, previous_record(previous_manifest, "commands", target_name),
+        lambda content, lookups: transform_skill(content, plugin_name, command_name,
+                                                 allowed_fields, engine, lookups),
+        engine
+    )
 
     synced_commands.add(target_name)
     manifest["commands"][target_name] = {
         "source": str(command_path),
         "plugin": plugin_name,
-        "status": "active"
+        "status": "active",
+        **fields
     }
     return changed
 
@@ -865,7 +1118,9 @@ def sync_skills(plugin_path: Path, plugin_name: str, skills_dir: Path,
 
 
 def sync_agents(plugin_path: Path, plugin_name: str, agents_dir: Path,
-                synced_agents: Set[str], manifest: Dict) -> int:
+                synced_agents: Set[str], manifest: Dict,
+                previous_manifest: Optional[Dict] = None,
+                engine: Optional[RewriteEngine] = None) -> int:
     """Sync agents for a plugin.
 
     Args:
@@ -874,6 +1129,8 @@ def sync_agents(plugin_path: Path, plugin_name: str, agents_dir: Path,
         agents_dir: Target agents directory
         synced_agents: Set to track synced agent names (modified in place)
         manifest: Manifest dictionary (modified in place)
+        previous_manifest: Previous sync manifest, for skipping unchanged agents
+        engine: Rewrite engine for the sync run
 
     Returns:
         Count of added agents
@@ -883,14 +1140,16 @@ def sync_agents(plugin_path: Path, plugin_name: str, agents_dir: Path,
 
     for agent_name, agent_path in agents:
         if sync_agent_item(agent_name, agent_path, plugin_name,
-                           agents_dir, synced_agents, manifest):
+                           agents_dir, synced_agents, manifest, previous_manifest, engine):
             added += 1
 
     return added
 
 
 def sync_commands(plugin_path: Path, plugin_name: str, skills_dir: Path,
-                  synced_commands: Set[str], manifest: Dict, allowed_fields: Set[str]) -> int:
+                  synced_commands: Set[str], manifest: Dict, allowed_fields: Set[str],
+                  previous_manifest: Optional[Dict] = None,
+                  engine: Optional[RewriteEngine] = None) -> int:
     """Sync commands (transform to skills) for a plugin.
 
     Args:
@@ -900,6 +1159,8 @@ def sync_commands(plugin_path: Path, plugin_name: str, skills_dir: Path,
         synced_commands: Set to track synced command names (modified in place)
         manifest: Manifest dictionary (modified in place)
         allowed_fields: Set of allowed field names
+        previous_manifest: Previous sync manifest, for skipping unchanged commands
+        engine: Rewrite engine for the sync run
 
     Returns:
         Count of added commands
@@ -909,7 +1170,8 @@ def sync_commands(plugin_path: Path, plugin_name: str, skills_dir: Path,
 
     for command_name, command_path in commands:
         if sync_command_item(command_name, command_path, plugin_name,
-                             skills_dir, synced_commands, manifest, allowed_fields):
+                             skills_dir, synced_commands, manifest, allowed_fields,
+                             previous_manifest, engine):
             added += 1
 
     return added
@@ -940,15 +1202,123 @@ def clean_stale_commands(skills_dir: Path, synced_commands: Set[str], previously
     return removed
 
 
+# ============================================================================
+# Per-Plugin Sync
+# ============================================================================
+
+def plugin_targets(plugin_name: str, plugin_path: Path) -> Set[Tuple[str, str]]:
+    """Targets one plugin's sync writes, as (target directory, name) pairs.
+
+    Skills and commands both land in the skills directory; an agent named
+    x.agent writes the same file as one named x.
+
+    Args:
+        plugin_name: Name of the plugin
+        plugin_path: Path to plugin directory
+
+    Returns:
+        Set of ('skills' | 'agents', target_name) pairs
+    """
+    targets = {("skills", f"{plugin_name}-{name}")
+               for find in (find_skills, find_commands)
+               for name, _ in find(plugin_path)}
+    for name, _ in find_agents(plugin_path):
+        if name.endswith('.agent'):
+            name = name[:-len('.agent')]
+        targets.add(("agents", f"{plugin_name}-{name}"))
+    return targets
+
+
+def group_plugins_by_name(plugins: List[Tuple[str, Path]]) -> List[List[Tuple[str, Path]]]:
+    """Group (plugin_name, plugin_path) pairs that may write the same targets.
+
+    Plugins sharing a name (the same plugin from two marketplaces) share a
+    group, and so do plugins whose target names overlap: plugin code-review
+    with skill x and plugin code with skill review-x both write code-review-x.
+    Each group must be synced serially; distinct groups never collide.
+
+    Args:
+        plugins: (plugin_name, plugin_path) pairs in sync order
+
+    Returns:
+        Groups in order of first appearance, each in sync order
+    """
+    parent = list(range(len(plugins)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    claimed: Dict[Tuple[str, str], int] = {}
+    for i, (plugin_name, plugin_path) in enumerate(plugins):
+        for key in plugin_targets(plugin_name, plugin_path) | {("plugin", plugin_name)}:
+            parent[root(i)] = root(claimed.setdefault(key, i))
+
+    groups: Dict[int, List[Tuple[str, Path]]] = {}
+    for i, plugin in enumerate(plugins):
+        groups.setdefault(root(i), []).append(plugin)
+    return list(groups.values())
+
+
+def sync_plugin_group(group: List[Tuple[str, Path]], paths: Dict[str, Path],
+                      previous_manifest: Dict,
+                      engine: Optional[RewriteEngine] = None) -> Dict:
+    """Sync every plugin in one group into group-local records.
+
+    Nothing shared is touched except the target directories, so groups can
+    run concurrently; the caller merges the returned records.
+
+    Args:
+        group: (plugin_name, plugin_path) pairs from group_plugins_by_name
+        paths: Path configuration
+        previous_manifest: Previous sync manifest (read only)
+        engine: Rewrite engine for the sync run (shared, read only)
+
+    Returns:
+        Dictionary with 'manifest' (skills/agents/commands records),
+        'skills'/'agents'/'commands' name sets, and 'stats' counts
+    """
+    result = {
+        "manifest": {"skills": {}, "agents": {}, "commands": {}},
+        "skills": set(),
+        "agents": set(),
+        "commands": set(),
+        "stats": {"added_skills": 0, "added_agents": 0, "added_commands": 0}
+    }
+    for plugin_name, plugin_path in group:
+        result["stats"]["added_skills"] += sync_skills(
+            plugin_path, plugin_name, paths['copilot_skills_dir'],
+            result["skills"], result["manifest"]
+        )
+        result["stats"]["added_agents"] += sync_agents(
+            plugin_path, plugin_name, paths['copilot_agents_dir'],
+            result["agents"], result["manifest"], previous_manifest, engine
+        )
+        result["stats"]["added_commands"] += sync_commands(
+            plugin_path, plugin_name, paths['copilot_skills_dir'],
+            result["commands"], result["manifest"], ALLOWED_SKILL_FIELDS, previous_manifest,
+            engine
+        )
+    return result
+
+
 # ============================================================================
 # Main Sync Function
 # ============================================================================
 
-def sync_plugins(paths: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
+def sync_plugins(paths: Optional[Dict[str, Path]] = None, jobs: int = 1,
+                 only: Optional[Set[str]] = None) -> Dict[str, int]:
     """Main sync function.
 
     Args:
         paths: Optional dictionary of path overrides
+        jobs: Number of plugin groups to sync concurrently (1 = serial)
+        only: Plugin names to sync; the other plugins' records are carried
+            over from the previous manifest untouched. Plugins whose records
+            depend on a reference that now resolves differently are synced
+            too. None syncs every plugin.
 
     Returns:
         Dictionary with sync statistics
@@ -974,12 +1344,6 @@ def sync_plugins(paths: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
             "removed_skills": 0, "removed_agents": 0, "removed_commands": 0
         }
 
-    # Filter to enabled plugins
-    plugins_to_sync = {
-        key: info for key, info in installed.items()
-        if not enabled or key in enabled
-    }
-
     # Track synced items
     synced_skills = set()
     synced_agents = set()
@@ -994,31 +1358,48 @@ def sync_plugins(paths: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
     previous_manifest = load_manifest(paths['manifest_file'])
     manifest = create_manifest()
 
-    # Sync each plugin
-    for plugin_key, plugin_info in plugins_to_sync.items():
-        plugin_path = get_plugin_path(plugin_info)
-        if not plugin_path:
-            continue
-
-        plugin_name = plugin_key.split("@")[0]
-
-        # Sync skills
-        stats["added_skills"] += sync_skills(
-            plugin_path, plugin_name, paths['copilot_skills_dir'],
-            synced_skills, manifest
-        )
-
-        # Sync agents
-        stats["added_agents"] += sync_agents(
-            plugin_path, plugin_name, paths['copilot_agents_dir'],
-            synced_agents, manifest
-        )
+    # Resolve plugins, then sync them group by group
+    plugins = resolve_plugins(installed, enabled)
+    groups = group_plugins_by_name(plugins)
+    engine = build_rewrite_engine(
+        (plugin_name, name)
+        for plugin_name, plugin_path in plugins
+        for find in (find_skills, find_agents, find_commands)
+        for name, _ in find(plugin_path)
+    )
 
-        # Sync commands
-        stats["added_commands"] += sync_commands(
-            plugin_path, plugin_name, paths['copilot_skills_dir'],
-            synced_commands, manifest, ALLOWED_SKILL_FIELDS
-        )
+    if only is not None:
+        affected = set(only)
+        for category in ['agents', 'commands']:
+            for record in previous_manifest.get(category, {}).values():
+                if record.get("status") == "active" and not references_unchanged(record, engine):
+                    affected.add(record.get("plugin"))
+        groups = [[plugin for plugin in group if plugin[0] in affected] for group in groups]
+        groups = [group for group in groups if group]
+        carry_over_records(previous_manifest, manifest, {name for name, _ in plugins} - affected)
+        synced_skills |= set(manifest["skills"])
+        synced_agents |= set(manifest["agents"])
+        synced_commands |= set(manifest["commands"])
+
+    def run_group(group):
+        return sync_plugin_group(group, paths, previous_manifest, engine)
+
+    if jobs > 1 and len(groups) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_group, groups))
+    else:
+        results = [run_group(group) for group in groups]
+
+    # [LAW:single-enforcer] merge in group order (pool.map preserves it), so
+    # the manifest is identical whatever order the workers finished in
+    for result in results:
+        for category in ['skills', 'agents', 'commands']:
+            manifest[category].update(result["manifest"][category])
+        synced_skills |= result["skills"]
+        synced_agents |= result["agents"]
+        synced_commands |= result["commands"]
+        for key, count in result["stats"].items():
+            stats[key] += count
 
     # Clean up stale items
     stats["removed_skills"] = clean_stale_items(
@@ -1055,10 +1436,305 @@ def sync_plugins(paths: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
     return stats
 
 
+def carry_over_records(previous_manifest: Dict, manifest: Dict, plugin_names: Set[str]) -> None:
+    """Copy the previous run's active records of the given plugins unchanged.
+
+    Args:
+        previous_manifest: Previous sync manifest
+        manifest: Manifest being built (modified in place)
+        plugin_names: Plugins that are not being synced this run
+    """
+    for category in ['skills', 'agents', 'commands']:
+        for name, record in previous_manifest.get(category, {}).items():
+            if (isinstance(record, dict) and record.get("status") == "active"
+                    and record.get("plugin") in plugin_names):
+                manifest[category][name] = record
+
+
+# ============================================================================
+# Watch Mode
+# ============================================================================
+
+class InotifyWatcher:
+    """Changed paths under a set of directories, via Linux inotify through libc.
+
+    Watches are not recursive: every directory of interest is added, and
+    adding one that is already watched is a no-op. When the kernel's event
+    queue overflows, events were dropped and wait() returns None: anything
+    may have changed.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        for directory in directories:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            # A directory that vanished in the meantime is simply not watched
+            if wd >= 0:
+                self.dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        changed: Set[Path] = set()
+        overflowed = False
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, pos)
+                pos += self.EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                directory = self.dirs.get(wd)
+                if mask & self.IN_Q_OVERFLOW:
+                    # Arrives with wd -1; the events it stands for are lost
+                    overflowed = True
+                elif mask & self.IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif directory is not None:
+                    changed.add(directory / os.fsdecode(name) if name else directory)
+        return None if overflowed else changed
+
+
+class PollingWatcher:
+    """Changed paths under a set of directories, by comparing stats each interval.
+
+    The fallback where inotify does not exist (macOS) or cannot be set up.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.dirs: Set[Path] = set()
+        self.stamps: Dict[Path, Tuple[int, int]] = {}
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        self.dirs = set(directories)
+        self.stamps = self.scan()
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        stamps: Dict[Path, Tuple[int, int]] = {}
+        for directory in self.dirs:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        stamps[Path(entry.path)] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        return stamps
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self.scan()
+        changed = {path for path in current.keys() | self.stamps.keys()
+                   if current.get(path) != self.stamps.get(path)}
+        self.stamps = current
+        return changed
+
+
+def open_watcher(poll_interval: float):
+    """An InotifyWatcher where available, else a PollingWatcher."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}); polling every {poll_interval}s",
+                  file=sys.stderr)
+    return PollingWatcher(poll_interval)
+
+
+def watch_directories(paths: Dict[str, Path], plugins: List[Tuple[str, Path]]) -> List[Path]:
+    """Directories whose changes can change what a sync produces.
+
+    The directories holding installed_plugins.json and settings.json, and
+    for each plugin the directories find_skills/find_agents/find_commands
+    list: the plugin root, agents/, commands/, skills/ and each skill dir.
+
+    Args:
+        paths: Path configuration
+        plugins: (plugin_name, plugin_path) pairs being synced
+
+    Returns:
+        Existing directories to watch
+    """
+    dirs = [paths['claude_plugins_file'].parent, paths['claude_settings_file'].parent]
+    for _, plugin_path in plugins:
+        dirs += [plugin_path, plugin_path / "agents", plugin_path / "commands"]
+        skills_dir = plugin_path / "skills"
+        dirs.append(skills_dir)
+        if skills_dir.is_dir():
+            dirs += [d for d in skills_dir.iterdir() if d.is_dir()]
+    return [d for d in dict.fromkeys(dirs) if d.is_dir()]
+
+
+def affected_plugins(changed: Set[Path], paths: Dict[str, Path],
+                     plugins: List[Tuple[str, Path]]) -> Optional[Set[str]]:
+    """Map changed paths to the plugins that need syncing.
+
+    Args:
+        changed: Paths reported by a watcher
+        paths: Path configuration
+        plugins: (plugin_name, plugin_path) pairs being synced
+
+    Returns:
+        None if the plugin configuration changed (sync everything),
+        otherwise the names of plugins with changed files (maybe empty:
+        ~/.claude sees plenty of unrelated writes)
+    """
+    if changed & {paths['claude_plugins_file'], paths['claude_settings_file']}:
+        return None
+    names = set()
+    for plugin_name, plugin_path in plugins:
+        if any(path == plugin_path or plugin_path in path.parents for path in changed):
+            names.add(plugin_name)
+    return names
+
+
+def wait_for_changes(watcher, debounce: float, paths: Dict[str, Path],
+                     plugins: List[Tuple[str, Path]]) -> Optional[Set[str]]:
+    """Block until a burst of relevant changes has settled.
+
+    Args:
+        watcher: InotifyWatcher or PollingWatcher
+        debounce: Seconds without relevant events that end a burst
+        paths: Path configuration
+        plugins: (plugin_name, plugin_path) pairs being synced
+
+    Returns:
+        None to sync everything, otherwise the non-empty set of plugins to sync
+    """
+    def next_affected(timeout: Optional[float]) -> Optional[Set[str]]:
+        changed = watcher.wait(timeout)
+        # None: the watcher lost events, so any plugin may have changed
+        return None if changed is None else affected_plugins(changed, paths, plugins)
+
+    affected: Optional[Set[str]] = set()
+    while affected is not None and not affected:
+        affected = next_affected(None)
+    deadline = time.monotonic() + debounce
+    while (remaining := deadline - time.monotonic()) > 0:
+        more = next_affected(remaining)
+        if more is None or more:
+            # Still changing: the quiet period starts over
+            deadline = time.monotonic() + debounce
+            affected = None if more is None or affected is None else affected | more
+    return affected
+
+
+def watch(paths: Optional[Dict[str, Path]] = None, jobs: int = 1,
+          debounce: float = 1.0, poll_interval: float = 2.0) -> None:
+    """Sync, then re-sync whenever plugins change, until interrupted.
+
+    Bursts of events (a plugin update writes many files) are coalesced:
+    after the first change, events are collected until none arrives for
+    `debounce` seconds. A change to installed_plugins.json or settings.json
+    syncs everything; changes inside plugin directories sync only those
+    plugins (see sync_plugins' `only`).
+
+    Args:
+        paths: Optional dictionary of path overrides
+        jobs: Number of plugin groups to sync concurrently
+        debounce: Quiet period, in seconds, that ends a burst
+        poll_interval: Stat polling interval where inotify is unavailable
+    """
+    if paths is None:
+        paths = DEFAULT_PATHS
+
+    watcher = open_watcher(poll_interval)
+    only: Optional[Set[str]] = None
+    while True:
+        try:
+            sync_plugins(paths, jobs, only)
+        except Exception as e:
+            # A half-written installed_plugins.json during an update, say:
+            # the write that completes it is another event
+            print(f"Error: {e}", file=sys.stderr)
+        try:
+            plugins = resolve_plugins(load_installed_plugins(paths['claude_plugins_file']),
+                                      load_enabled_plugins(paths['claude_settings_file']))
+        except (OSError, ValueError):
+            plugins = []
+        watcher.watch(watch_directories(paths, plugins))
+        print(f"Watching {len(plugins)} plugin(s) for changes...", flush=True)
+
+        only = wait_for_changes(watcher, debounce, paths, plugins)
+
+
+def positive_int(value: str) -> int:
+    """argparse type for a count that must be at least 1."""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+
+def positive_float(value: str) -> float:
+    """argparse type for a duration that must be greater than 0."""
+    n = float(value)
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {n}")
+    return n
+
+
 def main():
     """Entry point for CLI execution."""
+    parser = argparse.ArgumentParser(description="Sync Claude Code plugins to Copilot CLI")
+    parser.add_argument(
+        '--jobs',
+        type=positive_int,
+        default=4,
+        help='Plugins to sync concurrently (default: 4; 1 syncs serially)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and re-sync the affected plugins whenever plugins change'
+    )
+    parser.add_argument(
+        '--debounce',
+        type=positive_float,
+        default=1.0,
+        help='With --watch: seconds without events that end a burst of changes (default: 1)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=positive_float,
+        default=2.0,
+        help='With --watch: stat polling interval where inotify is unavailable (default: 2)'
+    )
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            watch(jobs=args.jobs, debounce=args.debounce, poll_interval=args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        return
+
     try:
-        sync_plugins()
+        sync_plugins(jobs=args.jobs)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
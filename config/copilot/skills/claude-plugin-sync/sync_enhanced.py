@@ -8,14 +8,17 @@ entirely by sync.py's per-item functions, so the two tools cannot drift.
 """
 
 import argparse
+import contextlib
+import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, Set
+from typing import Dict, Iterable, Optional, Set
 
 from claude_config import ClaudeConfig
 from dependency_graph import DependencyScanner, Extension, ExtensionType
 from manifest import SyncManifest, ManifestGenerator
+from metrics import Metrics, recording
 from sync import (
     sync_skill_item,
     sync_agent_item,
@@ -26,8 +29,10 @@ from sync import (
     create_manifest,
     save_manifest,
     preserve_removed_entries,
+    load_installed_plugins,
     ALLOWED_SKILL_FIELDS,
-    DEFAULT_PATHS
+    DEFAULT_PATHS,
+    build_rewrite_engine
 )
 
 
@@ -70,7 +75,10 @@ def sync_extensions(extensions: Iterable[Extension], paths: Dict[str, Path],
         'total_synced': 0
     }
 
-    for ext in sorted(extensions, key=lambda e: e.full_name):
+    extensions = sorted(extensions, key=lambda e: e.full_name)
+    engine = build_rewrite_engine((ext.plugin, ext.name) for ext in extensions)
+
+    for ext in extensions:
         if ext.type is ExtensionType.SKILL:
             # file_path is the SKILL.md; symlink the whole skill directory so
             # supporting files (bin/, references/, scripts) survive the sync
@@ -79,12 +87,13 @@ def sync_extensions(extensions: Iterable[Extension], paths: Dict[str, Path],
                 stats['added_skills'] += 1
         elif ext.type is ExtensionType.AGENT:
             if sync_agent_item(ext.name, ext.file_path, ext.plugin,
-                               agents_dir, synced_agents, manifest):
+                               agents_dir, synced_agents, manifest,
+                               previous_manifest, engine):
                 stats['added_agents'] += 1
         elif ext.type is ExtensionType.COMMAND:
             if sync_command_item(ext.name, ext.file_path, ext.plugin,
                                  skills_dir, synced_commands, manifest,
-                                 ALLOWED_SKILL_FIELDS):
+                                 ALLOWED_SKILL_FIELDS, previous_manifest, engine):
                 stats['added_commands'] += 1
 
     if remove_stale:
@@ -108,50 +117,88 @@ def sync_extensions(extensions: Iterable[Extension], paths: Dict[str, Path],
     return stats
 
 
+def pinned_install_paths(plugins_file: Path) -> Set[Path]:
+    """Install paths recorded in installed_plugins.json.
+
+    These are the plugin versions Claude Code actually loads; the dependency
+    scan prefers them over other versions lingering in the cache.
+
+    Args:
+        plugins_file: Path to installed_plugins.json
+
+    Returns:
+        Set of install paths (empty if the file is missing)
+    """
+    return {
+        Path(entry["installPath"])
+        for entries in load_installed_plugins(plugins_file).values()
+        for entry in entries
+        if isinstance(entry, dict) and entry.get("installPath")
+    }
+
+
 def run_sync(manifest_path: Path = None, dry_run: bool = False,
-             generate_manifest: bool = False) -> Dict[str, int]:
+             generate_manifest: bool = False,
+             metrics: Optional[Metrics] = None) -> Dict[str, int]:
     """Run the enhanced sync process.
 
     Args:
         manifest_path: Path to selection manifest (defaults to ~/.copilot/sync-manifest.json)
         dry_run: If True, show what would be synced without actually syncing
         generate_manifest: If True, generate a new manifest from usage stats
+        metrics: Receives the wall time and work counters of each phase
 
     Returns:
         Dictionary with sync statistics
     """
+    if metrics is None:
+        metrics = Metrics()
+    with recording(metrics):
+        return _run_sync(manifest_path, dry_run, generate_manifest, metrics)
+
+
+def _run_sync(manifest_path: Optional[Path], dry_run: bool, generate_manifest: bool,
+              metrics: Metrics) -> Dict[str, int]:
     # Setup paths
     if manifest_path is None:
         manifest_path = Path.home() / ".copilot" / "sync-manifest.json"
 
     plugins_cache = Path.home() / ".claude" / "plugins" / "cache"
+    graph_cache = Path.home() / ".copilot" / "claude-sync-graph-cache.json"
 
     print(f"Claude Plugin Enhanced Sync - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # Load Claude configuration
     print("\n[1/6] Loading Claude configuration...")
-    config = ClaudeConfig.from_file()
+    with metrics.phase("load-config"):
+        config = ClaudeConfig.from_file()
     print(f"  ✓ Found {len(config.skill_usage)} skill usage records")
 
     # Build dependency graph
     print("\n[2/6] Building dependency graph...")
-    graph = DependencyScanner.scan_all_plugins(plugins_cache)
+    with metrics.phase("build-graph"):
+        graph = DependencyScanner.scan_all_plugins(
+            plugins_cache, pinned_install_paths(DEFAULT_PATHS['claude_plugins_file']),
+            cache_file=graph_cache
+        )
     print(f"  ✓ Found {len(graph.extensions)} extensions")
 
     # Load or generate manifest
     print("\n[3/6] Processing sync manifest...")
-    if generate_manifest or not manifest_path.exists():
-        print("  → Generating manifest from usage statistics...")
-        manifest = ManifestGenerator.generate_from_usage(config, graph, top_n=10, min_usage=3)
-        manifest.save(manifest_path)
-        print(f"  ✓ Generated manifest with {len(manifest.sync_rules)} rules")
-    else:
-        manifest = SyncManifest.load(manifest_path)
-        print(f"  ✓ Loaded manifest with {len(manifest.sync_rules)} rules")
+    with metrics.phase("manifest"):
+        if generate_manifest or not manifest_path.exists():
+            print("  → Generating manifest from usage statistics...")
+            manifest = ManifestGenerator.generate_from_usage(config, graph, top_n=10, min_usage=3)
+            manifest.save(manifest_path)
+            print(f"  ✓ Generated manifest with {len(manifest.sync_rules)} rules")
+        else:
+            manifest = SyncManifest.load(manifest_path)
+            print(f"  ✓ Loaded manifest with {len(manifest.sync_rules)} rules")
 
     # Determine what to sync
     print("\n[4/6] Determining sync set...")
-    extensions_to_sync = manifest.get_extensions_to_sync(config, graph)
+    with metrics.phase("sync-set"):
+        extensions_to_sync = manifest.get_extensions_to_sync(config, graph)
     print(f"  ✓ Will sync {len(extensions_to_sync)} extensions (with dependencies)")
 
     if dry_run:
@@ -168,12 +215,14 @@ def run_sync(manifest_path: Path = None, dry_run: bool = False,
 
     # Sync extensions through the shared materializers
     print("\n[5/6] Syncing extensions...")
-    stats = sync_extensions(extensions_to_sync, DEFAULT_PATHS,
-                            remove_stale=manifest.remove_stale)
+    with metrics.phase("sync"):
+        stats = sync_extensions(extensions_to_sync, DEFAULT_PATHS,
+                                remove_stale=manifest.remove_stale)
 
     print("\n[6/6] Updating selection manifest...")
-    manifest.sync_timestamp = datetime.now()
-    manifest.save(manifest_path)
+    with metrics.phase("save-manifest"):
+        manifest.sync_timestamp = datetime.now()
+        manifest.save(manifest_path)
 
     # Print summary
     print("\n" + "="*60)
@@ -214,6 +263,17 @@ def main():
         action='store_true',
         help='Initialize with a template manifest'
     )
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Print wall time and work counters per phase'
+    )
+    parser.add_argument(
+        '--metrics-json',
+        type=Path,
+        metavar='PATH',
+        help="Write per-phase timings and counters as JSON ('-' for stdout)"
+    )
 
     args = parser.parse_args()
 
@@ -226,11 +286,25 @@ def main():
             print("\nEdit this file to customize which extensions are synced.")
             return 0
 
-        run_sync(
-            manifest_path=args.manifest,
-            dry_run=args.dry_run,
-            generate_manifest=args.generate_manifest
-        )
+        metrics = Metrics()
+        json_to_stdout = str(args.metrics_json) == '-'
+        # With --metrics-json -, stdout carries the JSON report alone, so it
+        # can be piped; progress output goes to stderr instead
+        with contextlib.redirect_stdout(sys.stderr) if json_to_stdout else contextlib.nullcontext():
+            run_sync(
+                manifest_path=args.manifest,
+                dry_run=args.dry_run,
+                generate_manifest=args.generate_manifest,
+                metrics=metrics
+            )
+            if args.timings:
+                print("\n" + metrics.format_text())
+        if args.metrics_json:
+            report = json.dumps(metrics.to_dict(), indent=2)
+            if json_to_stdout:
+                print(report)
+            else:
+                args.metrics_json.write_text(report + "\n")
         return 0
 
     except Exception as e:
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Tests for dependency_graph: scanning, discovery, and graph queries.
+
+Covers the single-pass reference scanner (pinned against the per-pattern
+passes it replaced), plugin root discovery, active-version selection, the
+graph cache, dependency closures, and the suffix index behind reference
+resolution.
+"""
+
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from dependency_graph import (
+    DependencyGraph, DependencyScanner, Extension, ExtensionType, select_active_versions,
+    version_key,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
+def legacy_scan(content: str) -> set:
+    """The original algorithm: one IGNORECASE finditer pass per pattern."""
+    references = set()
+    for patterns in DependencyScanner.PATTERNS.values():
+        for pattern in patterns:
+            for match in re.finditer(pattern, content, re.IGNORECASE):
+                references.add(match.group(1))
+    return references
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "no references here",
+    "run skill do:plan then /do:review",
+    'Skill("do:plan") and skill(\'x:y\')',
+    'Task(subagent_type="do:iterative-implementer")',
+    "use the project-evaluator agent",
+    "use the spawn agent agent",
+    'call the foo agent_type="x:y"',
+    "src/utils:helpers and owner/repo:branch",
+    "SKILL DO:PLAN and Use The Big-Agent Agent",
+    "ſkill do:plan",  # U+017F folds to 's' under IGNORECASE
+    "because the reviewer agent",
+])
+def test_scan_content_matches_legacy_patterns(text):
+    assert DependencyScanner.scan_content(text) == legacy_scan(text)
+
+
+def test_scan_content_matches_legacy_on_fuzzed_text():
+    """Random mixes of pattern fragments scan identically."""
+    fragments = ["skill", "Skill(", "/", ":", "do", "plan", "-", " ", "  ", "\n",
+                 "use", "the", "agent", "spawn", "subagent_type=", "agent_type=",
+                 '"', "'", ")", "x", "call", "launch", "ſ"]
+    rng = random.Random(40)
+    for _ in range(2000):
+        text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 30)))
+        assert DependencyScanner.scan_content(text) == legacy_scan(text), text
+
+
+def test_scan_content_matches_legacy_on_repo_markdown():
+    """Every markdown file under config/claude scans identically."""
+    files = sorted((REPO_ROOT / "config" / "claude").rglob("*.md"))
+    if not files:
+        pytest.skip("no markdown under config/claude")
+    for path in files:
+        content = path.read_text(errors="replace")
+        assert DependencyScanner.scan_content(content) == legacy_scan(content), path
+
+
+def test_scan_file_unreadable_returns_empty(tmp_path):
+    assert DependencyScanner.scan_file(tmp_path / "missing.md") == set()
+
+
+# --- Plugin discovery --------------------------------------------------------
+
+def make_root(path: Path, kind: str = "skills") -> Path:
+    (path / kind).mkdir(parents=True)
+    return path
+
+
+def test_find_plugin_roots_layouts_and_names(tmp_path):
+    """Versioned and flat layouts are found and named by the original rule."""
+    cache = tmp_path / "cache"
+    versioned = make_root(cache / "loom99" / "do" / "0.5.23", "commands")
+    flat = make_root(cache / "solo", "agents")
+
+    roots = DependencyScanner.find_plugin_roots(cache)
+
+    assert roots == [("do", versioned), ("solo", flat)]
+
+
+def test_find_plugin_roots_prunes_and_bounds_depth(tmp_path):
+    """node_modules, nested extension dirs, and too-deep dirs are never roots."""
+    cache = tmp_path / "cache"
+    root = make_root(cache / "org" / "plug" / "1.0.0")
+    make_root(root / "skills" / "inner" / "nested")   # below a root
+    make_root(cache / "org" / "node_modules" / "x")   # pruned
+    make_root(cache / "a" / "b" / "c" / "d")          # deeper than 3 levels
+
+    roots = DependencyScanner.find_plugin_roots(cache)
+
+    assert roots == [("plug", root)]
+
+
+@pytest.mark.parametrize("name", ["build", "dist", ".cache", "venv"])
+def test_find_plugin_roots_finds_dirs_named_like_build_output(tmp_path, name):
+    """Only VCS, node_modules, and __pycache__ dirs are pruned, at any level."""
+    cache = tmp_path / "cache"
+    as_org = make_root(cache / name / "plug" / "1.0.0")
+    as_plugin = make_root(cache / "org" / name / "2.0.0")
+
+    roots = DependencyScanner.find_plugin_roots(cache)
+
+    assert sorted(roots) == sorted([("plug", as_org), (name, as_plugin)])
+
+
+# --- Version selection -------------------------------------------------------
+
+def test_version_key_orders_by_semver():
+    names = ["abc", "0.9.0", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-alpha", "1.0.0", "0.10.0"]
+
+    assert sorted(names, key=version_key) == [
+        "abc", "0.9.0", "0.10.0", "1.0.0-alpha", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0",
+    ]
+
+
+def test_scan_all_plugins_scans_only_the_active_version(tmp_path):
+    """Stale versions are ignored; a pinned install path beats a newer version."""
+    cache = tmp_path / "cache"
+    for version in ("0.9.0", "0.10.0", "0.10.0-rc.1"):
+        skill = cache / "org" / "plug" / version / "skills" / f"only-in-{version}"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text("body\n")
+    make_root(cache / "solo-a")
+    make_root(cache / "solo-b")
+
+    latest = DependencyScanner.scan_all_plugins(cache)
+    pinned = DependencyScanner.scan_all_plugins(cache, {cache / "org" / "plug" / "0.9.0"})
+
+    assert [n for n in latest.extensions if n.startswith("plug:")] == ["plug:only-in-0.10.0"]
+    assert [n for n in pinned.extensions if n.startswith("plug:")] == ["plug:only-in-0.9.0"]
+    roots = select_active_versions(DependencyScanner.find_plugin_roots(cache), cache)
+    assert [name for name, _ in roots] == ["plug", "solo-a", "solo-b"]
+
+
+# --- Graph cache -------------------------------------------------------------
+
+def graph_snapshot(graph) -> tuple:
+    return (
+        {name: (ext.type, ext.file_path, ext.references) for name, ext in graph.extensions.items()},
+        {name: deps for name, deps in graph.dependencies.items() if deps},
+    )
+
+
+def test_scan_all_plugins_cache_rescans_only_changed_files(tmp_path, monkeypatch):
+    """A warm run reads nothing; an edit rescans just that file."""
+    cache = tmp_path / "cache"
+    root = cache / "org" / "plug" / "1.0.0"
+    (root / "skills" / "plan").mkdir(parents=True)
+    (root / "skills" / "plan" / "SKILL.md").write_text("use the reviewer agent\n")
+    (root / "agents").mkdir()
+    (root / "agents" / "reviewer.md").write_text("skill plug:plan\n")
+    cache_file = tmp_path / "graph-cache.json"
+
+    cold = DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+    assert graph_snapshot(cold) == graph_snapshot(DependencyScanner.scan_all_plugins(cache))
+
+    scanned = []
+    real_scan_file = DependencyScanner.scan_file.__func__
+    monkeypatch.setattr(DependencyScanner, "scan_file", classmethod(
+        lambda cls, path: scanned.append(path.name) or real_scan_file(cls, path)))
+
+    warm = DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+    assert scanned == []
+    assert graph_snapshot(warm) == graph_snapshot(cold)
+
+    (root / "agents" / "reviewer.md").write_text("no references any more\n")
+    edited = DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+    assert scanned == ["reviewer.md"]
+    assert edited.dependencies["plug:reviewer"] == set()
+    assert edited.dependencies["plug:plan"] == {"plug:reviewer"}
+
+
+def test_graph_cache_ignores_corrupt_file_and_drops_removed_plugins(tmp_path):
+    cache = tmp_path / "cache"
+    make_root(cache / "keep")
+    gone = make_root(cache / "gone")
+    cache_file = tmp_path / "graph-cache.json"
+    cache_file.write_text("{not json")
+
+    DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+    (gone / "skills").rmdir()
+    DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+
+    assert list(json.loads(cache_file.read_text())["plugins"]) == [str(cache / "keep")]
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda e: e["files"].update({next(iter(e["files"])): ["bad"]}),
+    lambda e: e.update(files=["bad"]),
+    lambda e: e.update(edges={"plug:plan": "plug:reviewer"}),
+    lambda e: next(iter(e["files"].values())).update(type="widget"),
+    lambda e: next(iter(e["files"].values())).pop("references"),
+    lambda e: next(iter(e["files"].values())).update(stamp="1:2"),
+])
+def test_graph_cache_rescans_plugins_with_malformed_entries(tmp_path, corrupt):
+    """A well-formed file with a malformed plugin entry rescans that plugin."""
+    cache = tmp_path / "cache"
+    root = make_root(cache / "plug")
+    (root / "skills" / "plan").mkdir()
+    (root / "skills" / "plan" / "SKILL.md").write_text("use the reviewer agent\n")
+    cache_file = tmp_path / "graph-cache.json"
+    cold = DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)
+
+    data = json.loads(cache_file.read_text())
+    corrupt(data["plugins"][str(root)])
+    cache_file.write_text(json.dumps(data))
+
+    assert graph_snapshot(DependencyScanner.scan_all_plugins(cache, cache_file=cache_file)) \
+        == graph_snapshot(cold)
+
+
+# --- Transitive closures -----------------------------------------------------
+
+def reachable(edges: dict, start: str) -> set:
+    """Nodes reachable from start by one or more edges (breadth-first)."""
+    seen, frontier = set(), list(edges.get(start, ()))
+    while frontier:
+        node = frontier.pop()
+        if node not in seen:
+            seen.add(node)
+            frontier.extend(edges.get(node, ()))
+    return seen
+
+
+def test_closures_match_graph_search_on_random_graphs():
+    rng = random.Random(44)
+    for _ in range(200):
+        graph = DependencyGraph()
+        nodes = [f"p:n{i}" for i in range(rng.randint(1, 12))]
+        for _ in range(rng.randint(0, 30)):
+            graph.add_dependency(rng.choice(nodes), rng.choice(nodes))
+        for node in nodes:
+            assert graph.get_all_dependencies(node) == reachable(graph.dependencies, node)
+            assert graph.get_all_dependents(node) == reachable(graph.reverse_dependencies, node)
+
+
+def test_closures_under_cycles_and_after_changes():
+    graph = DependencyGraph()
+    graph.add_dependency("a", "b")
+    graph.add_dependency("b", "c")
+    graph.add_dependency("c", "b")
+
+    assert graph.get_all_dependencies("a") == {"b", "c"}
+    assert graph.get_all_dependencies("b") == {"b", "c"}
+    assert graph.get_all_dependents("c") == {"a", "b", "c"}
+    assert graph.get_all_dependencies("unknown") == set()
+
+    graph.add_dependency("c", "d")
+    assert graph.get_all_dependencies("a") == {"b", "c", "d"}
+    assert graph.get_sync_set(["a"]) == set()
+
+
+# --- Short-name resolution ---------------------------------------------------
+
+def make_graph(*full_names: str) -> DependencyGraph:
+    graph = DependencyGraph()
+    for full_name in full_names:
+        plugin, _, name = full_name.rpartition(":")
+        graph.add_extension(Extension(name=name, type=ExtensionType.SKILL,
+                                      plugin=plugin, file_path=Path(f"{name}.md")))
+    return graph
+
+
+def test_candidates_rank_exact_then_colon_then_dash_then_name():
+    graph = make_graph("zeta:plan", "alpha:plan", "do:do-plan", "plan", "x:plan-review")
+
+    assert graph.candidates_for("plan") == ["plan", "alpha:plan", "zeta:plan", "do:do-plan"]
+    assert graph.candidates_for("review") == ["x:plan-review"]
+    assert graph.resolve_short_name("missing") is None
+
+
+def test_resolve_reference_uses_suffix_index_deterministically():
+    graph = make_graph("zeta:review", "alpha:code-review", "alpha:review")
+
+    assert DependencyScanner._resolve_reference("review", "other", graph) == "alpha:review"
+    assert DependencyScanner._resolve_reference("review", "zeta", graph) == "zeta:review"
+    assert DependencyScanner._resolve_reference("x:y", "zeta", graph) == "x:y"
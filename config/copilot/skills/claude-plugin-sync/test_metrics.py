@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for metrics: per-phase timing and the counters sync code reports."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import metrics
+from dependency_graph import DependencyScanner
+from sync import materialize_file
+from metrics import Metrics, recording
+
+
+def test_counts_are_attributed_to_the_running_phase():
+    m = Metrics()
+    with recording(m):
+        with m.phase("one"):
+            metrics.count("files_scanned", 2)
+        with m.phase("two"):
+            metrics.count("files_scanned")
+            metrics.count("items_written")
+        metrics.count("outside")
+
+    report = m.to_dict()
+    assert [(p["name"], p["counters"]) for p in report["phases"]] == [
+        ("one", {"files_scanned": 2}),
+        ("two", {"files_scanned": 1, "items_written": 1}),
+    ]
+    assert report["counters"] == {"files_scanned": 3, "items_written": 1, "outside": 1}
+    assert json.loads(json.dumps(report)) == report
+    assert m.format_text().splitlines()[1].startswith("  one ")
+
+
+def test_count_without_recording_is_a_no_op():
+    metrics.count("files_scanned")  # must not raise or leak into later recordings
+    m = Metrics()
+    with recording(m):
+        pass
+    assert m.totals == {}
+
+
+def test_scan_reports_files_bytes_and_cache_hits(tmp_path):
+    skill = tmp_path / "cache" / "plug" / "skills" / "plan"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("use skill plug:plan and /plug:plan\n")
+    cache_file = tmp_path / "graph-cache.json"
+
+    cold, warm = Metrics(), Metrics()
+    with recording(cold):
+        DependencyScanner.scan_all_plugins(tmp_path / "cache", cache_file=cache_file)
+    with recording(warm):
+        DependencyScanner.scan_all_plugins(tmp_path / "cache", cache_file=cache_file)
+
+    assert cold.totals == {"files_scanned": 1, "bytes_read": 35, "regex_matches": 2,
+                           "plugins_scanned": 1}
+    assert warm.totals == {"plugins_from_cache": 1}
+
+
+def test_materialize_counts_each_source_byte_once(tmp_path):
+    source = tmp_path / "agent.md"
+    source.write_text("---\nname: helper\n---\nbody\n")
+    m = Metrics()
+
+    with recording(m):
+        materialize_file(source, tmp_path / "out.md", None, lambda content, lookups: content)
+
+    assert m.totals == {"bytes_read": source.stat().st_size, "items_written": 1}
+
+
+def test_metrics_json_to_stdout_is_the_only_stdout(tmp_path):
+    """`--metrics-json -` output can be piped straight into a JSON consumer."""
+    (tmp_path / ".claude.json").write_text("{}")
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).with_name("sync_enhanced.py")),
+         "--metrics-json", "-", "--timings"],
+        env=dict(os.environ, HOME=str(tmp_path)), capture_output=True, text=True, check=True)
+
+    report = json.loads(result.stdout)
+    assert [p["name"] for p in report["phases"]][0] == "load-config"
+    assert "SYNC COMPLETE" in result.stderr and "Timings:" in result.stderr
@@ -7,11 +7,18 @@ owner/repo:branch, timestamps) and get_copilot_name auto-registered the
 garbage captures, corrupting synced content and polluting the canonical map.
 """
 
+import random
+import re
+from pathlib import Path
+
 import pytest
 
 from name_mapping import NameMapper, ReferenceRewriter
 
 
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
 @pytest.fixture
 def mapper():
     m = NameMapper()
@@ -89,3 +96,46 @@ def test_extract_references_no_fabricated_attribute_refs():
         'subagent_type="do:impl" and /do:plan and Skill("a:b")'
     )
     assert refs == {"do:impl", "do:plan", "a:b"}
+
+
+# --- Single-pass rewriting matches the per-pattern original -------------------
+
+def legacy_rewrite(content: str, name_mapper: NameMapper) -> str:
+    """The original algorithm: one pass per pattern, splicing each match."""
+    rewritten = content
+    for pattern, extract_name, build_replacement in ReferenceRewriter.REFERENCE_PATTERNS:
+        for match in reversed(list(re.finditer(pattern, rewritten))):
+            claude_name = extract_name(match)
+            if not name_mapper.is_registered(claude_name):
+                continue
+            replacement = build_replacement(match, name_mapper.get_copilot_name(claude_name))
+            start, end = match.span()
+            rewritten = rewritten[:start] + replacement + rewritten[end:]
+    return rewritten
+
+
+def test_rewrite_content_matches_legacy_on_repo_markdown():
+    """Golden output over config/claude: every file rewrites identically,
+    with all referenced names registered and with only half of them."""
+    files = sorted((REPO_ROOT / "config" / "claude").rglob("*.md"))
+    if not files:
+        pytest.skip("no markdown under config/claude")
+    contents = [path.read_text(errors="replace") for path in files]
+    names = sorted(set().union(*(ReferenceRewriter.extract_references(c) for c in contents)))
+
+    for registered in (names, names[::2]):
+        m = NameMapper()
+        for name in registered:
+            m.register_extension(name)
+        for path, content in zip(files, contents):
+            assert ReferenceRewriter.rewrite_content(content, m) == legacy_rewrite(content, m), path
+
+
+def test_rewrite_content_matches_legacy_on_fuzzed_text(mapper):
+    """Overlapping and nested candidates resolve as the per-pattern passes do."""
+    fragments = ["/", "do", ":", "plan", "it", " ", "\n", 'Skill("', '")', "'", "skill ",
+                 "subagent_type=", "agent_type=", '"', "x", "-"]
+    rng = random.Random(46)
+    for _ in range(5000):
+        text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 16)))
+        assert ReferenceRewriter.rewrite_content(text, mapper) == legacy_rewrite(text, mapper), text
@@ -5,6 +5,7 @@ Comprehensive tests for the sync.py module.
 Tests cover all major functionality using a functional style.
 """
 
+import os
 import tempfile
 import json
 from pathlib import Path
@@ -25,6 +26,7 @@ from sync import (
     fields_to_frontmatter_lines,
     # Plugin reference rewriting
     rewrite_plugin_references,
+    build_rewrite_engine,
     # Skill transformation
     transform_skill,
     # Agent rewriting
@@ -33,6 +35,7 @@ from sync import (
     # File system operations
     create_symlink,
     write_if_changed,
+    content_fingerprint,
     # Plugin discovery
     find_skills,
     find_agents,
@@ -43,6 +46,14 @@ from sync import (
     # Manifest management
     create_manifest,
     preserve_removed_entries,
+    # Parallel plugin sync
+    sync_plugins,
+    group_plugins_by_name,
+    # Watch mode
+    InotifyWatcher,
+    PollingWatcher,
+    affected_plugins,
+    wait_for_changes,
     # Constants
     ALLOWED_SKILL_FIELDS
 )
@@ -270,6 +281,27 @@ def test_rewrite_plugin_references_mixed():
     assert "do-iterative-implementer" in rewritten
 
 
+@pytest.mark.parametrize("content, expected", [
+    ("Run `/do:plan` first", "Run `skill do-plan` first"),
+    ("Retro (/do:retro) after", "Retro (skill do-retro) after"),
+    ('Type "/do:plan"', 'Type "skill do-plan"'),
+    ("/do:plan\n/do:retro", "skill do-plan\nskill do-retro"),
+    ("see src/do:plan", "see src/do:plan"),
+])
+def test_rewrite_plugin_references_commands_in_markdown_delimiters(content, expected):
+    """Backticked, parenthesised, and quoted commands are rewritten; paths are not."""
+    assert rewrite_plugin_references(content, 'do') == expected
+
+
+def test_rewrite_plugin_references_delimited_commands_with_run_engine():
+    """With a run's engine, delimited commands rewrite only if registered."""
+    engine = build_rewrite_engine([("do", "plan")])
+
+    rewritten = rewrite_plugin_references("`/do:plan` and (/do:other)", 'do', engine)
+
+    assert rewritten == "`skill do-plan` and (/do:other)"
+
+
 # ============================================================================
 # Skill Transformation Tests
 # ============================================================================
@@ -468,6 +500,34 @@ def test_write_if_changed_different_content():
         assert target.read_text() == "new content"
 
 
+def test_write_if_changed_trusts_matching_record(monkeypatch):
+    """A target matching its recorded fingerprint is not read again."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "file.txt"
+        write_if_changed(target, "content")
+        recorded = content_fingerprint(target, "content")
+
+        monkeypatch.setattr(Path, 'read_bytes', lambda self: pytest.fail("target was read"))
+        assert write_if_changed(target, "content", recorded) is False
+
+
+def test_write_if_changed_replaces_symlink_atomically():
+    """An existing symlink is replaced by a regular file; its target is untouched."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        elsewhere = tmppath / "elsewhere.txt"
+        elsewhere.write_text("keep me")
+        target = tmppath / "file.txt"
+        target.symlink_to(elsewhere)
+
+        assert write_if_changed(target, "new content") is True
+
+        assert not target.is_symlink()
+        assert target.read_text() == "new content"
+        assert elsewhere.read_text() == "keep me"
+        assert [p.name for p in tmppath.iterdir() if p.name.startswith('.')] == []
+
+
 # ============================================================================
 # Plugin Discovery Tests
 # ============================================================================
@@ -896,5 +956,309 @@ def test_sync_extensions_writes_shared_manifest_and_cleans_stale():
         assert manifest['skills']['plug-goner']['status'] == "removed"
 
 
+def test_sync_extensions_skips_unchanged_sources(monkeypatch):
+    """A second run with unchanged sources reads and rewrites nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        paths = make_paths(tmppath)
+        agent = make_agent_extension(tmppath, "plug", "helper")
+        command = make_command_extension(tmppath, "plug", "deploy")
+
+        stats = sync_extensions([agent, command], paths)
+        assert stats['added_agents'] == 1 and stats['added_commands'] == 1
+        record = json.loads(paths['manifest_file'].read_text())['agents']['plug-helper.agent.md']
+        assert set(record['fingerprint']) == {'size', 'mtimeNs', 'sha256'}
+
+        reads = []
+        original_read_text = Path.read_text
+        monkeypatch.setattr(Path, 'read_text',
+                            lambda self, *a, **kw: reads.append(self) or original_read_text(self, *a, **kw))
+        stats = sync_extensions([agent, command], paths)
+
+        assert stats['added_agents'] == 0 and stats['added_commands'] == 0
+        assert agent.file_path not in reads
+        assert command.file_path not in reads
+
+
+def test_sync_extensions_reads_a_changed_source_once(monkeypatch):
+    """An edited source is read once, and its CRLF newlines are translated as before."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        paths = make_paths(tmppath)
+        agent = make_agent_extension(tmppath, "plug", "helper")
+        sync_extensions([agent], paths)
+        agent.file_path.write_bytes(b"---\r\nname: helper\r\n---\r\nEdited body\r\n")
+
+        reads = []
+        for method in ('read_text', 'read_bytes'):
+            original = getattr(Path, method)
+            monkeypatch.setattr(Path, method, lambda self, *a, _original=original, **kw:
+                                reads.append(self) or _original(self, *a, **kw))
+        stats = sync_extensions([agent], paths)
+
+        assert stats['added_agents'] == 1
+        assert reads.count(agent.file_path) == 1
+        target = paths['copilot_agents_dir'] / "plug-helper.agent.md"
+        assert "Edited body\n" in target.read_text() and b"\r" not in target.read_bytes()
+
+
+def test_sync_extensions_resyncs_changed_or_missing_targets():
+    """Edited sources, deleted targets, and old transform versions are redone."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        paths = make_paths(tmppath)
+        agent = make_agent_extension(tmppath, "plug", "helper")
+        command = make_command_extension(tmppath, "plug", "deploy")
+        sync_extensions([agent, command], paths)
+        agent_target = paths['copilot_agents_dir'] / "plug-helper.agent.md"
+        command_target = paths['copilot_skills_dir'] / "plug-deploy" / "SKILL.md"
+
+        agent.file_path.write_text("---\nname: helper\n---\nNew agent body\n")
+        command_target.unlink()
+        stats = sync_extensions([agent, command], paths)
+
+        assert stats['added_agents'] == 1 and stats['added_commands'] == 1
+        assert "New agent body" in agent_target.read_text()
+        assert command_target.is_file()
+
+        manifest = json.loads(paths['manifest_file'].read_text())
+        manifest['commands']['plug-deploy']['transformVersion'] = 0
+        paths['manifest_file'].write_text(json.dumps(manifest))
+        command_target.write_text("stale output")
+        stats = sync_extensions([agent, command], paths)
+
+        assert stats['added_agents'] == 0 and stats['added_commands'] == 1
+        assert "Command body of plug" in command_target.read_text()
+
+
+def test_sync_extensions_restores_edited_target():
+    """A target edited since the last sync is rewritten even if its source is unchanged."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        paths = make_paths(tmppath)
+        agent = make_agent_extension(tmppath, "plug", "helper")
+        sync_extensions([agent], paths)
+        target = paths['copilot_agents_dir'] / "plug-helper.agent.md"
+        expected = target.read_text()
+
+        target.write_text("hand edited")
+        stats = sync_extensions([agent], paths)
+
+        assert stats['added_agents'] == 1
+        assert target.read_text() == expected
+
+
+# ============================================================================
+# Parallel Plugin Sync Tests
+# ============================================================================
+
+def make_installed_plugins(root: Path, keys: list) -> dict:
+    """Create plugins (one skill, agent, and command each) plus sync paths."""
+    installed = {}
+    for key in keys:
+        plugin_path = root / "cache" / key.replace("@", "_")
+        (plugin_path / "skills" / "tool").mkdir(parents=True)
+        (plugin_path / "skills" / "tool" / "SKILL.md").write_text(f"---\nname: tool\n---\n{key}\n")
+        (plugin_path / "agents").mkdir()
+        (plugin_path / "agents" / "helper.md").write_text(f"---\nname: helper\n---\nAgent of {key}\n")
+        (plugin_path / "commands").mkdir()
+        (plugin_path / "commands" / "run.md").write_text(f"---\ndescription: run\n---\nCommand of {key}\n")
+        installed[key] = [{"installPath": str(plugin_path)}]
+    plugins_file = root / "installed_plugins.json"
+    plugins_file.write_text(json.dumps({"plugins": installed}))
+    paths = make_paths(root)
+    paths['claude_plugins_file'] = plugins_file
+    paths['claude_settings_file'] = root / "settings.json"
+    return paths
+
+
+def test_group_plugins_by_name_keeps_same_named_plugins_together():
+    """Same-named plugins share a group, in first-appearance order."""
+    plugins = [("a", Path("/a1")), ("b", Path("/b")), ("a", Path("/a2"))]
+
+    assert group_plugins_by_name(plugins) == [
+        [("a", Path("/a1")), ("a", Path("/a2"))],
+        [("b", Path("/b"))],
+    ]
+
+
+def test_sync_plugins_parallel_matches_serial():
+    """A worker pool produces the same files, stats, and manifest as a serial run."""
+    keys = [f"plug{i}@market" for i in range(6)] + ["plug0@other"]
+    outcomes = []
+    for jobs in (1, 4):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = make_installed_plugins(Path(tmpdir), keys)
+            stats = sync_plugins(paths, jobs=jobs)
+            manifest = json.loads(paths['manifest_file'].read_text())
+            del manifest['lastSync']
+            for category in manifest.values():
+                for record in category.values():
+                    record['source'] = record['source'].replace(tmpdir, "")
+                    record.get('fingerprint', {}).pop('mtimeNs', None)
+                    record.get('target', {}).pop('mtimeNs', None)
+            # The later install of a shared name wins, exactly as serially
+            agent = (paths['copilot_agents_dir'] / "plug0-helper.agent.md").read_text()
+            outcomes.append((stats, json.dumps(manifest, sort_keys=True), agent))
+
+    assert outcomes[0] == outcomes[1]
+    assert "Agent of plug0@other" in outcomes[0][2]
+
+
+def add_skill(root: Path, key: str, name: str, body: str) -> None:
+    """Add a skill to a plugin made by make_installed_plugins."""
+    skill_dir = root / "cache" / key.replace("@", "_") / "skills" / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\n---\n{body}\n")
+
+
+def test_group_plugins_by_name_groups_plugins_with_overlapping_targets():
+    """code-review's skill tool and code's skill review-tool both write code-review-tool."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        make_installed_plugins(root, ["code-review@m", "other@m", "code@m"])
+        add_skill(root, "code@m", "review-tool", "from code")
+        plugins = [(key.split("@")[0], root / "cache" / key.replace("@", "_"))
+                   for key in ["code-review@m", "other@m", "code@m"]]
+
+        groups = group_plugins_by_name(plugins)
+
+    assert groups == [[plugins[0], plugins[2]], [plugins[1]]]
+
+
+def test_sync_plugins_parallel_matches_serial_with_overlapping_targets():
+    """Plugins writing the same target name are synced in order, never racing."""
+    keys = ["code-review@m"] + [f"plug{i}@m" for i in range(4)] + ["code@m"]
+    outcomes = []
+    for jobs in (1, 4):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            paths = make_installed_plugins(root, keys)
+            add_skill(root, "code@m", "review-tool", "from code")
+            stats = sync_plugins(paths, jobs=jobs)
+            skill = (paths['copilot_skills_dir'] / "code-review-tool" / "SKILL.md").read_text()
+            outcomes.append((stats, skill))
+
+    assert outcomes[0] == outcomes[1]
+    assert "from code" in outcomes[0][1]
+
+
+# ============================================================================
+# Shared Rewrite Engine Tests
+# ============================================================================
+
+def test_sync_plugins_rewrites_references_to_any_synced_plugin():
+    """One engine covers every plugin in the run; unknown names stay verbatim."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_installed_plugins(Path(tmpdir), ["alpha@m", "beta@m"])
+        agent_source = Path(tmpdir) / "cache" / "alpha_m" / "agents" / "helper.md"
+        agent_source.write_text(
+            "---\nname: helper\n---\n"
+            "Run /beta:run, then the beta:helper agent, not beta:missing or src/beta:run.\n"
+        )
+
+        sync_plugins(paths)
+
+        agent = (paths['copilot_agents_dir'] / "alpha-helper.agent.md").read_text()
+        assert ("Run skill beta-run, then the beta-helper agent, "
+                "not beta:missing or src/beta:run.") in agent
+
+
+def test_sync_extensions_redoes_output_when_references_resolve_differently():
+    """A skipped target is redone once a name it mentions becomes synced."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        paths = make_paths(tmppath)
+        agent = make_agent_extension(tmppath, "plug", "helper")
+        agent.file_path.write_text("---\nname: helper\n---\nThen run /other:deploy\n")
+        target = paths['copilot_agents_dir'] / "plug-helper.agent.md"
+
+        sync_extensions([agent], paths)
+        assert "Then run /other:deploy" in target.read_text()
+
+        command = make_command_extension(tmppath, "other", "deploy")
+        stats = sync_extensions([agent, command], paths)
+
+        assert stats['added_agents'] == 1
+        assert "Then run skill other-deploy" in target.read_text()
+
+
+# ============================================================================
+# Watch Mode Tests
+# ============================================================================
+
+def test_sync_plugins_only_syncs_named_plugins_and_keeps_the_rest():
+    """An incremental sync redoes one plugin and carries the others' records over."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        paths = make_installed_plugins(root, ["alpha@m", "beta@m"])
+        sync_plugins(paths)
+        for plugin in ("alpha_m", "beta_m"):
+            (root / "cache" / plugin / "agents" / "helper.md").write_text("---\nname: helper\n---\nEdited\n")
+
+        stats = sync_plugins(paths, only={"alpha"})
+
+        assert stats["added_agents"] == 1 and stats["removed_skills"] == 0
+        assert "Edited" in (paths['copilot_agents_dir'] / "alpha-helper.agent.md").read_text()
+        assert "Edited" not in (paths['copilot_agents_dir'] / "beta-helper.agent.md").read_text()
+        manifest = json.loads(paths['manifest_file'].read_text())
+        assert {r["status"] for c in ("skills", "agents", "commands")
+                for r in manifest[c].values()} == {"active"}
+        assert len(manifest["agents"]) == 2 and (paths['copilot_skills_dir'] / "beta-tool").is_symlink()
+
+
+def test_affected_plugins_maps_changes_to_plugins_or_full_sync():
+    paths = {'claude_plugins_file': Path("/c/plugins/installed_plugins.json"),
+             'claude_settings_file': Path("/c/settings.json")}
+    plugins = [("alpha", Path("/cache/alpha/1.0")), ("beta", Path("/cache/beta"))]
+
+    assert affected_plugins({Path("/cache/alpha/1.0/agents/x.md")}, paths, plugins) == {"alpha"}
+    assert affected_plugins({Path("/c/history.jsonl")}, paths, plugins) == set()
+    assert affected_plugins({Path("/c/settings.json"), Path("/cache/beta")}, paths, plugins) is None
+
+
+@pytest.mark.parametrize("make_watcher", [
+    pytest.param(InotifyWatcher, id="inotify"),
+    pytest.param(lambda: PollingWatcher(0.05), id="polling"),
+])
+def test_watchers_coalesce_a_burst_into_one_plugin_set(tmp_path, make_watcher):
+    try:
+        watcher = make_watcher()
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    agents = tmp_path / "cache" / "alpha" / "agents"
+    agents.mkdir(parents=True)
+    paths = {'claude_plugins_file': tmp_path / "installed_plugins.json",
+             'claude_settings_file': tmp_path / "settings.json"}
+    plugins = [("alpha", tmp_path / "cache" / "alpha")]
+    watcher.watch([tmp_path, agents])
+
+    for i in range(5):
+        (agents / f"a{i}.md").write_text("x")
+
+    assert wait_for_changes(watcher, 0.2, paths, plugins) == {"alpha"}
+
+
+def test_inotify_queue_overflow_syncs_everything(tmp_path):
+    try:
+        watcher = InotifyWatcher()
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    # Stand a pipe in for the inotify fd, carrying the event the kernel
+    # queues when it drops events: IN_Q_OVERFLOW on watch descriptor -1
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.close(watcher.fd)
+    watcher.fd = read_fd
+    os.write(write_fd, InotifyWatcher.EVENT_HEADER.pack(-1, InotifyWatcher.IN_Q_OVERFLOW, 0, 0))
+    paths = {'claude_plugins_file': tmp_path / "installed_plugins.json",
+             'claude_settings_file': tmp_path / "settings.json"}
+
+    try:
+        assert wait_for_changes(watcher, 0.05, paths, [("alpha", tmp_path / "alpha")]) is None
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -25,6 +25,13 @@ setup() {
     mkdir -p "$TEST_HOME/.claude.zai" "$TEST_REPO/$SKILL_REL" "$TEST_PROJ"
     cp "$DOTFILES_ROOT/$SKILL_REL/session_copy.py" "$TEST_REPO/$SKILL_REL/"
 
+    # session_copy.py imports the shared transcript library from find-session,
+    # which the repo links into claude.zai/skills the same way
+    LIB_REL="config/claude/skills/find-session"
+    mkdir -p "$TEST_REPO/$LIB_REL"
+    cp "$DOTFILES_ROOT/$LIB_REL/_session_lib.py" "$TEST_REPO/$LIB_REL/"
+    ln -s "../../claude/skills/find-session" "$TEST_REPO/config/claude.zai/skills/find-session"
+
     # Dotbot layout: the skill is reached through a symlink out of $HOME
     ln -s "$TEST_REPO/config/claude.zai/skills" "$TEST_HOME/.claude.zai/skills"
     SCRIPT="$TEST_HOME/.claude.zai/skills/copy-session-to-zai/session_copy.py"
@@ -36,10 +43,12 @@ setup() {
         "$(cd "$TEST_PROJ" && pwd -P)" > "$TEST_HOME/.claude/projects/$SLUG/sess-1234.jsonl"
 
     export HOME="$TEST_HOME"
+    # Digest, cwd-index, and session-meta caches stay inside the temp HOME
+    export XDG_CACHE_HOME="$TEST_HOME/.cache"
 }
 
 teardown() {
-    unset HOME
+    unset HOME XDG_CACHE_HOME
     cleanup_test_dir "$TEST_DIR"
 }
 
@@ -88,3 +97,59 @@ teardown() {
     [ "$status" -ne 0 ]
     [[ "$output" == *"identical"* ]]
 }
+
+# =============================================================================
+# Incremental sync: a grown source extends an older target copy in place
+# =============================================================================
+
+@test "session_copy.py: copy --sync appends only the new tail to an older target" {
+    export CLAUDE_CONFIG_DIR="$TEST_HOME/.claude.zai"
+    SOURCE="$TEST_HOME/.claude/projects/$SLUG/sess-1234.jsonl"
+    TARGET="$TEST_HOME/.claude.zai/projects/$SLUG/sess-1234.jsonl"
+
+    run python3 "$SCRIPT" copy "$TEST_PROJ" sess-1234
+    [ "$status" -eq 0 ]
+    printf '{"type":"assistant","timestamp":"2026-06-11T00:00:01Z","message":{"role":"assistant","content":[{"type":"text","text":"later"}]}}\n' >> "$SOURCE"
+
+    # Without --sync the grown source is reported, not silently overwritten
+    run python3 "$SCRIPT" copy "$TEST_PROJ" sess-1234
+    [ "$status" -ne 0 ]
+    [[ "$output" == *"exists-prefix"* ]]
+
+    run python3 "$SCRIPT" copy "$TEST_PROJ" sess-1234 --sync
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"synced: appended"* ]]
+    cmp "$SOURCE" "$TARGET"
+}
+
+@test "session_copy.py: sync mirrors missing and grown sessions, leaves diverged ones" {
+    export CLAUDE_CONFIG_DIR="$TEST_HOME/.claude.zai"
+    SRC_DIR="$TEST_HOME/.claude/projects/$SLUG"
+    DST_DIR="$TEST_HOME/.claude.zai/projects/$SLUG"
+    cp "$SRC_DIR/sess-1234.jsonl" "$SRC_DIR/sess-grown.jsonl"
+    cp "$SRC_DIR/sess-1234.jsonl" "$SRC_DIR/sess-diverged.jsonl"
+    mkdir -p "$DST_DIR"
+    cp "$SRC_DIR/sess-grown.jsonl" "$DST_DIR/sess-grown.jsonl"
+    echo '{"type":"user"}' >> "$SRC_DIR/sess-grown.jsonl"
+    echo '{"other":"content"}' > "$DST_DIR/sess-diverged.jsonl"
+
+    run python3 "$SCRIPT" sync "$TEST_PROJ" --dry-run
+    [ "$status" -eq 0 ]
+    [[ "$output" == *"1 copy"* ]]
+    [[ "$output" == *"1 append"* ]]
+    [[ "$output" == *"1 conflict"* ]]
+    [ ! -e "$DST_DIR/sess-1234.jsonl" ]
+
+    run python3 "$SCRIPT" sync "$TEST_PROJ"
+    [ "$status" -eq 0 ]
+    cmp "$SRC_DIR/sess-1234.jsonl" "$DST_DIR/sess-1234.jsonl"
+    cmp "$SRC_DIR/sess-grown.jsonl" "$DST_DIR/sess-grown.jsonl"
+    [ "$(cat "$DST_DIR/sess-diverged.jsonl")" = '{"other":"content"}' ]
+}
+
+@test "session_copy.py: caches are written under XDG_CACHE_HOME" {
+    run env CLAUDE_CONFIG_DIR="$TEST_HOME/.claude.zai" python3 "$SCRIPT" sync "$TEST_PROJ"
+
+    [ "$status" -eq 0 ]
+    [ -f "$XDG_CACHE_HOME/copy-session-to-zai/digests.json" ]
+}